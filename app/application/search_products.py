@@ -0,0 +1,100 @@
+"""
+Caso de uso de búsqueda de productos.
+
+Valida la consulta y los filtros, traduce el cursor opaco de la API a la
+llave de la última fila de la página anterior y delega la búsqueda en el
+repositorio.
+"""
+
+import json
+import base64
+import binascii
+from dataclasses import dataclass, replace
+from typing import List, Optional
+from app.domain.productos import ProductHit, ProductSearchCriteria, ProductSearchRepository
+
+DEFAULT_LIMIT = 20
+MAX_LIMIT = 100
+
+
+class InvalidSearchError(ValueError):
+    """Parámetros de búsqueda inválidos (cursor, rango de precios, límite)"""
+
+
+@dataclass(frozen=True)
+class SearchResult:
+    items: List[ProductHit]
+    next_cursor: Optional[str] = None
+
+
+def encode_cursor(after) -> str:
+    """Cursor opaco (base64 url-safe) de la llave (rank, id)"""
+    rank, last_id = after
+    raw = json.dumps({"r": rank, "id": last_id}, separators=(",", ":")).encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str, with_rank: bool):
+    """Llave (rank, id) de `cursor`; `with_rank` indica si la búsqueda tiene texto"""
+    try:
+        raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4))
+        data = json.loads(raw)
+        rank, last_id = data["r"], data["id"]
+    except (binascii.Error, ValueError, TypeError, KeyError) as e:
+        raise InvalidSearchError("Cursor inválido") from e
+    if not isinstance(last_id, int) or (rank is None) == with_rank:
+        raise InvalidSearchError("Cursor inválido para esta búsqueda")
+    if with_rank and not isinstance(rank, (int, float)):
+        raise InvalidSearchError("Cursor inválido")
+    return rank, last_id
+
+
+class SearchProducts:
+    """Búsqueda paginada de productos"""
+
+    def __init__(self, repository: ProductSearchRepository, max_limit: int = MAX_LIMIT):
+        self.repository = repository
+        self.max_limit = max_limit
+
+    def criteria(
+        self,
+        text: Optional[str] = None,
+        id_sub_categoria: Optional[int] = None,
+        id_marca: Optional[int] = None,
+        id_sucursal: Optional[int] = None,
+        precio_min: Optional[float] = None,
+        precio_max: Optional[float] = None,
+        limit: int = DEFAULT_LIMIT,
+        cursor: Optional[str] = None,
+    ) -> ProductSearchCriteria:
+        """Criterios validados de una búsqueda"""
+        if not 1 <= limit <= self.max_limit:
+            raise InvalidSearchError(f"limit debe estar entre 1 y {self.max_limit}")
+        if precio_min is not None and precio_max is not None and precio_min > precio_max:
+            raise InvalidSearchError("precio_min no puede ser mayor que precio_max")
+        criteria = ProductSearchCriteria(
+            text=text,
+            id_sub_categoria=id_sub_categoria,
+            id_marca=id_marca,
+            id_sucursal=id_sucursal,
+            precio_min=precio_min,
+            precio_max=precio_max,
+            limit=limit,
+        )
+        if cursor:
+            after = decode_cursor(cursor, with_rank=bool(criteria.terms))
+            criteria = replace(criteria, after=after)
+        return criteria
+
+    async def execute(self, **params) -> SearchResult:
+        """
+        Busca con los parámetros de `criteria` y retorna la página y el cursor
+        siguiente. Un texto sin letras ni dígitos (p. ej. "!!!") no coincide
+        con ningún producto: la página es vacía y no se consulta el repositorio.
+        """
+        criteria = self.criteria(**params)
+        if criteria.text and criteria.text.strip() and not criteria.terms:
+            return SearchResult(items=[])
+        page = await self.repository.search(criteria)
+        next_cursor = encode_cursor(page.next_after) if page.next_after is not None else None
+        return SearchResult(items=page.items, next_cursor=next_cursor)
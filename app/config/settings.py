@@ -0,0 +1,22 @@
+from pydantic_settings import BaseSettings
+
+
+class SearchCacheSettings(BaseSettings):
+    """Caché de respuestas de búsqueda (variables SEARCH_CACHE_ENABLED, SEARCH_CACHE_TTL, ...)"""
+    ENABLED: bool = True
+    # Entradas máximas de la caché en memoria de cada proceso
+    MAX_ENTRIES: int = 2048
+    # Segundos de vida de una entrada (además de la invalidación por versión)
+    TTL: float = 300
+    # "memory" o "sqlite" (archivo compartido entre procesos, detrás de la memoria)
+    BACKEND: str = "memory"
+    SQLITE_PATH: str = "search_cache.db"
+    # Entradas máximas del archivo SQLite compartido
+    SQLITE_MAX_ENTRIES: int = 50000
+    # Segundos entre consultas de la versión del catálogo (0 = en cada búsqueda)
+    VERSION_CHECK_INTERVAL: float = 0
+
+    class Config:
+        env_file = ".env"
+        env_prefix = "SEARCH_CACHE_"
+        extra = "ignore"
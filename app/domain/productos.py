@@ -0,0 +1,84 @@
+"""
+Entidades y contrato de la búsqueda de productos.
+
+La búsqueda es de texto completo sobre `nombre` y `descripcion` de los
+productos activos, con filtros opcionales y paginación por llave (keyset):
+cada página continúa después del último resultado de la anterior, sin
+OFFSET.
+"""
+
+import re
+from abc import ABC, abstractmethod
+from dataclasses import dataclass
+from typing import List, Optional, Tuple
+
+# Términos que se toman de una consulta; el resto se ignora
+MAX_SEARCH_TERMS = 8
+
+_TERM_PATTERN = re.compile(r"\w+")
+
+
+def search_terms(text: Optional[str]) -> List[str]:
+    """
+    Términos de `text` en minúsculas, sin signos ni repetidos. Solo contienen
+    letras, dígitos y `_`, por lo que se pueden usar en la sintaxis de
+    consulta de cualquier motor sin escapar.
+    """
+    if not text:
+        return []
+    terms = list(dict.fromkeys(_TERM_PATTERN.findall(text.lower())))
+    return terms[:MAX_SEARCH_TERMS]
+
+
+@dataclass(frozen=True)
+class ProductSearchCriteria:
+    """Consulta, filtros y página de una búsqueda de productos"""
+
+    text: Optional[str] = None
+    id_sub_categoria: Optional[int] = None
+    id_marca: Optional[int] = None
+    id_sucursal: Optional[int] = None
+    precio_min: Optional[float] = None
+    precio_max: Optional[float] = None
+    limit: int = 20
+    # (rank, id) del último resultado de la página anterior; rank es None sin texto
+    after: Optional[Tuple[Optional[float], int]] = None
+
+    @property
+    def terms(self) -> List[str]:
+        return search_terms(self.text)
+
+
+@dataclass(frozen=True)
+class ProductHit:
+    """Producto encontrado; `rank` es mayor cuanto más relevante (None sin texto)"""
+
+    id: int
+    nombre: Optional[str]
+    descripcion: Optional[str]
+    precio_bs: Optional[float]
+    id_sub_categoria: Optional[int]
+    id_marca: Optional[int]
+    id_sucursal: Optional[int]
+    url_supplier: Optional[str]
+    codigo: Optional[str]
+    rank: Optional[float] = None
+
+
+@dataclass(frozen=True)
+class ProductPage:
+    """Resultados de una página y la llave para pedir la siguiente (None si no hay más)"""
+
+    items: List[ProductHit]
+    next_after: Optional[Tuple[Optional[float], int]] = None
+
+
+class ProductSearchRepository(ABC):
+    """Contrato de búsqueda de productos que implementa la infraestructura"""
+
+    @abstractmethod
+    async def search(self, criteria: ProductSearchCriteria) -> ProductPage:
+        """
+        Productos activos que contienen todos los términos (por prefijo),
+        ordenados por relevancia y luego por id; sin términos, por id.
+        """
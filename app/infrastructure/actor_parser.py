@@ -0,0 +1,118 @@
+"""
+Parser de listas de actores codificadas como texto.
+
+Reconoce los dos formatos del catálogo sin pasar por `ast`:
+- literal de lista: "['Actor A', 'Actor B']"
+- texto delimitado por ';', ',' o '|': "Actor A; Actor B"
+
+El resultado respeta las reglas de DataValidator._validate_actors_list
+(incluido que un literal de Python que no es lista produce []). Los casos
+que el parser rápido no puede decidir se delegan a `ast.literal_eval`.
+Los nombres se internan con sys.intern y los resultados se memorizan en un
+LRU acotado por el texto original.
+"""
+
+import re
+import ast
+import sys
+from functools import lru_cache
+from typing import Any, Iterable, List, Tuple
+
+# Máximo de actores por película
+MAX_ACTORS = 20
+
+# Cantidad de textos distintos que se memorizan
+ACTOR_CACHE_SIZE = 65536
+
+# Separadores en orden de prioridad
+SEPARATORS = (';', ',', '|')
+
+# Literal de lista de strings simples (sin escapes ni prefijos), con coma final opcional
+_QUOTED = r"""'[^'\\\n\r]*'|"[^"\\\n\r]*\""""
+# Espacios que acepta el tokenizer de Python dentro de corchetes (no todo \s)
+_WS = r"[ \t\f\r\n]*"
+_LIST_LITERAL = re.compile(rf"\[{_WS}(?:(?:{_QUOTED}){_WS}(?:,{_WS}(?:{_QUOTED}){_WS})*,?{_WS})?\]")
+_QUOTED_ITEM = re.compile(_QUOTED)
+
+# Con estos caracteres el texto podría ser un literal de Python (o el salto
+# de línea, el form feed o un comentario '#' cambiar cómo se interpreta):
+# se decide con ast
+_LITERAL_CHARS = frozenset("'\"0123456789[](){}#\n\r\f")
+
+# Únicos nombres que ast.literal_eval acepta sin comillas ni dígitos
+_BARE_LITERALS = frozenset(("None", "True", "False", "..."))
+
+
+def _clean(names: Iterable[Any]) -> Tuple[str, ...]:
+    """Nombres no vacíos, sin espacios en los extremos e internados"""
+    clean_names = []
+    for name in names:
+        if not name:
+            continue
+        text = str(name).strip()
+        if text:
+            clean_names.append(sys.intern(text))
+            if len(clean_names) == MAX_ACTORS:
+                break
+    return tuple(clean_names)
+
+
+def _is_bare_literal(text: str) -> bool:
+    """True si `text` (sin comillas, dígitos ni corchetes) es un literal válido, p. ej. "None" o "True, False" """
+    if ';' in text or '|' in text:
+        return False
+    # El tokenizer solo acepta espacio y tab como separación (el form feed va por ast)
+    tokens = [token.strip(" \t") for token in text.split(',')]
+    if len(tokens) > 1 and tokens[-1] == '':
+        # Coma final de tupla: "True,"
+        tokens.pop()
+    return bool(tokens) and all(token in _BARE_LITERALS for token in tokens)
+
+
+def _split_delimited(text: str) -> Tuple[str, ...]:
+    for separator in SEPARATORS:
+        if separator in text:
+            return _clean(text.split(separator))
+    return _clean([text])
+
+
+def _literal_eval_fallback(text: str) -> Tuple[str, ...]:
+    """Ruta lenta: mismas reglas que el validador original usando ast"""
+    try:
+        value = ast.literal_eval(text)
+    except (ValueError, TypeError, SyntaxError, MemoryError, RecursionError):
+        return _split_delimited(text)
+    return _clean(value) if isinstance(value, list) else ()
+
+
+@lru_cache(maxsize=ACTOR_CACHE_SIZE)
+def _parse_cached(text: str) -> Tuple[str, ...]:
+    body = text.lstrip(" \t")
+    if body.startswith('['):
+        if _LIST_LITERAL.fullmatch(body.rstrip(" \t")):
+            return _clean(item[1:-1] for item in _QUOTED_ITEM.findall(body))
+        return _literal_eval_fallback(text)
+    if _LITERAL_CHARS.isdisjoint(text):
+        return () if _is_bare_literal(text) else _split_delimited(text)
+    return _literal_eval_fallback(text)
+
+
+def parse_actor_string(text: str) -> List[str]:
+    """Lista de actores de un texto en formato literal o delimitado"""
+    if not text:
+        return []
+    return list(_parse_cached(text))
+
+
+def parse_actor_list(actors: Iterable[Any]) -> List[str]:
+    """Limpia e interna una lista de actores ya decodificada"""
+    return list(_clean(actors))
+
+
+def cache_info():
+    """Estadísticas del LRU (hits, misses, maxsize, currsize)"""
+    return _parse_cached.cache_info()
+
+
+def clear_cache():
+    _parse_cached.cache_clear()
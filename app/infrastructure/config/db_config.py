@@ -14,3 +14,29 @@ class DBSettings(BaseSettings):
 
     class Config:
         env_file = ".env"
+
+
+class PoolSettings(BaseSettings):
+    """Tamaño y tiempos del pool de conexiones (variables DB_POOL_SIZE, DB_MAX_OVERFLOW, ...)"""
+    POOL_SIZE: int = 5
+    MAX_OVERFLOW: int = 10
+    POOL_TIMEOUT: float = 30
+    POOL_RECYCLE: int = 3600
+    POOL_PRE_PING: bool = False
+    # Conexiones que se abren al arrancar la aplicación (0 = ninguna)
+    POOL_PREWARM: int = 0
+
+    @property
+    def ENGINE_KWARGS(self) -> dict:
+        return {
+            "pool_size": self.POOL_SIZE,
+            "max_overflow": self.MAX_OVERFLOW,
+            "pool_timeout": self.POOL_TIMEOUT,
+            "pool_recycle": self.POOL_RECYCLE,
+            "pool_pre_ping": self.POOL_PRE_PING,
+        }
+
+    class Config:
+        env_file = ".env"
+        env_prefix = "DB_"
+        extra = "ignore"
@@ -1,26 +1,122 @@
 import os
 import logging
-from typing import Optional, Callable
+from typing import Optional, Callable, List
 from abc import ABC, abstractmethod
-from sqlalchemy import create_engine, text
+from sqlalchemy import create_engine, event, text
+from sqlalchemy.engine import Engine, make_url
+from sqlalchemy.ext.asyncio import (
+    AsyncEngine,
+    AsyncSession,
+    async_sessionmaker,
+    create_async_engine,
+)
 from sqlalchemy.orm import sessionmaker, Session
 from sqlalchemy.exc import SQLAlchemyError, DisconnectionError
-from app.infrastructure.config.db_config import DBSettings
+from app.infrastructure.config.db_config import DBSettings, PoolSettings
+from app.infrastructure.pool_metrics import (
+    InstrumentedQueuePool,
+    InstrumentedAsyncQueuePool,
+    instrument_engine,
+)
 from app.infrastructure.base import Base
+from app.infrastructure.search_index import (
+    SearchIndex,
+    SQLiteFTS5Index,
+    PostgreSQLTsvectorIndex,
+    MySQLFulltextIndex,
+)
 from app.infrastructure.error_handlers import (
+    CircuitBreaker,
     ErrorHandler,
     ErrorType,
+    get_circuit_breaker,
     retry_with_backoff,
     RetryConfig,
 )
 
+# PRAGMA por defecto de cada conexión SQLite
+DEFAULT_SQLITE_PRAGMAS = {
+    "journal_mode": "WAL",
+    "synchronous": "NORMAL",
+    "cache_size": 10000,
+    "busy_timeout": 20000,
+    "temp_store": "MEMORY",
+    "mmap_size": 268435456,
+}
+
+# Variables de sesión por defecto de cada conexión MySQL
+DEFAULT_MYSQL_SESSION_VARIABLES = {
+    "character_set_connection": "utf8mb4",
+}
+
+
+def sqlite_pragma_statements(pragmas: dict) -> List[str]:
+    """Sentencias PRAGMA para `pragmas` ({nombre: valor})"""
+    return [f"PRAGMA {name}={value}" for name, value in pragmas.items()]
+
+
+def mysql_session_statements(session_variables: dict) -> List[str]:
+    """SET NAMES utf8mb4 más un SET SESSION con `session_variables`"""
+    statements = ["SET NAMES utf8mb4"]
+    if session_variables:
+        assignments = ", ".join(
+            f"{name} = {value!r}" if isinstance(value, str) else f"{name} = {value}"
+            for name, value in session_variables.items()
+        )
+        statements.append(f"SET SESSION {assignments}")
+    return statements
+
+
+def register_connect_hook(engine: Engine, statements: List[str]):
+    """
+    Ejecuta `statements` una vez por conexión física del pool (evento
+    "connect"), de modo que obtener una sesión no agrega sentencias.
+    """
+    if not statements:
+        return
+
+    @event.listens_for(engine, "connect")
+    def _init_connection(dbapi_connection, _):
+        cursor = dbapi_connection.cursor()
+        try:
+            for statement in statements:
+                cursor.execute(statement)
+        finally:
+            cursor.close()
+
+
+def register_circuit_breaker(engine: Engine, breaker: CircuitBreaker):
+    """
+    Alimenta `breaker` desde los eventos del engine: los errores de
+    conexión (al conectar o desconexiones) cuentan como fallos y cada
+    sentencia ejecutada sin error como éxito. Un checkout solo no cuenta:
+    el pool puede entregar una conexión que falla en la primera consulta.
+    """
+
+    @event.listens_for(engine, "handle_error")
+    def _on_error(context):
+        if context.is_disconnect or context.connection is None:
+            breaker.record_failure()
+
+    @event.listens_for(engine, "after_cursor_execute")
+    def _on_executed(*_):
+        breaker.record_success()
+
+
 class DatabaseStrategy(ABC):
+    # Nombre del circuit breaker; las estrategias síncrona y asíncrona
+    # de una misma base de datos comparten el circuito
+    circuit_name = "database"
+    # Índice de texto completo que usa la búsqueda de productos
+    search_index_class = None
+
     def __init__(self, logger: logging.Logger = None):
         self.logger = logger or logging.getLogger(__name__)
         self.engine = None
         self.SessionLocal: Optional[Callable[[], Session]] = None
         self._connection_validated = False
         self.error_handler = ErrorHandler(self.logger)
+        self.circuit_breaker = get_circuit_breaker(self.circuit_name, logger=self.logger)
 
     @abstractmethod
     def get_connection_string(self) -> str:
@@ -30,7 +126,19 @@ class DatabaseStrategy(ABC):
     def _initialize_engine_safe(self):
         pass
 
+    def connection_init_statements(self) -> List[str]:
+        """Sentencias que se ejecutan una vez por conexión nueva del pool"""
+        return []
+
+    def search_index(self) -> SearchIndex:
+        """Índice de texto completo de productos del motor (ver search_index)"""
+        if self.search_index_class is None:
+            raise NotImplementedError(f"{type(self).__name__} no tiene índice de búsqueda")
+        return self.search_index_class()
+
     def get_session(self) -> Session:
+        # Falla de inmediato (CircuitOpenError) mientras la base de datos está caída
+        self.circuit_breaker.before_call()
         if self.SessionLocal is None:
             self._initialize_engine_safe()
         return self.SessionLocal()  # pylint: disable=not-callable
@@ -59,8 +167,27 @@ class DatabaseStrategy(ABC):
             self.logger.error("❌ Error creando tablas: %s", e)
             raise
 
+    def prewarm(self, connections: int) -> int:
+        """Abre `connections` conexiones a la vez y las devuelve al pool"""
+        opened = []
+        try:
+            for _ in range(connections):
+                opened.append(self.engine.connect())
+        finally:
+            for connection in opened:
+                connection.close()
+        self.logger.info(f"🔥 Pool precalentado con {len(opened)} conexiones")
+        return len(opened)
+
+    def dispose(self):
+        """Cierra las conexiones del pool"""
+        if self.engine is not None:
+            self.engine.dispose()
+
 
 class PostgreSQLStrategy(DatabaseStrategy):
+    circuit_name = "postgresql"
+    search_index_class = PostgreSQLTsvectorIndex
 
     def __init__(self, logger=None, **kwargs):
         super().__init__(logger, **kwargs)
@@ -77,13 +204,13 @@ class PostgreSQLStrategy(DatabaseStrategy):
     def _initialize_engine_safe(self):
         connection_string = self.get_connection_string()
         engine_config = {
-            "pool_size": 5,
-            "max_overflow": 10,
-            "pool_timeout": 30,
-            "pool_recycle": 3600,
+            **PoolSettings().ENGINE_KWARGS,
+            "poolclass": InstrumentedQueuePool,
             "echo": False,
         }
         self.engine = create_engine(connection_string, **engine_config)
+        instrument_engine(self.engine, "postgresql")
+        register_circuit_breaker(self.engine, self.circuit_breaker)
         self.SessionLocal = sessionmaker(
             autocommit=False, autoflush=False, bind=self.engine
         )
@@ -93,9 +220,18 @@ class PostgreSQLStrategy(DatabaseStrategy):
 class SQLiteStrategy(DatabaseStrategy):
     """Estrategia para base de datos SQLite con manejo robusto de errores"""
 
-    def __init__(self, db_path: str = "database_sqlite.db", logger: logging.Logger = None):
+    circuit_name = "sqlite"
+    search_index_class = SQLiteFTS5Index
+
+    def __init__(
+        self,
+        db_path: str = "database_sqlite.db",
+        logger: logging.Logger = None,
+        pragmas: dict = None,
+    ):
         super().__init__(logger)
         self.db_path = self._validate_db_path(db_path)
+        self.pragmas = {**DEFAULT_SQLITE_PRAGMAS, **(pragmas or {})}
         self._initialize_engine_safe()
 
     def _validate_db_path(self, db_path: str) -> str:
@@ -132,6 +268,8 @@ class SQLiteStrategy(DatabaseStrategy):
 
             # Configuraciones específicas para SQLite
             engine_config = {
+                **PoolSettings().ENGINE_KWARGS,
+                "poolclass": InstrumentedQueuePool,
                 "echo": False,
                 "connect_args": {
                     "check_same_thread": False,  # Permite uso en múltiples threads
@@ -140,6 +278,9 @@ class SQLiteStrategy(DatabaseStrategy):
             }
 
             self.engine = create_engine(connection_string, **engine_config)
+            register_connect_hook(self.engine, self.connection_init_statements())
+            instrument_engine(self.engine, "sqlite")
+            register_circuit_breaker(self.engine, self.circuit_breaker)
             self.SessionLocal = sessionmaker(
                 autocommit=False, autoflush=False, bind=self.engine
             )
@@ -155,30 +296,20 @@ class SQLiteStrategy(DatabaseStrategy):
             )
             raise
 
-    def get_session(self) -> Session:
-        """Retorna una nueva sesión de SQLite"""
-        if not self.SessionLocal:
-            raise RuntimeError("Engine SQLite no inicializado")
-
-        try:
-            session = self.SessionLocal()
-            # Configurar SQLite para mejor concurrencia
-            session.execute(text("PRAGMA journal_mode=WAL"))
-            session.execute(text("PRAGMA synchronous=NORMAL"))
-            session.execute(text("PRAGMA cache_size=10000"))
-            return session
-        except Exception as e:
-            self.error_handler.handle_error(
-                e, ErrorType.DATABASE_ERROR, "Creando sesión SQLite"
-            )
-            raise
+    def connection_init_statements(self) -> List[str]:
+        """PRAGMA de concurrencia y caché de cada conexión SQLite"""
+        return sqlite_pragma_statements(self.pragmas)
 
 
 class MySQLStrategy(DatabaseStrategy):
     """Estrategia para base de datos MySQL con manejo robusto de errores"""
 
-    def __init__(self, logger: logging.Logger = None):
+    circuit_name = "mysql"
+    search_index_class = MySQLFulltextIndex
+
+    def __init__(self, logger: logging.Logger = None, session_variables: dict = None):
         super().__init__(logger)
+        self.session_variables = {**DEFAULT_MYSQL_SESSION_VARIABLES, **(session_variables or {})}
         self._initialize_engine_safe()
 
     def get_connection_string(self) -> str:
@@ -222,15 +353,16 @@ class MySQLStrategy(DatabaseStrategy):
 
             # Configuraciones específicas para MySQL
             engine_config = {
-                "pool_size": 5,
-                "max_overflow": 10,
-                "pool_timeout": 30,
-                "pool_recycle": 3600,
+                **PoolSettings().ENGINE_KWARGS,
+                "poolclass": InstrumentedQueuePool,
                 "echo": False,
                 "connect_args": {"charset": "utf8mb4", "connect_timeout": 10},
             }
 
             self.engine = create_engine(connection_string, **engine_config)
+            register_connect_hook(self.engine, self.connection_init_statements())
+            instrument_engine(self.engine, "mysql")
+            register_circuit_breaker(self.engine, self.circuit_breaker)
             self.SessionLocal = sessionmaker(
                 autocommit=False, autoflush=False, bind=self.engine
             )
@@ -243,24 +375,216 @@ class MySQLStrategy(DatabaseStrategy):
             )
             raise
 
-    @retry_with_backoff(
-        config=RetryConfig(max_retries=2, base_delay=1.0), retry_on=(SQLAlchemyError,)
-    )
-    def get_session(self) -> Session:
-        """Retorna una nueva sesión de MySQL"""
-        if not self.SessionLocal:
-            raise RuntimeError("Engine MySQL no inicializado")
+    def connection_init_statements(self) -> List[str]:
+        """Charset y variables de sesión de cada conexión MySQL"""
+        return mysql_session_statements(self.session_variables)
+
+
+class AsyncDatabaseStrategy(ABC):
+    """
+    Base de las estrategias asíncronas: mismo contrato que DatabaseStrategy,
+    pero con AsyncEngine/AsyncSession para no bloquear el event loop.
+    """
+
+    circuit_name = "database"
+    search_index_class = None
+
+    def __init__(self, logger: logging.Logger = None):
+        self.logger = logger or logging.getLogger(__name__)
+        self.engine: Optional[AsyncEngine] = None
+        self.SessionLocal: Optional[async_sessionmaker[AsyncSession]] = None
+        self._connection_validated = False
+        self.error_handler = ErrorHandler(self.logger)
+        self.circuit_breaker = get_circuit_breaker(self.circuit_name, logger=self.logger)
+
+    @abstractmethod
+    def get_connection_string(self) -> str:
+        pass
+
+    @abstractmethod
+    def _initialize_engine_safe(self):
+        pass
+
+    def connection_init_statements(self) -> List[str]:
+        """Sentencias que se ejecutan una vez por conexión nueva del pool"""
+        return []
+
+    def search_index(self) -> SearchIndex:
+        """Índice de texto completo de productos del motor (ver search_index)"""
+        if self.search_index_class is None:
+            raise NotImplementedError(f"{type(self).__name__} no tiene índice de búsqueda")
+        return self.search_index_class()
+
+    def _build_engine(self, pool_name: str, connection_string: str, **engine_config):
+        self.engine = create_async_engine(
+            connection_string,
+            **PoolSettings().ENGINE_KWARGS,
+            poolclass=InstrumentedAsyncQueuePool,
+            **engine_config,
+        )
+        register_connect_hook(self.engine.sync_engine, self.connection_init_statements())
+        instrument_engine(self.engine.sync_engine, pool_name)
+        register_circuit_breaker(self.engine.sync_engine, self.circuit_breaker)
+        self.SessionLocal = async_sessionmaker(
+            self.engine, autoflush=False, expire_on_commit=False
+        )
+
+    def get_session(self) -> AsyncSession:
+        self.circuit_breaker.before_call()
+        if self.SessionLocal is None:
+            self._initialize_engine_safe()
+        return self.SessionLocal()  # pylint: disable=not-callable
+
+    async def validate_connection(self) -> bool:
+        try:
+            async with self.get_session() as session:
+                await session.execute(text("SELECT 1;"))
+            self._connection_validated = True
+            self.logger.info("✅ Conexión asíncrona validada correctamente")
+            return True
+        except Exception as e:
+            self.logger.error("❌ Error validando conexión asíncrona: %s", e)
+            self._connection_validated = False
+            return False
+
+    def is_connection_valid(self) -> bool:
+        return self._connection_validated
+
+    async def create_tables_if_not_exist(self):
+        try:
+            async with self.engine.begin() as conn:
+                await conn.run_sync(Base.metadata.create_all)
+            self.logger.info("✅ Tablas verificadas/creadas correctamente")
+        except Exception as e:
+            self.logger.error("❌ Error creando tablas: %s", e)
+            raise
+
+    async def prewarm(self, connections: int) -> int:
+        """Abre `connections` conexiones a la vez y las devuelve al pool"""
+        opened = []
+        try:
+            for _ in range(connections):
+                opened.append(await self.engine.connect())
+        finally:
+            for connection in opened:
+                await connection.close()
+        self.logger.info(f"🔥 Pool asíncrono precalentado con {len(opened)} conexiones")
+        return len(opened)
+
+    async def dispose(self):
+        """Cierra las conexiones del pool asíncrono"""
+        if self.engine is not None:
+            await self.engine.dispose()
+
+
+class AsyncPostgreSQLStrategy(AsyncDatabaseStrategy):
+    """Estrategia asíncrona para PostgreSQL (driver asyncpg)"""
+
+    circuit_name = "postgresql"
+    search_index_class = PostgreSQLTsvectorIndex
+
+    def __init__(self, logger: logging.Logger = None):
+        super().__init__(logger)
+        self._initialize_engine_safe()
+
+    def get_connection_string(self) -> str:
+        db_settings = DBSettings()
+        url = make_url(db_settings.DATABASE_URL)
+        return url.set(drivername="postgresql+asyncpg").render_as_string(hide_password=False)
+
+    def _initialize_engine_safe(self):
+        try:
+            self._build_engine(
+                "async_postgresql",
+                self.get_connection_string(),
+                echo=False,
+            )
+            self.logger.info("🐘 Engine asíncrono PostgreSQL inicializado correctamente")
+        except Exception as e:
+            self.error_handler.handle_error(
+                e, ErrorType.DATABASE_ERROR, "Inicializando engine asíncrono PostgreSQL", fatal=True
+            )
+            raise
+
+
+class AsyncSQLiteStrategy(AsyncDatabaseStrategy):
+    """Estrategia asíncrona para SQLite (driver aiosqlite)"""
+
+    circuit_name = "sqlite"
+    search_index_class = SQLiteFTS5Index
+
+    # Misma validación de ruta que la estrategia síncrona
+    _validate_db_path = SQLiteStrategy._validate_db_path
+
+    def __init__(
+        self,
+        db_path: str = "database_sqlite.db",
+        logger: logging.Logger = None,
+        pragmas: dict = None,
+    ):
+        super().__init__(logger)
+        self.db_path = self._validate_db_path(db_path)
+        self.pragmas = {**DEFAULT_SQLITE_PRAGMAS, **(pragmas or {})}
+        self._initialize_engine_safe()
+
+    def get_connection_string(self) -> str:
+        return f"sqlite+aiosqlite:///{self.db_path}"
+
+    def connection_init_statements(self) -> List[str]:
+        return sqlite_pragma_statements(self.pragmas)
+
+    def _initialize_engine_safe(self):
+        try:
+            self._build_engine(
+                "async_sqlite",
+                self.get_connection_string(),
+                echo=False,
+                connect_args={"timeout": 20},
+            )
+            self.logger.info(f"💾 Engine asíncrono SQLite inicializado: {self.db_path}")
+        except Exception as e:
+            self.error_handler.handle_error(
+                e,
+                ErrorType.DATABASE_ERROR,
+                f"Inicializando engine asíncrono SQLite: {self.db_path}",
+                fatal=True,
+            )
+            raise
+
+
+class AsyncMySQLStrategy(AsyncDatabaseStrategy):
+    """Estrategia asíncrona para MySQL (driver aiomysql)"""
+
+    circuit_name = "mysql"
+    search_index_class = MySQLFulltextIndex
+
+    # Mismas variables de entorno y validación que la estrategia síncrona
+    _sync_connection_string = MySQLStrategy.get_connection_string
+
+    def __init__(self, logger: logging.Logger = None, session_variables: dict = None):
+        super().__init__(logger)
+        self.session_variables = {**DEFAULT_MYSQL_SESSION_VARIABLES, **(session_variables or {})}
+        self._initialize_engine_safe()
+
+    def connection_init_statements(self) -> List[str]:
+        return mysql_session_statements(self.session_variables)
 
+    def get_connection_string(self) -> str:
+        connection_string = self._sync_connection_string()
+        return connection_string.replace("mysql+pymysql://", "mysql+aiomysql://", 1)
+
+    def _initialize_engine_safe(self):
         try:
-            session = self.SessionLocal()
-            # Configurar MySQL para mejor manejo de UTF-8
-            session.execute(text("SET NAMES utf8mb4"))
-            session.execute(text("SET CHARACTER SET utf8mb4"))
-            session.execute(text("SET character_set_connection=utf8mb4"))
-            return session
+            self._build_engine(
+                "async_mysql",
+                self.get_connection_string(),
+                echo=False,
+                connect_args={"charset": "utf8mb4", "connect_timeout": 10},
+            )
+            self.logger.info("🐬 Engine asíncrono MySQL inicializado exitosamente")
         except Exception as e:
             self.error_handler.handle_error(
-                e, ErrorType.DATABASE_ERROR, "Creando sesión MySQL"
+                e, ErrorType.DATABASE_ERROR, "Inicializando engine asíncrono MySQL", fatal=True
             )
             raise
 
@@ -271,11 +595,21 @@ class DatabaseStrategyFactory:
         "sqlite": SQLiteStrategy,
         "mysql": MySQLStrategy,
     }
+    _async_strategies = {
+        "postgresql": AsyncPostgreSQLStrategy,
+        "sqlite": AsyncSQLiteStrategy,
+        "mysql": AsyncMySQLStrategy,
+    }
 
     @classmethod
     def create_strategy(
-        cls, db_type: str, logger: logging.Logger = None, **kwargs
+        cls, db_type: str, logger: logging.Logger = None, validate: bool = True, **kwargs
     ) -> DatabaseStrategy:
+        """
+        Crea la estrategia de `db_type`. Con `validate=False` solo se construye
+        el engine (sin conectarse); la validación y las tablas quedan para
+        el arranque de la aplicación.
+        """
         if db_type not in cls._strategies:
             available = ", ".join(cls._strategies.keys())
             raise ValueError(
@@ -284,6 +618,8 @@ class DatabaseStrategyFactory:
 
         strategy_class = cls._strategies[db_type]
         strategy = strategy_class(logger=logger, **kwargs)
+        if not validate:
+            return strategy
 
         if not strategy.validate_connection():
             raise RuntimeError(f"No se pudo validar conexión para {db_type}")
@@ -293,3 +629,28 @@ class DatabaseStrategyFactory:
             logger.info(f"✅ Estrategia {db_type} creada y validada exitosamente")
 
         return strategy
+
+    @classmethod
+    async def create_async_strategy(
+        cls, db_type: str, logger: logging.Logger = None, validate: bool = True, **kwargs
+    ) -> AsyncDatabaseStrategy:
+        if db_type not in cls._async_strategies:
+            available = ", ".join(cls._async_strategies.keys())
+            raise ValueError(
+                f"Tipo de base de datos no soportado: {db_type}. Disponibles: {available}"
+            )
+
+        strategy_class = cls._async_strategies[db_type]
+        strategy = strategy_class(logger=logger, **kwargs)
+        if not validate:
+            return strategy
+
+        if not await strategy.validate_connection():
+            await strategy.dispose()
+            raise RuntimeError(f"No se pudo validar conexión asíncrona para {db_type}")
+
+        await strategy.create_tables_if_not_exist()
+        if logger:
+            logger.info(f"✅ Estrategia asíncrona {db_type} creada y validada exitosamente")
+
+        return strategy
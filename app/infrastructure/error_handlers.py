@@ -1,8 +1,21 @@
+import os
+import re
+import json
+import mmap
 import time
+import codecs
+import random
+import tempfile
+import asyncio
 import logging
-from typing import Any, Callable, Optional, Dict, List
+import threading
+from typing import Any, Callable, Optional, Dict, Iterable, Iterator, List, Tuple
+from collections import deque
 from functools import wraps
 from enum import Enum
+import numpy as np
+import pandas as pd
+from app.infrastructure.actor_parser import parse_actor_list, parse_actor_string
 
 
 class ErrorType(Enum):
@@ -32,12 +45,75 @@ class RetryConfig:
                  base_delay: float = 1.0,
                  max_delay: float = 60.0,
                  backoff_factor: float = 2.0,
-                 jitter: bool = True):
+                 jitter: bool = True,
+                 deadline: Optional[float] = None):
         self.max_retries = max_retries
         self.base_delay = base_delay
         self.max_delay = max_delay
         self.backoff_factor = backoff_factor
         self.jitter = jitter
+        # Presupuesto total en segundos (intentos + esperas); None = sin límite
+        self.deadline = deadline
+
+    def delay_for(self, attempt: int) -> float:
+        """Espera antes del reintento número `attempt + 1`"""
+        delay = min(self.base_delay * (self.backoff_factor ** attempt), self.max_delay)
+        if self.jitter:
+            delay *= (0.5 + random.random() * 0.5)
+        return delay
+
+
+class RetryStats:
+    """Métricas acumuladas de una función decorada con retry_with_backoff"""
+
+    def __init__(self, name: str):
+        self.name = name
+        self.calls = 0
+        self.attempts = 0
+        self.retries = 0
+        self.failures = 0
+        self.deadline_exceeded = 0
+        self.slept_seconds = 0.0
+        self._lock = threading.Lock()
+
+    def record(self, **increments):
+        with self._lock:
+            for field, value in increments.items():
+                setattr(self, field, getattr(self, field) + value)
+
+    def snapshot(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                "calls": self.calls,
+                "attempts": self.attempts,
+                "retries": self.retries,
+                "failures": self.failures,
+                "deadline_exceeded": self.deadline_exceeded,
+                "slept_seconds": self.slept_seconds,
+            }
+
+
+_retry_registry: Dict[str, RetryStats] = {}
+
+
+def get_retry_stats() -> Dict[str, Dict[str, Any]]:
+    """Métricas de reintentos de todas las funciones decoradas"""
+    return {name: stats.snapshot() for name, stats in _retry_registry.items()}
+
+
+def render_retry_prometheus() -> str:
+    """Métricas de reintentos en formato de texto Prometheus"""
+    lines = []
+    snapshots = get_retry_stats()
+    for field in ("calls", "attempts", "retries", "failures", "deadline_exceeded"):
+        metric = f"retry_{field}_total"
+        lines.append(f"# TYPE {metric} counter")
+        for name, snap in snapshots.items():
+            lines.append(f'{metric}{{function="{name}"}} {snap[field]}')
+    lines.append("# TYPE retry_slept_seconds_total counter")
+    for name, snap in snapshots.items():
+        lines.append(f'retry_slept_seconds_total{{function="{name}"}} {snap["slept_seconds"]}')
+    return "\n".join(lines) + "\n"
 
 
 def retry_with_backoff(config: RetryConfig = None, 
@@ -46,6 +122,10 @@ def retry_with_backoff(config: RetryConfig = None,
     """
     Decorador para reintentos con backoff exponencial
     
+    Funciona con funciones síncronas (espera con time.sleep) y con
+    corrutinas `async def` (espera con asyncio.sleep, sin bloquear el
+    event loop). Las métricas quedan en `wrapper.retry_stats`.
+    
     Args:
         config: Configuración de reintentos
         retry_on: Tupla de excepciones en las que reintentar
@@ -55,52 +135,549 @@ def retry_with_backoff(config: RetryConfig = None,
         config = RetryConfig()
     
     def decorator(func: Callable):
+        stats = _retry_registry.setdefault(func.__qualname__, RetryStats(func.__qualname__))
+
+        def next_delay(error: Exception, attempt: int, started: float) -> Optional[float]:
+            """Espera antes del próximo intento, o None si hay que rendirse"""
+            if attempt == config.max_retries:
+                stats.record(failures=1)
+                if logger:
+                    logger.error(f"❌ Función {func.__name__} falló después de {config.max_retries} reintentos: {str(error)}")
+                return None
+            
+            delay = config.delay_for(attempt)
+            if config.deadline is not None:
+                remaining = config.deadline - (time.monotonic() - started)
+                if remaining <= delay:
+                    stats.record(failures=1, deadline_exceeded=1)
+                    if logger:
+                        logger.error(f"❌ Función {func.__name__} agotó su plazo de {config.deadline:.2f}s: {str(error)}")
+                    return None
+            
+            stats.record(retries=1, slept_seconds=delay)
+            if logger:
+                logger.warning(f"⚠️ Intento {attempt + 1}/{config.max_retries + 1} falló para {func.__name__}: {str(error)}. Reintentando en {delay:.2f}s")
+            return delay
+
+        if asyncio.iscoroutinefunction(func):
+            @wraps(func)
+            async def async_wrapper(*args, **kwargs):
+                stats.record(calls=1)
+                started = time.monotonic()
+                for attempt in range(config.max_retries + 1):
+                    stats.record(attempts=1)
+                    try:
+                        return await func(*args, **kwargs)
+                    except retry_on as e:
+                        delay = next_delay(e, attempt, started)
+                        if delay is None:
+                            raise
+                    await asyncio.sleep(delay)
+
+            async_wrapper.retry_stats = stats
+            return async_wrapper
+
         @wraps(func)
         def wrapper(*args, **kwargs):
-            last_exception = None
-            
+            stats.record(calls=1)
+            started = time.monotonic()
             for attempt in range(config.max_retries + 1):
+                stats.record(attempts=1)
                 try:
                     return func(*args, **kwargs)
                 except retry_on as e:
-                    last_exception = e
-                    
-                    if attempt == config.max_retries:
-                        if logger:
-                            logger.error(f"❌ Función {func.__name__} falló después de {config.max_retries} reintentos: {str(e)}")
+                    delay = next_delay(e, attempt, started)
+                    if delay is None:
                         raise
-                    
-                    delay = min(
-                        config.base_delay * (config.backoff_factor ** attempt),
-                        config.max_delay
-                    )
-                    
-                    if config.jitter:
-                        import random
-                        delay *= (0.5 + random.random() * 0.5)
-                    
-                    if logger:
-                        logger.warning(f"⚠️ Intento {attempt + 1}/{config.max_retries + 1} falló para {func.__name__}: {str(e)}. Reintentando en {delay:.2f}s")
-                    
-                    time.sleep(delay)
-            
-            raise last_exception
+                time.sleep(delay)
         
+        wrapper.retry_stats = stats
         return wrapper
     return decorator
 
 
+class CircuitState(Enum):
+    """Estados del circuit breaker"""
+    CLOSED = "closed"
+    OPEN = "open"
+    HALF_OPEN = "half_open"
+
+
+class CircuitOpenError(Exception):
+    """Se lanza cuando el circuito está abierto y la llamada se rechaza sin intentarla"""
+    def __init__(self, name: str, retry_in: float):
+        super().__init__(f"Circuito '{name}' abierto; reintentar en {retry_in:.1f}s")
+        self.name = name
+        self.retry_in = retry_in
+
+
+class CircuitBreaker:
+    """
+    Circuit breaker por tasa de fallos.
+    
+    - closed: las llamadas pasan; si en las últimas `window_size` llamadas
+      (con al menos `min_calls`) la tasa de fallos llega a
+      `failure_threshold`, el circuito se abre.
+    - open: las llamadas fallan de inmediato con CircuitOpenError hasta
+      que pasan `cooldown` segundos.
+    - half_open: se deja pasar una sola llamada de prueba; si tiene éxito
+      el circuito se cierra, si falla vuelve a abrirse. Si la prueba no
+      reporta resultado en `probe_timeout` segundos se permite otra.
+    """
+
+    def __init__(self,
+                 name: str,
+                 failure_threshold: float = 0.5,
+                 window_size: int = 20,
+                 min_calls: int = 5,
+                 cooldown: float = 30.0,
+                 probe_timeout: float = 10.0,
+                 logger: logging.Logger = None):
+        self.name = name
+        self.failure_threshold = failure_threshold
+        self.min_calls = min_calls
+        self.cooldown = cooldown
+        self.probe_timeout = probe_timeout
+        self.logger = logger or logging.getLogger(__name__)
+        self.state = CircuitState.CLOSED
+        self.rejected = 0
+        self.opened_count = 0
+        self._window = deque(maxlen=window_size)
+        self._opened_at = 0.0
+        self._probe_started: Optional[float] = None
+        self._lock = threading.Lock()
+
+    def _open(self, now: float):
+        self.state = CircuitState.OPEN
+        self.opened_count += 1
+        self._opened_at = now
+        self._probe_started = None
+        self._window.clear()
+        self.logger.error(f"🔌 Circuito '{self.name}' abierto por {self.cooldown:.1f}s")
+
+    def before_call(self):
+        """Valida que la llamada pueda intentarse; si no, lanza CircuitOpenError"""
+        if self.state is CircuitState.CLOSED:
+            return
+        with self._lock:
+            now = time.monotonic()
+            if self.state is CircuitState.OPEN:
+                retry_in = self.cooldown - (now - self._opened_at)
+                if retry_in > 0:
+                    self.rejected += 1
+                    raise CircuitOpenError(self.name, retry_in)
+                self.state = CircuitState.HALF_OPEN
+                self.logger.warning(f"⚠️ Circuito '{self.name}' semiabierto: probando conexión")
+            if self.state is CircuitState.HALF_OPEN:
+                if self._probe_started is not None and now - self._probe_started < self.probe_timeout:
+                    self.rejected += 1
+                    raise CircuitOpenError(self.name, self.probe_timeout - (now - self._probe_started))
+                self._probe_started = now
+
+    def record_success(self):
+        with self._lock:
+            if self.state is CircuitState.HALF_OPEN:
+                self.state = CircuitState.CLOSED
+                self._probe_started = None
+                self._window.clear()
+                self.logger.info(f"✅ Circuito '{self.name}' cerrado")
+            self._window.append(False)
+
+    def record_failure(self):
+        with self._lock:
+            now = time.monotonic()
+            if self.state is CircuitState.HALF_OPEN:
+                self._open(now)
+                return
+            if self.state is CircuitState.OPEN:
+                return
+            self._window.append(True)
+            if len(self._window) >= self.min_calls:
+                failure_rate = sum(self._window) / len(self._window)
+                if failure_rate >= self.failure_threshold:
+                    self._open(now)
+
+    def __call__(self, func: Callable):
+        """Decorador: protege `func` (síncrona o `async def`) con el circuito"""
+        if asyncio.iscoroutinefunction(func):
+            @wraps(func)
+            async def async_wrapper(*args, **kwargs):
+                self.before_call()
+                try:
+                    result = await func(*args, **kwargs)
+                except Exception:
+                    self.record_failure()
+                    raise
+                self.record_success()
+                return result
+            return async_wrapper
+
+        @wraps(func)
+        def wrapper(*args, **kwargs):
+            self.before_call()
+            try:
+                result = func(*args, **kwargs)
+            except Exception:
+                self.record_failure()
+                raise
+            self.record_success()
+            return result
+        return wrapper
+
+    def snapshot(self) -> Dict[str, Any]:
+        """Estado actual del circuito"""
+        with self._lock:
+            failures = sum(self._window)
+            return {
+                "state": self.state.value,
+                "calls_in_window": len(self._window),
+                "failures_in_window": failures,
+                "failure_rate": failures / len(self._window) if self._window else 0.0,
+                "opened_count": self.opened_count,
+                "rejected": self.rejected,
+                "retry_in": max(self.cooldown - (time.monotonic() - self._opened_at), 0.0)
+                if self.state is CircuitState.OPEN else 0.0,
+            }
+
+
+_circuit_registry: Dict[str, CircuitBreaker] = {}
+_circuit_registry_lock = threading.Lock()
+
+
+def get_circuit_breaker(name: str, **kwargs) -> CircuitBreaker:
+    """Circuito compartido con `name`; `kwargs` solo se usan al crearlo"""
+    with _circuit_registry_lock:
+        if name not in _circuit_registry:
+            _circuit_registry[name] = CircuitBreaker(name, **kwargs)
+        return _circuit_registry[name]
+
+
+def get_circuit_states() -> Dict[str, Dict[str, Any]]:
+    """Estado de todos los circuitos registrados"""
+    return {name: breaker.snapshot() for name, breaker in _circuit_registry.items()}
+
+
+def render_circuit_prometheus() -> str:
+    """Estado de los circuitos en formato de texto Prometheus"""
+    states = get_circuit_states()
+    lines = ["# TYPE circuit_state gauge"]
+    for name, snap in states.items():
+        for state in CircuitState:
+            value = 1 if snap["state"] == state.value else 0
+            lines.append(f'circuit_state{{circuit="{name}",state="{state.value}"}} {value}')
+    lines.append("# TYPE circuit_opened_total counter")
+    for name, snap in states.items():
+        lines.append(f'circuit_opened_total{{circuit="{name}"}} {snap["opened_count"]}')
+    lines.append("# TYPE circuit_rejected_total counter")
+    for name, snap in states.items():
+        lines.append(f'circuit_rejected_total{{circuit="{name}"}} {snap["rejected"]}')
+    return "\n".join(lines) + "\n"
+
+
+# Códigos de rechazo de la validación en lote
+REASON_MISSING_TITLE = "missing_title"
+REASON_INVALID_TITLE = "invalid_title"
+REASON_INVALID_URL = "invalid_url"
+
+# Campos que se copian sin validar, igual que en validate_movie_data
+PASSTHROUGH_FIELDS = ['date_published', 'alternate_title', 'movie_id']
+
+
+def _float_in_range(value: Any, low: float, high: float) -> Optional[float]:
+    """float(value) si está en [low, high]; None si falta, es inválido o está fuera de rango"""
+    if value is None:
+        return None
+    try:
+        number = float(value)
+    except (ValueError, TypeError):
+        return None
+    return number if low <= number <= high else None
+
+
+def _year_from_date(value: Any) -> Optional[int]:
+    """Año de las 4 primeras posiciones de la fecha, si está en 1888-2030"""
+    if not value:
+        return None
+    try:
+        year = int(str(value)[:4])
+    except (ValueError, TypeError):
+        return None
+    return year if 1888 <= year <= 2030 else None
+
+
+def _duration_minutes(value: Any) -> Optional[int]:
+    """
+    Duración entera en minutos si está en 1-1000. A diferencia de
+    validate_movie_data, una duración infinita da None (OverflowError) en
+    vez de propagar la excepción.
+    """
+    if value is None:
+        return None
+    try:
+        minutes = int(float(value))
+    except (ValueError, TypeError, OverflowError):
+        return None
+    return minutes if 1 <= minutes <= 1000 else None
+
+
+def _map_uniques(values: pd.Series, func: Callable) -> Tuple[np.ndarray, list]:
+    """
+    Aplica `func` una vez por valor distinto (factorize). Retorna los códigos
+    por fila y los resultados por valor distinto; el valor de la fila i es
+    `mapped[codes[i]]`.
+    """
+    try:
+        codes, uniques = pd.factorize(values.astype(object), use_na_sentinel=False)
+    except TypeError:
+        # Valores no hashables (listas, dicts): se evalúan fila a fila
+        return np.arange(len(values)), [func(value) for value in values]
+    return codes, [func(value) for value in uniques]
+
+
+def _object_array(items: list) -> np.ndarray:
+    """Array object 1-D sin que NumPy expanda las listas anidadas"""
+    array = np.empty(len(items), dtype=object)
+    array[:] = items
+    return array
+
+
+def _nullable_column(values: pd.Series, func: Callable, dtype: str) -> pd.Series:
+    """Columna `dtype` (Int64/Float64) con `func` aplicada por valor distinto"""
+    codes, mapped = _map_uniques(values, func)
+    return pd.Series(pd.array(mapped, dtype=dtype).take(codes), index=values.index)
+
+
+def _object_column(values: pd.Series, func: Callable) -> pd.Series:
+    """Columna object con `func` aplicada por valor distinto"""
+    codes, mapped = _map_uniques(values, func)
+    return pd.Series(_object_array(mapped)[codes], index=values.index)
+
+
+def _float_column(values: pd.Series, low: float, high: float) -> pd.Series:
+    """Columna Float64 con los valores en [low, high] y NA en el resto"""
+    if pd.api.types.is_numeric_dtype(values) and not pd.api.types.is_bool_dtype(values):
+        numbers = values.to_numpy(dtype="float64", na_value=np.nan)
+        keep = (numbers >= low) & (numbers <= high)
+        return pd.Series(pd.array(np.where(keep, numbers, np.nan), dtype="Float64"), index=values.index)
+    return _nullable_column(values, lambda value: _float_in_range(value, low, high), "Float64")
+
+
+def _duration_column(values: pd.Series) -> pd.Series:
+    """
+    Columna Int64 de duración; truncamiento igual que int(float(valor)).
+    Las duraciones no finitas quedan como NA (ver _duration_minutes).
+    """
+    if pd.api.types.is_numeric_dtype(values) and not pd.api.types.is_bool_dtype(values):
+        numbers = values.to_numpy(dtype="float64", na_value=np.nan)
+        with np.errstate(invalid="ignore"):
+            minutes = np.trunc(numbers)
+        keep = np.isfinite(minutes) & (minutes >= 1) & (minutes <= 1000)
+        result = pd.array(np.where(keep, minutes, 0).astype("int64"), dtype="Int64")
+        result[~keep] = pd.NA
+        return pd.Series(result, index=values.index)
+    return _nullable_column(values, _duration_minutes, "Int64")
+
+
+def _text_column(values: pd.Series) -> Tuple[pd.Series, np.ndarray]:
+    """Texto sin espacios en los extremos y máscara de valores que no son str"""
+    codes, stripped = _map_uniques(values, lambda value: value.strip() if isinstance(value, str) else None)
+    invalid = np.array([value is None for value in stripped], dtype=bool)[codes]
+    return pd.Series(_object_array(stripped)[codes], index=values.index), invalid
+
+
+class ErrorReporter:
+    """
+    Agregador de errores y avisos para cargas de alto volumen.
+    
+    En lugar de una línea de log por error, cuenta por categoría, guarda
+    una muestra acotada de registros por categoría (reservoir sampling) y
+    escribe un resumen cada `summary_interval` segundos y al final de la
+    carga. Es seguro entre threads; entre procesos cada worker envía su
+    `snapshot()` y el proceso principal lo combina con `merge()`.
+    """
+
+    def __init__(self,
+                 logger: logging.Logger = None,
+                 sample_size: int = 5,
+                 summary_interval: Optional[float] = 30.0,
+                 max_error_ratio: float = 0.05,
+                 min_records: int = 100):
+        self.logger = logger or logging.getLogger(__name__)
+        self.sample_size = sample_size
+        self.summary_interval = summary_interval
+        self.max_error_ratio = max_error_ratio
+        self.min_records = min_records
+        self.processed = 0
+        self.counts: Dict[str, int] = {}
+        self.samples: Dict[str, List[Any]] = {}
+        # Ofertas al reservoir por categoría (puede ser menor que counts)
+        self._offered: Dict[str, int] = {}
+        self._last_summary = time.monotonic()
+        self._lock = threading.Lock()
+        self._random = random.Random()
+
+    def _offer(self, category: str, sample: Any):
+        """Algoritmo R: cada muestra ofrecida queda con probabilidad k/n"""
+        offered = self._offered.get(category, 0) + 1
+        self._offered[category] = offered
+        reservoir = self.samples.setdefault(category, [])
+        if len(reservoir) < self.sample_size:
+            reservoir.append(sample)
+        else:
+            slot = self._random.randrange(offered)
+            if slot < self.sample_size:
+                reservoir[slot] = sample
+
+    def record(self, category: str, sample: Any = None, count: int = 1):
+        """Suma `count` ocurrencias de `category`; `sample` entra al reservoir"""
+        with self._lock:
+            self.counts[category] = self.counts.get(category, 0) + count
+            if sample is not None:
+                self._offer(category, sample)
+        self.maybe_log_summary()
+
+    def _merge_samples(self, category: str, samples: List[Any], offered: int):
+        """
+        Combina `samples` (muestra uniforme de `offered` ocurrencias) con el
+        reservoir de `category`. Cuántas muestras aporta cada lado se sortea
+        como k extracciones sin reemplazo del total (hipergeométrica), así el
+        resultado sigue siendo uniforme sobre todas las ocurrencias.
+        """
+        own_samples = self.samples.get(category, [])
+        own_left = own_offered = self._offered.get(category, 0)
+        other_left = offered
+        take_own = 0
+        for _ in range(min(self.sample_size, own_offered + offered)):
+            if self._random.randrange(own_left + other_left) < own_left:
+                take_own += 1
+                own_left -= 1
+            else:
+                other_left -= 1
+        take_other = min(self.sample_size, own_offered + offered) - take_own
+        self.samples[category] = (
+            self._random.sample(own_samples, take_own) + self._random.sample(samples, take_other)
+        )
+        self._offered[category] = own_offered + offered
+
+    def record_many(self, category: str, count: int, samples: List[Any] = ()):
+        """
+        Registra `count` ocurrencias de una vez (validación en lote);
+        `samples` debe ser una muestra uniforme de esas ocurrencias.
+        """
+        if count <= 0:
+            return
+        with self._lock:
+            self.counts[category] = self.counts.get(category, 0) + count
+            if samples:
+                self._merge_samples(category, list(samples), count)
+        self.maybe_log_summary()
+
+    def record_processed(self, count: int = 1):
+        """Registros procesados (denominador de la tasa de error)"""
+        with self._lock:
+            self.processed += count
+
+    def error_count(self, category: str = None) -> int:
+        if category is None:
+            return sum(self.counts.values())
+        return self.counts.get(category, 0)
+
+    def error_ratio(self, category: str = None) -> float:
+        """Errores / registros procesados (0 si aún no hay registros)"""
+        if not self.processed:
+            return 0.0
+        return self.error_count(category) / self.processed
+
+    def threshold_exceeded(self, category: str = None) -> bool:
+        """True si, con al menos `min_records` procesados, la tasa supera `max_error_ratio`"""
+        return self.processed >= self.min_records and self.error_ratio(category) > self.max_error_ratio
+
+    def summary(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                "processed": self.processed,
+                "errors": sum(self.counts.values()),
+                "by_category": dict(sorted(self.counts.items(), key=lambda item: -item[1])),
+                "samples": {category: list(samples) for category, samples in self.samples.items()},
+            }
+
+    def log_summary(self, final: bool = False):
+        """Escribe el resumen agregado en el log"""
+        summary = self.summary()
+        self._last_summary = time.monotonic()
+        if not summary["errors"]:
+            if final:
+                self.logger.info("✅ %d registros procesados sin errores", summary["processed"])
+            return
+        ratio = summary["errors"] / summary["processed"] if summary["processed"] else 0.0
+        self.logger.warning(
+            "%s %d errores en %d registros (%.2f%%): %s",
+            "📊 Resumen final:" if final else "📊 Resumen parcial:",
+            summary["errors"], summary["processed"], ratio * 100, summary["by_category"],
+        )
+        for category, samples in summary["samples"].items():
+            self.logger.warning("   ↳ %s, ejemplos: %s", category, [str(sample)[:200] for sample in samples])
+
+    def maybe_log_summary(self):
+        """Resumen periódico si pasaron `summary_interval` segundos desde el último"""
+        if self.summary_interval is not None and time.monotonic() - self._last_summary >= self.summary_interval:
+            self.log_summary()
+
+    def snapshot(self) -> Dict[str, Any]:
+        """Estado serializable (picklable) para combinar entre procesos"""
+        with self._lock:
+            return {
+                "processed": self.processed,
+                "counts": dict(self.counts),
+                "offered": dict(self._offered),
+                "samples": {category: list(samples) for category, samples in self.samples.items()},
+            }
+
+    def merge(self, snapshot: Dict[str, Any]):
+        """
+        Combina el snapshot de otro reporter; el reservoir resultante sigue
+        siendo una muestra uniforme del total.
+        """
+        with self._lock:
+            self.processed += snapshot["processed"]
+            for category, count in snapshot["counts"].items():
+                self.counts[category] = self.counts.get(category, 0) + count
+            for category, other_samples in snapshot["samples"].items():
+                if other_samples:
+                    offered = snapshot["offered"].get(category, len(other_samples))
+                    self._merge_samples(category, other_samples, offered)
+
+    def reset(self):
+        with self._lock:
+            self.processed = 0
+            self.counts.clear()
+            self.samples.clear()
+            self._offered.clear()
+
+
 class DataValidator:
     """Validador de datos con reglas configurables"""
     
     @staticmethod
-    def validate_movie_data(movie_data: Dict[str, Any], logger: logging.Logger = None) -> Dict[str, Any]:
+    def _warn(logger: Optional[logging.Logger], reporter: Optional[ErrorReporter],
+              category: str, message: str, value: Any):
+        """Aviso de un campo: al reporter (agregado) o, si no hay, al logger"""
+        if reporter is not None:
+            reporter.record(category, value)
+        elif logger:
+            logger.warning(message, value)
+    
+    @staticmethod
+    def validate_movie_data(movie_data: Dict[str, Any], logger: logging.Logger = None,
+                            reporter: ErrorReporter = None) -> Dict[str, Any]:
         """
         Valida y limpia datos de película
         
         Args:
             movie_data: Datos de película a validar
             logger: Logger para registrar validaciones
+            reporter: Si se indica, los avisos se agregan aquí en vez de
+                escribir una línea de log por campo
             
         Returns:
             Dict con datos validados y limpios
@@ -108,6 +685,8 @@ class DataValidator:
         Raises:
             ValidationError: Si los datos no pasan la validación
         """
+        if reporter is not None:
+            reporter.record_processed()
         if not isinstance(movie_data, dict):
             raise ValidationError("Los datos de película deben ser un diccionario", "movie_data", movie_data)
         
@@ -129,14 +708,12 @@ class DataValidator:
                 if 0 <= rating_float <= 10:
                     validated_data['rating'] = rating_float
                 else:
-                    if logger:
-                        logger.warning(f"⚠️ Rating fuera de rango (0-10): {rating_float}")
+                    DataValidator._warn(logger, reporter, "rating_out_of_range", "⚠️ Rating fuera de rango (0-10): %s", rating_float)
                     validated_data['rating'] = None
             else:
                 validated_data['rating'] = None
         except (ValueError, TypeError):
-            if logger:
-                logger.warning(f"⚠️ Rating inválido: {movie_data.get('rating')}")
+            DataValidator._warn(logger, reporter, "rating_invalid", "⚠️ Rating inválido: %s", movie_data.get('rating'))
             validated_data['rating'] = None
         
         # Validar y limpiar año
@@ -147,14 +724,12 @@ class DataValidator:
                 if 1888 <= year <= 2030:  # Rango válido de años de cine
                     validated_data['year'] = year
                 else:
-                    if logger:
-                        logger.warning(f"⚠️ Año fuera de rango válido: {year}")
+                    DataValidator._warn(logger, reporter, "year_out_of_range", "⚠️ Año fuera de rango válido: %s", year)
                     validated_data['year'] = None
             else:
                 validated_data['year'] = None
         except (ValueError, TypeError):
-            if logger:
-                logger.warning(f"⚠️ Fecha de publicación inválida: {movie_data.get('date_published')}")
+            DataValidator._warn(logger, reporter, "date_invalid", "⚠️ Fecha de publicación inválida: %s", movie_data.get('date_published'))
             validated_data['year'] = None
         
         # Validar duración
@@ -165,14 +740,12 @@ class DataValidator:
                 if 1 <= duration_int <= 1000:  # Rango razonable de minutos
                     validated_data['duration'] = duration_int
                 else:
-                    if logger:
-                        logger.warning(f"⚠️ Duración fuera de rango: {duration_int} minutos")
+                    DataValidator._warn(logger, reporter, "duration_out_of_range", "⚠️ Duración fuera de rango: %s minutos", duration_int)
                     validated_data['duration'] = None
             else:
                 validated_data['duration'] = None
         except (ValueError, TypeError):
-            if logger:
-                logger.warning(f"⚠️ Duración inválida: {movie_data.get('duration_minutes')}")
+            DataValidator._warn(logger, reporter, "duration_invalid", "⚠️ Duración inválida: %s", movie_data.get('duration_minutes'))
             validated_data['duration'] = None
         
         # Validar metascore
@@ -183,14 +756,12 @@ class DataValidator:
                 if 0 <= metascore_float <= 100:
                     validated_data['metascore'] = metascore_float
                 else:
-                    if logger:
-                        logger.warning(f"⚠️ Metascore fuera de rango (0-100): {metascore_float}")
+                    DataValidator._warn(logger, reporter, "metascore_out_of_range", "⚠️ Metascore fuera de rango (0-100): %s", metascore_float)
                     validated_data['metascore'] = None
             else:
                 validated_data['metascore'] = None
         except (ValueError, TypeError):
-            if logger:
-                logger.warning(f"⚠️ Metascore inválido: {movie_data.get('metascore')}")
+            DataValidator._warn(logger, reporter, "metascore_invalid", "⚠️ Metascore inválido: %s", movie_data.get('metascore'))
             validated_data['metascore'] = None
         
         # Validar actores
@@ -204,8 +775,8 @@ class DataValidator:
             validated_data['movie_url'] = movie_url
         else:
             validated_data['movie_url'] = movie_url  # Guardar aunque no sea válida
-            if movie_url and logger:
-                logger.warning(f"⚠️ URL de película posiblemente inválida: {movie_url}")
+            if movie_url:
+                DataValidator._warn(logger, reporter, "url_suspicious", "⚠️ URL de película posiblemente inválida: %s", movie_url)
         
         # Copiar otros campos
         for field in ['date_published', 'alternate_title', 'movie_id']:
@@ -213,41 +784,27 @@ class DataValidator:
                 validated_data[field] = movie_data[field]
         
         if errors:
+            if reporter is not None:
+                reporter.record(REASON_MISSING_TITLE, movie_data)
             raise ValidationError(f"Errores de validación: {'; '.join(errors)}")
         
-        if logger:
+        if logger and reporter is None:
             logger.debug(f"✅ Datos de película validados: {validated_data['title']}")
         
         return validated_data
     
     @staticmethod
     def _validate_actors_list(actors_data: Any, logger: logging.Logger = None) -> List[str]:
-        """Valida y limpia lista de actores"""
+        """Valida y limpia lista de actores (máximo 20, nombres internados)"""
         if not actors_data:
             return []
         
         try:
             if isinstance(actors_data, list):
-                clean_actors = [str(actor).strip() for actor in actors_data if actor and str(actor).strip()]
-                return clean_actors[:20]  # Límite máximo de 20 actores
+                return parse_actor_list(actors_data)
             elif isinstance(actors_data, str):
-                import ast
-                try:
-                    # Intentar evaluar como lista literal
-                    actors_list = ast.literal_eval(actors_data)
-                    if isinstance(actors_list, list):
-                        clean_actors = [str(actor).strip() for actor in actors_list if actor and str(actor).strip()]
-                        return clean_actors[:20]
-                except:
-                    # Si falla, dividir por separadores comunes
-                    separators = [';', ',', '|']
-                    for sep in separators:
-                        if sep in actors_data:
-                            clean_actors = [actor.strip() for actor in actors_data.split(sep) if actor.strip()]
-                            return clean_actors[:20]
-                    
-                    # Si no hay separadores, tratar como un solo actor
-                    return [actors_data.strip()] if actors_data.strip() else []
+                # Literal de lista o texto delimitado; memorizado por texto
+                return parse_actor_string(actors_data)
         except Exception as e:
             if logger:
                 logger.warning(f"⚠️ Error procesando actores: {e}")
@@ -255,14 +812,132 @@ class DataValidator:
         
         return []
 
+    @staticmethod
+    def validate_movie_batch(movies: Any, logger: logging.Logger = None,
+                             reporter: ErrorReporter = None) -> Tuple[pd.DataFrame, np.ndarray, np.ndarray]:
+        """
+        Valida un lote de películas de una sola vez
+        
+        Aplica las mismas reglas que validate_movie_data sobre columnas
+        completas: los numéricos se validan con NumPy y las columnas object
+        se evalúan una vez por valor distinto. Los avisos por campo se
+        registran como un resumen con conteos.
+        
+        Args:
+            movies: DataFrame o lista de diccionarios
+            logger: Logger para el resumen de la validación
+            reporter: Si se indica, los conteos por categoría (rechazos y
+                campos descartados, "<campo>_discarded") se agregan aquí
+            
+        Returns:
+            (validated, error_mask, reasons): DataFrame con una fila por
+            entrada (rating/metascore Float64, year/duration Int64, NA donde
+            la ruta escalar da None), máscara booleana de filas rechazadas y
+            código de rechazo por fila ("" si la fila es válida). Las filas
+            con el mismo valor de `actors` comparten la misma lista.
+        """
+        if isinstance(movies, pd.DataFrame):
+            frame = movies.reset_index(drop=True)
+            column = lambda name, default: frame[name] if name in frame else pd.Series([default] * len(frame), dtype=object)
+            passthrough = [field for field in PASSTHROUGH_FIELDS if field in frame]
+        else:
+            records = list(movies)
+            column = lambda name, default: pd.Series([record.get(name, default) for record in records], dtype=object)
+            passthrough = [field for field in PASSTHROUGH_FIELDS if any(field in record for record in records)]
+        n_rows = len(frame) if isinstance(movies, pd.DataFrame) else len(records)
+        
+        titles, invalid_title = _text_column(column('title', ''))
+        urls, invalid_url = _text_column(column('movie_url', ''))
+        
+        rating_raw = column('rating', None)
+        date_raw = column('date_published', '')
+        duration_raw = column('duration_minutes', None)
+        metascore_raw = column('metascore', None)
+        
+        validated = pd.DataFrame({
+            'title': titles,
+            'rating': _float_column(rating_raw, 0, 10),
+            'year': _nullable_column(date_raw, _year_from_date, "Int64"),
+            'duration': _duration_column(duration_raw),
+            'metascore': _float_column(metascore_raw, 0, 100),
+            'actors': _object_column(column('actors', []), DataValidator._validate_actors_list),
+            'movie_url': urls,
+        })
+        for field in passthrough:
+            validated[field] = column(field, None).to_numpy()
+        
+        missing_title = ~invalid_title & (titles.to_numpy(dtype=object) == '')
+        reasons = np.select(
+            [invalid_title, missing_title, invalid_url],
+            [REASON_INVALID_TITLE, REASON_MISSING_TITLE, REASON_INVALID_URL],
+            default='',
+        ).astype(object)
+        error_mask = reasons != ''
+        
+        if logger or reporter is not None:
+            # Valores presentes que no pasaron la validación (se guardan como nulos)
+            discarded_masks = {
+                'rating': (rating_raw.notna() & validated['rating'].isna()).to_numpy(),
+                'year': (date_raw.astype(bool) & validated['year'].isna()).to_numpy(),
+                'duration': (duration_raw.notna() & validated['duration'].isna()).to_numpy(),
+                'metascore': (metascore_raw.notna() & validated['metascore'].isna()).to_numpy(),
+            }
+            raw_columns = {'rating': rating_raw, 'year': date_raw, 'duration': duration_raw, 'metascore': metascore_raw}
+            if reporter is not None:
+                reporter.record_processed(n_rows)
+                rng = np.random.default_rng()
+                sample_rows = lambda rows: rng.choice(rows, size=min(len(rows), reporter.sample_size), replace=False)
+                for field, mask in discarded_masks.items():
+                    rows = np.flatnonzero(mask)
+                    if len(rows):
+                        reporter.record_many(f"{field}_discarded", len(rows), raw_columns[field].iloc[sample_rows(rows)].tolist())
+                for code in (REASON_INVALID_TITLE, REASON_MISSING_TITLE, REASON_INVALID_URL):
+                    rows = np.flatnonzero(reasons == code)
+                    if len(rows):
+                        reporter.record_many(code, len(rows), titles.iloc[sample_rows(rows)].tolist())
+            else:
+                discarded = {field: int(mask.sum()) for field, mask in discarded_masks.items() if mask.any()}
+                if discarded:
+                    logger.warning("⚠️ Valores descartados por campo: %s", discarded)
+                if error_mask.any():
+                    codes, counts = np.unique(reasons[error_mask], return_counts=True)
+                    logger.warning("⚠️ %d de %d películas rechazadas: %s", int(error_mask.sum()), n_rows, dict(zip(codes, counts.tolist())))
+                logger.debug("✅ Lote de %d películas validado", n_rows)
+        
+        return validated, error_mask, reasons
+
 
 class ErrorHandler:
-    """Manejador centralizado de errores"""
+    """
+    Manejador centralizado de errores
+    
+    Los errores se agregan en un ErrorReporter: las primeras
+    `log_first` ocurrencias de cada tipo/contexto se escriben en el log y el
+    resto solo se cuenta (con muestras) para los resúmenes. Un tipo se
+    considera fatal cuando su tasa sobre los registros procesados supera
+    `max_error_ratio`. Si el llamador no informa registros procesados
+    (`record_processed`), se aplica el tope absoluto de `max_errors`
+    ocurrencias por tipo/contexto.
+    """
     
-    def __init__(self, logger: logging.Logger = None):
+    def __init__(self, logger: logging.Logger = None,
+                 reporter: ErrorReporter = None,
+                 max_error_ratio: float = 0.05,
+                 min_records: int = 100,
+                 log_first: int = 10,
+                 max_errors: int = 10):
         self.logger = logger or logging.getLogger(__name__)
+        self.reporter = reporter or ErrorReporter(
+            self.logger, max_error_ratio=max_error_ratio, min_records=min_records
+        )
+        self.log_first = log_first
+        self.max_errors = max_errors
         self.error_counts = {}
     
+    def record_processed(self, count: int = 1):
+        """Registros procesados; denominador de la tasa de error"""
+        self.reporter.record_processed(count)
+    
     def handle_error(self, 
                      error: Exception, 
                      error_type: ErrorType,
@@ -284,32 +959,145 @@ class ErrorHandler:
         """
         error_key = f"{error_type.value}:{context}"
         self.error_counts[error_key] = self.error_counts.get(error_key, 0) + 1
-        
-        error_msg = f"{'🚨 FATAL' if fatal else '❌ ERROR'} [{error_type.value}] {context}: {str(error)}"
-        
-        if data:
-            error_msg += f" | Datos: {str(data)[:200]}..."
+        self.reporter.record(error_key, data if data is not None else str(error))
         
         if fatal:
-            self.logger.critical(error_msg)
+            self.logger.critical(f"🚨 FATAL [{error_type.value}] {context}: {str(error)}")
             return False
-        else:
+        
+        occurrences = self.error_counts[error_key]
+        if occurrences <= self.log_first:
+            error_msg = f"❌ ERROR [{error_type.value}] {context}: {str(error)}"
+            if data:
+                error_msg += f" | Datos: {str(data)[:200]}..."
             self.logger.error(error_msg)
-            
-            # Si hay demasiados errores del mismo tipo, considerarlo fatal
-            if self.error_counts[error_key] > 10:
-                self.logger.critical(f"🚨 Demasiados errores del tipo {error_key} ({self.error_counts[error_key]}). Deteniendo.")
+            if occurrences == self.log_first:
+                self.logger.warning(f"⚠️ {error_key}: siguientes ocurrencias solo en el resumen")
+        
+        # Sin registros procesados informados no hay tasa: tope absoluto
+        if self.reporter.processed == 0:
+            if occurrences > self.max_errors:
+                self.logger.critical(f"🚨 Demasiados errores del tipo {error_key} ({occurrences}). Deteniendo.")
                 return False
-            
             return True
+        
+        # Demasiados errores en proporción a lo procesado: detener
+        if self.reporter.threshold_exceeded(error_key):
+            self.logger.critical(
+                f"🚨 Tasa de errores {error_key} de {self.reporter.error_ratio(error_key):.2%} "
+                f"supera el máximo de {self.reporter.max_error_ratio:.2%}. Deteniendo."
+            )
+            return False
+        
+        return True
     
     def get_error_summary(self) -> Dict[str, int]:
         """Retorna resumen de errores ocurridos"""
         return self.error_counts.copy()
     
+    def log_summary(self):
+        """Resumen final agregado (conteos, tasa y muestras)"""
+        self.reporter.log_summary(final=True)
+    
     def reset_error_counts(self):
         """Resetea los contadores de errores"""
         self.error_counts.clear()
+        self.reporter.reset()
+
+
+# Tamaño de bloque de lectura y umbral para usar mmap en la lectura en streaming
+STREAM_CHUNK_SIZE = 1 << 16
+MMAP_THRESHOLD = 1 << 20
+
+_JSON_WHITESPACE = re.compile(r"[ \t\n\r]*")
+_ARRAY_SEPARATORS = re.compile(r"[ \t\n\r,]*")
+
+
+def _default_file_mode() -> int:
+    """Permisos que tendría un archivo creado con open(): 0o666 menos la umask"""
+    umask = os.umask(0)
+    os.umask(umask)
+    return 0o666 & ~umask
+
+
+def _first_significant_char(source, encoding: str) -> Optional[str]:
+    """Primer carácter distinto de espacio (ignorando BOM) sin consumir la fuente"""
+    head = source.read(4096)
+    source.seek(0)
+    text = head.decode(encoding, errors='ignore').lstrip('\ufeff \t\r\n')
+    return text[:1] or None
+
+
+def _iter_json_source(source, encoding: str, chunk_size: int, file_path: str, logger: Optional[logging.Logger],
+                      stats: Dict[str, int]):
+    """Registros de un archivo abierto en binario (file o mmap)"""
+    first = _first_significant_char(source, encoding)
+    if first is None:
+        return
+    if first == '[':
+        yield from _iter_json_array(source, encoding, chunk_size)
+        return
+    
+    skipped = 0
+    for line_number, line in enumerate(iter(source.readline, b''), start=1):
+        if line_number == 1 and line.startswith(codecs.BOM_UTF8):
+            line = line[len(codecs.BOM_UTF8):]
+        if not line.strip():
+            continue
+        try:
+            record = json.loads(line.decode(encoding))
+        except (json.JSONDecodeError, UnicodeDecodeError):
+            skipped += 1
+            stats["skipped_lines"] = skipped
+            continue
+        yield record
+    if skipped and logger:
+        logger.warning(f"⚠️ {skipped} líneas JSON inválidas omitidas en {file_path}")
+
+
+def _iter_json_array(source, encoding: str, chunk_size: int):
+    """
+    Elementos de un arreglo JSON de nivel superior, decodificados por bloques.
+
+    Sigue el mismo esquema que insert_into_db_json/json_stream.py, pero no
+    se comparte: la imagen de la API solo copia ./app y el cargador es un
+    script aparte con imports planos. Además aquí `source` es un stream
+    binario (con BOM opcional) que se decodifica de forma incremental,
+    mientras que el cargador abre la ruta en modo texto.
+    """
+    decoder = json.JSONDecoder()
+    text_decoder = codecs.getincrementaldecoder(encoding)()
+    
+    def read_more():
+        data = source.read(chunk_size)
+        return text_decoder.decode(data, final=not data), not data
+    
+    buffer, eof = read_more()
+    buffer = buffer.lstrip('\ufeff')
+    pos = _JSON_WHITESPACE.match(buffer).end() + 1  # después de '['
+    while True:
+        pos = _ARRAY_SEPARATORS.match(buffer, pos).end()
+        if pos == len(buffer):
+            if eof:
+                raise ValueError("Arreglo JSON sin cerrar: falta ']'")
+            chunk, eof = read_more()
+            buffer, pos = buffer[pos:] + chunk, 0
+            continue
+        if buffer[pos] == ']':
+            return
+        try:
+            value, end = decoder.raw_decode(buffer, pos)
+        except json.JSONDecodeError:
+            if eof:
+                raise
+            end = None
+        # Un valor que termina justo al final del buffer puede estar truncado
+        if end is None or (end == len(buffer) and not eof):
+            chunk, eof = read_more()
+            buffer, pos = buffer[pos:] + chunk, 0
+            continue
+        yield value
+        pos = end
 
 
 class SafeOperations:
@@ -381,4 +1169,121 @@ class SafeOperations:
         except Exception as e:
             if logger:
                 logger.error(f"❌ Error leyendo archivo {file_path}: {str(e)}")
-            return None 
\ No newline at end of file
+            return None
+    
+    @staticmethod
+    def safe_jsonl_write(file_path: str,
+                         records: Iterable[Any],
+                         encoding: str = 'utf-8',
+                         chunk_size: int = 1000,
+                         fsync: bool = True,
+                         logger: logging.Logger = None) -> Optional[int]:
+        """
+        Escritura atómica y en streaming de JSON Lines
+        
+        Consume `records` (cualquier iterable, p. ej. un generador) y escribe
+        un objeto por línea en un temporal del mismo directorio, en bloques
+        de `chunk_size` registros. Al terminar hace fsync (opcional) y
+        reemplaza el destino con os.replace, de modo que nunca queda un
+        archivo a medio escribir. La memoria usada no depende del total.
+        
+        Returns:
+            Cantidad de registros escritos, o None si hubo un error
+        """
+        directory = os.path.dirname(os.path.abspath(file_path))
+        temp_path = None
+        try:
+            os.makedirs(directory, exist_ok=True)
+            fd, temp_path = tempfile.mkstemp(dir=directory, prefix=f".{os.path.basename(file_path)}.", suffix=".tmp")
+            # mkstemp crea el temporal con 0600; igual que safe_file_write, respetar la umask
+            if hasattr(os, 'fchmod'):
+                os.fchmod(fd, _default_file_mode())
+            written = 0
+            # Un solo encoder: json.dumps con argumentos crea uno por llamada
+            encode = json.JSONEncoder(ensure_ascii=False).encode
+            with os.fdopen(fd, 'w', encoding=encoding, newline='\n') as f:
+                chunk = []
+                for record in records:
+                    chunk.append(encode(record))
+                    if len(chunk) >= chunk_size:
+                        f.write('\n'.join(chunk) + '\n')
+                        written += len(chunk)
+                        chunk.clear()
+                if chunk:
+                    f.write('\n'.join(chunk) + '\n')
+                    written += len(chunk)
+                f.flush()
+                if fsync:
+                    os.fsync(f.fileno())
+            
+            os.replace(temp_path, file_path)
+            temp_path = None
+            if fsync and hasattr(os, 'O_DIRECTORY'):
+                # Persistir también la entrada del directorio
+                dir_fd = os.open(directory, os.O_RDONLY | os.O_DIRECTORY)
+                try:
+                    os.fsync(dir_fd)
+                finally:
+                    os.close(dir_fd)
+            
+            if logger:
+                logger.info(f"✅ {written} registros escritos en {file_path}")
+            return written
+        
+        except Exception as e:
+            if logger:
+                logger.error(f"❌ Error escribiendo JSONL {file_path}: {str(e)}")
+            return None
+        
+        finally:
+            if temp_path is not None and os.path.exists(temp_path):
+                try:
+                    os.remove(temp_path)
+                except OSError:
+                    pass
+    
+    @staticmethod
+    def iter_json_records(file_path: str,
+                          encoding: str = 'utf-8',
+                          chunk_size: int = STREAM_CHUNK_SIZE,
+                          mmap_threshold: int = MMAP_THRESHOLD,
+                          logger: logging.Logger = None,
+                          stats: Dict[str, int] = None) -> Iterator[Any]:
+        """
+        Lectura en streaming de registros JSON
+        
+        Si el primer carácter significativo es `[` recorre los elementos del
+        arreglo de nivel superior; en otro caso lee el archivo como JSON
+        Lines (las líneas vacías se ignoran y las inválidas se omiten y se
+        informan al final). Los archivos de al menos `mmap_threshold` bytes
+        se leen con mmap. La memoria queda acotada por `chunk_size` más el
+        registro más grande.
+        
+        Un arreglo truncado o malformado, o un error de lectura, se registra
+        y se relanza: el consumidor no confunde una lectura parcial con el
+        archivo completo. Si se pasa `stats` (dict), se completa con
+        `skipped_lines`, las líneas JSON Lines inválidas omitidas.
+        """
+        if stats is None:
+            stats = {}
+        stats["skipped_lines"] = 0
+        if not os.path.exists(file_path):
+            if logger:
+                logger.warning(f"⚠️ Archivo no existe: {file_path}")
+            return
+        
+        try:
+            with open(file_path, 'rb') as f:
+                size = os.fstat(f.fileno()).st_size
+                if size == 0:
+                    return
+                if size >= mmap_threshold:
+                    with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as source:
+                        yield from _iter_json_source(source, encoding, chunk_size, file_path, logger, stats)
+                else:
+                    yield from _iter_json_source(f, encoding, chunk_size, file_path, logger, stats)
+        except (OSError, ValueError) as e:
+            if logger:
+                logger.error(f"❌ Error leyendo registros de {file_path}: {str(e)}")
+            raise
+
@@ -0,0 +1,189 @@
+"""
+Métricas del pool de conexiones de SQLAlchemy en formato Prometheus.
+
+Cada engine instrumentado usa un pool `Instrumented*QueuePool` que mide la
+espera de cada checkout y cuenta los timeouts; los eventos del pool
+(checkout, checkin, connect, invalidate) alimentan los contadores.
+"""
+
+import time
+import threading
+from typing import Dict, List
+from sqlalchemy import event, exc
+from sqlalchemy.pool import QueuePool, AsyncAdaptedQueuePool
+
+# Límites (segundos) del histograma de espera de checkout
+WAIT_BUCKETS = (0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+
+COUNTERS = ("checkouts", "checkins", "connects", "invalidations", "timeouts")
+
+_COUNTER_HELP = {
+    "checkouts": "Conexiones entregadas por el pool",
+    "checkins": "Conexiones devueltas al pool",
+    "connects": "Conexiones físicas abiertas",
+    "invalidations": "Conexiones invalidadas",
+    "timeouts": "Checkouts que agotaron pool_timeout",
+}
+
+_GAUGE_HELP = {
+    "size": "Tamaño configurado del pool",
+    "checked_out": "Conexiones en uso",
+    "overflow": "Conexiones abiertas por encima de pool_size",
+}
+
+
+class PoolMetrics:
+    """Contadores e histograma de un pool, seguros entre threads"""
+
+    def __init__(self, name: str):
+        self.name = name
+        self.pool = None
+        self.counters = dict.fromkeys(COUNTERS, 0)
+        self.wait_buckets = [0] * len(WAIT_BUCKETS)
+        self.wait_sum = 0.0
+        self.wait_count = 0
+        self._lock = threading.Lock()
+
+    def bind(self, pool):
+        """Asocia el pool actual (se llama de nuevo si el pool se recrea)"""
+        self.pool = pool
+
+    def increment(self, counter: str):
+        with self._lock:
+            self.counters[counter] += 1
+
+    def observe_wait(self, seconds: float):
+        with self._lock:
+            self.wait_sum += seconds
+            self.wait_count += 1
+            for i, bound in enumerate(WAIT_BUCKETS):
+                if seconds <= bound:
+                    self.wait_buckets[i] += 1
+                    break
+
+    def gauges(self) -> Dict[str, int]:
+        """Tamaño, conexiones en uso y overflow actuales del pool"""
+        pool = self.pool
+        if pool is None or not hasattr(pool, "checkedout"):
+            return {}
+        return {
+            "size": pool.size(),
+            "checked_out": pool.checkedout(),
+            # QueuePool.overflow() es negativo mientras el pool no se llena
+            "overflow": max(pool.overflow(), 0),
+        }
+
+    def snapshot(self) -> dict:
+        with self._lock:
+            return {
+                "counters": dict(self.counters),
+                "wait_buckets": list(self.wait_buckets),
+                "wait_sum": self.wait_sum,
+                "wait_count": self.wait_count,
+                "gauges": self.gauges(),
+            }
+
+
+class _InstrumentedPoolMixin:
+    """Mide la espera de `_do_get` y conserva las métricas al recrear el pool"""
+
+    metrics: PoolMetrics = None
+
+    def _do_get(self):
+        start = time.perf_counter()
+        try:
+            return super()._do_get()
+        except exc.TimeoutError:
+            if self.metrics is not None:
+                self.metrics.increment("timeouts")
+            raise
+        finally:
+            if self.metrics is not None:
+                self.metrics.observe_wait(time.perf_counter() - start)
+
+    def recreate(self):
+        pool = super().recreate()
+        if self.metrics is not None:
+            pool.metrics = self.metrics
+            self.metrics.bind(pool)
+        return pool
+
+
+class InstrumentedQueuePool(_InstrumentedPoolMixin, QueuePool):
+    """QueuePool con métricas de espera"""
+
+
+class InstrumentedAsyncQueuePool(_InstrumentedPoolMixin, AsyncAdaptedQueuePool):
+    """AsyncAdaptedQueuePool con métricas de espera"""
+
+
+_registry: Dict[str, PoolMetrics] = {}
+_registry_lock = threading.Lock()
+
+
+def get_pool_metrics(name: str) -> PoolMetrics:
+    """Métricas registradas con `name`, creadas en el primer uso"""
+    with _registry_lock:
+        if name not in _registry:
+            _registry[name] = PoolMetrics(name)
+        return _registry[name]
+
+
+def instrument_engine(engine, name: str) -> PoolMetrics:
+    """
+    Registra los eventos del pool de `engine` bajo `name`. Para un
+    AsyncEngine se pasa `engine.sync_engine`.
+    """
+    metrics = get_pool_metrics(name)
+    pool = engine.pool
+    if isinstance(pool, _InstrumentedPoolMixin):
+        pool.metrics = metrics
+    metrics.bind(pool)
+
+    event.listen(engine, "checkout", lambda *_: metrics.increment("checkouts"))
+    event.listen(engine, "checkin", lambda *_: metrics.increment("checkins"))
+    event.listen(engine, "connect", lambda *_: metrics.increment("connects"))
+    event.listen(engine, "invalidate", lambda *_: metrics.increment("invalidations"))
+    event.listen(engine, "soft_invalidate", lambda *_: metrics.increment("invalidations"))
+    return metrics
+
+
+def _format_bound(bound: float) -> str:
+    return f"{bound:g}"
+
+
+def render_prometheus() -> str:
+    """Métricas de todos los pools registrados en formato de texto Prometheus"""
+    with _registry_lock:
+        all_metrics = list(_registry.values())
+    snapshots = [(metrics.name, metrics.snapshot()) for metrics in all_metrics]
+    lines: List[str] = []
+
+    for counter in COUNTERS:
+        metric = f"db_pool_{counter}_total"
+        lines.append(f"# HELP {metric} {_COUNTER_HELP[counter]}")
+        lines.append(f"# TYPE {metric} counter")
+        for name, snap in snapshots:
+            lines.append(f'{metric}{{pool="{name}"}} {snap["counters"][counter]}')
+
+    for gauge in ("size", "checked_out", "overflow"):
+        metric = f"db_pool_{gauge}"
+        lines.append(f"# HELP {metric} {_GAUGE_HELP[gauge]}")
+        lines.append(f"# TYPE {metric} gauge")
+        for name, snap in snapshots:
+            if gauge in snap["gauges"]:
+                lines.append(f'{metric}{{pool="{name}"}} {snap["gauges"][gauge]}')
+
+    metric = "db_pool_checkout_wait_seconds"
+    lines.append(f"# HELP {metric} Espera para obtener una conexión del pool")
+    lines.append(f"# TYPE {metric} histogram")
+    for name, snap in snapshots:
+        cumulative = 0
+        for bound, count in zip(WAIT_BUCKETS, snap["wait_buckets"]):
+            cumulative += count
+            lines.append(f'{metric}_bucket{{pool="{name}",le="{_format_bound(bound)}"}} {cumulative}')
+        lines.append(f'{metric}_bucket{{pool="{name}",le="+Inf"}} {snap["wait_count"]}')
+        lines.append(f'{metric}_sum{{pool="{name}"}} {snap["wait_sum"]}')
+        lines.append(f'{metric}_count{{pool="{name}"}} {snap["wait_count"]}')
+
+    return "\n".join(lines) + "\n"
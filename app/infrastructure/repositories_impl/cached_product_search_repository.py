@@ -0,0 +1,32 @@
+"""
+Búsqueda de productos con caché de respuestas (ver
+app/infrastructure/search_cache.py).
+"""
+
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.domain.productos import ProductPage, ProductSearchCriteria, ProductSearchRepository
+from app.infrastructure.search_cache import SearchCache, cache_key
+
+
+class CachedProductSearchRepository(ProductSearchRepository):
+    """
+    Envuelve otro repositorio: cada página se guarda con la versión del
+    catálogo vigente al consultarla y se sirve solo mientras esa versión no
+    cambie. Si la versión no se puede leer, se consulta sin caché.
+    """
+
+    def __init__(self, inner: ProductSearchRepository, session: AsyncSession, cache: SearchCache):
+        self.inner = inner
+        self.session = session
+        self.cache = cache
+
+    async def search(self, criteria: ProductSearchCriteria) -> ProductPage:
+        version = await self.cache.catalog_version(self.session)
+        if version is None:
+            return await self.inner.search(criteria)
+        key = cache_key(criteria)
+        page = await self.cache.get(key, version)
+        if page is None:
+            page = await self.inner.search(criteria)
+            await self.cache.set(key, version, page)
+        return page
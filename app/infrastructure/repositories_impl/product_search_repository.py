@@ -0,0 +1,69 @@
+"""
+Búsqueda de productos con SQLAlchemy sobre el índice de texto completo
+del motor activo (ver app/infrastructure/search_index.py).
+"""
+
+from sqlalchemy import and_, null, or_, select
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.domain.productos import ProductHit, ProductPage, ProductSearchCriteria, ProductSearchRepository
+from app.infrastructure.search_index import SearchIndex, producto
+
+# Columnas de producto que devuelve la búsqueda (mismo orden que ProductHit)
+RESULT_COLUMNS = (
+    "id", "nombre", "descripcion", "precio_bs", "id_sub_categoria",
+    "id_marca", "id_sucursal", "url_supplier", "codigo",
+)
+
+
+class SQLProductSearchRepository(ProductSearchRepository):
+    """
+    Implementación con paginación por llave: el orden es (relevancia desc,
+    id asc) y cada página filtra por la llave del último resultado, de modo
+    que el costo no crece con el número de página.
+    """
+
+    def __init__(self, session: AsyncSession, index: SearchIndex):
+        self.session = session
+        self.index = index
+
+    def build_statement(self, criteria: ProductSearchCriteria):
+        """SELECT de una página (pide un resultado extra para saber si hay más)"""
+        columns = [producto.c[name] for name in RESULT_COLUMNS]
+        terms = criteria.terms
+        if terms:
+            source, condition, rank = self.index.match(terms)
+            stmt = select(*columns, rank.label("rank")).select_from(source).where(condition)
+        else:
+            rank = None
+            stmt = select(*columns, null().label("rank")).select_from(producto)
+
+        # activo es entero (el cargador escribe 1), no booleano
+        stmt = stmt.where(producto.c.activo == 1)
+        for name in ("id_sub_categoria", "id_marca", "id_sucursal"):
+            value = getattr(criteria, name)
+            if value is not None:
+                stmt = stmt.where(producto.c[name] == value)
+        if criteria.precio_min is not None:
+            stmt = stmt.where(producto.c.precio_bs >= criteria.precio_min)
+        if criteria.precio_max is not None:
+            stmt = stmt.where(producto.c.precio_bs <= criteria.precio_max)
+
+        if criteria.after is not None:
+            last_rank, last_id = criteria.after
+            if rank is None:
+                stmt = stmt.where(producto.c.id > last_id)
+            else:
+                stmt = stmt.where(or_(rank < last_rank, and_(rank == last_rank, producto.c.id > last_id)))
+
+        order = [producto.c.id] if rank is None else [rank.desc(), producto.c.id]
+        return stmt.order_by(*order).limit(criteria.limit + 1)
+
+    async def search(self, criteria: ProductSearchCriteria) -> ProductPage:
+        result = await self.session.execute(self.build_statement(criteria))
+        rows = result.all()
+        items = [ProductHit(**row._mapping) for row in rows[:criteria.limit]]
+        next_after = None
+        if len(rows) > criteria.limit and items:
+            last = items[-1]
+            next_after = (last.rank, last.id)
+        return ProductPage(items=items, next_after=next_after)
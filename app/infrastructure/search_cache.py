@@ -0,0 +1,296 @@
+"""
+Caché de respuestas de búsqueda invalidada por la versión del catálogo.
+
+El cargador ETL incrementa el contador de la única fila de
+`catalogo_version` al final de la transacción de cada lote
+(insert_into_db_json/catalog_version.py), así que cada commit deja una
+versión distinta. Cada
+entrada de la caché guarda la versión con la que se calculó y solo se
+sirve mientras esa siga siendo la versión vigente, de modo que un lote
+confirmado invalida todas las respuestas al instante; el TTL solo limita
+la vida de las entradas.
+
+Niveles:
+- memoria: LRU por proceso con TTL y número máximo de entradas.
+- sqlite (opcional): archivo compartido entre los procesos del servidor,
+  consultado cuando la entrada no está en memoria.
+"""
+
+import json
+import time
+import asyncio
+import logging
+import sqlite3
+import threading
+from collections import OrderedDict
+from dataclasses import asdict
+from typing import Any, Dict, Optional
+from sqlalchemy import column, select, table
+from app.config.settings import SearchCacheSettings
+from app.domain.productos import ProductHit, ProductPage, ProductSearchCriteria
+
+VERSION_TABLE = "catalogo_version"
+
+# Escrituras en el archivo compartido entre cada depuración
+SQLITE_PRUNE_EVERY = 500
+
+logger = logging.getLogger(__name__)
+
+catalogo_version = table(VERSION_TABLE, column("id"), column("version"))
+
+# Llave de la única fila del contador
+VERSION_ROW = 1
+
+COUNTERS = ("hits", "misses", "shared_hits", "expirations", "evictions", "invalidations", "bypassed")
+
+
+def cache_key(criteria: ProductSearchCriteria) -> str:
+    """
+    Llave normalizada de una búsqueda: términos (sin importar mayúsculas,
+    signos ni orden) más filtros, límite y cursor.
+    """
+    def number(value):
+        return None if value is None else float(value)
+
+    after = None if criteria.after is None else [number(criteria.after[0]), int(criteria.after[1])]
+    return json.dumps(
+        [
+            sorted(criteria.terms),
+            criteria.id_sub_categoria,
+            criteria.id_marca,
+            criteria.id_sucursal,
+            number(criteria.precio_min),
+            number(criteria.precio_max),
+            criteria.limit,
+            after,
+        ],
+        separators=(",", ":"),
+    )
+
+
+def serialize_page(page: ProductPage) -> str:
+    return json.dumps({"items": [asdict(item) for item in page.items], "next_after": page.next_after})
+
+
+def deserialize_page(raw: str) -> ProductPage:
+    data = json.loads(raw)
+    next_after = tuple(data["next_after"]) if data["next_after"] is not None else None
+    return ProductPage(items=[ProductHit(**item) for item in data["items"]], next_after=next_after)
+
+
+class LRUCache:
+    """LRU en memoria con TTL; cada entrada recuerda su versión del catálogo"""
+
+    def __init__(self, max_entries: int, ttl: float, clock=time.monotonic):
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self.clock = clock
+        self._entries: "OrderedDict[str, tuple]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: str, version: int):
+        """(valor, motivo): motivo es None si hay acierto, o "miss"/"expired"/"stale" """
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None, "miss"
+            entry_version, expires, value = entry
+            if entry_version != version or expires <= self.clock():
+                del self._entries[key]
+                return None, "expired" if entry_version == version else "stale"
+            self._entries.move_to_end(key)
+            return value, None
+
+    def set(self, key: str, version: int, value: Any) -> int:
+        """Guarda `value` y retorna cuántas entradas se desalojaron"""
+        with self._lock:
+            self._entries[key] = (version, self.clock() + self.ttl, value)
+            self._entries.move_to_end(key)
+            evicted = 0
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+                evicted += 1
+            return evicted
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+    def __len__(self):
+        return len(self._entries)
+
+
+class SQLiteCacheBackend:
+    """
+    Caché compartida en un archivo SQLite (WAL). Las entradas caducan por
+    tiempo de reloj (`expires`) o por versión; cada SQLITE_PRUNE_EVERY
+    escrituras se borran las caducadas y las menos usadas sobre el límite.
+    """
+
+    def __init__(self, path: str, max_entries: int, ttl: float):
+        self.path = path
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self._writes = 0
+        self._lock = threading.Lock()
+        self._connection = sqlite3.connect(path, timeout=5, check_same_thread=False, isolation_level=None)
+        self._connection.execute("PRAGMA journal_mode=WAL")
+        self._connection.execute("PRAGMA synchronous=NORMAL")
+        self._connection.execute(
+            "CREATE TABLE IF NOT EXISTS search_cache ("
+            "key TEXT PRIMARY KEY, version INTEGER NOT NULL, expires REAL NOT NULL, "
+            "used REAL NOT NULL, value TEXT NOT NULL)"
+        )
+
+    def get(self, key: str, version: int) -> Optional[str]:
+        now = time.time()
+        with self._lock:
+            row = self._connection.execute(
+                "SELECT value FROM search_cache WHERE key = ? AND version = ? AND expires > ?",
+                (key, version, now),
+            ).fetchone()
+            if row is not None:
+                self._connection.execute("UPDATE search_cache SET used = ? WHERE key = ?", (now, key))
+        return row[0] if row is not None else None
+
+    def set(self, key: str, version: int, value: str):
+        now = time.time()
+        with self._lock:
+            self._connection.execute(
+                "INSERT OR REPLACE INTO search_cache (key, version, expires, used, value) VALUES (?, ?, ?, ?, ?)",
+                (key, version, now + self.ttl, now, value),
+            )
+            self._writes += 1
+            if self._writes % SQLITE_PRUNE_EVERY == 0:
+                self._prune(version, now)
+
+    def _prune(self, version: int, now: float):
+        self._connection.execute("DELETE FROM search_cache WHERE version < ? OR expires <= ?", (version, now))
+        self._connection.execute(
+            "DELETE FROM search_cache WHERE key IN ("
+            "SELECT key FROM search_cache ORDER BY used DESC LIMIT -1 OFFSET ?)",
+            (self.max_entries,),
+        )
+
+    def close(self):
+        with self._lock:
+            self._connection.close()
+
+
+class SearchCache:
+    """Caché de páginas de búsqueda de un proceso (memoria + archivo compartido opcional)"""
+
+    def __init__(self, settings: SearchCacheSettings = None):
+        settings = settings or SearchCacheSettings()
+        self.memory = LRUCache(settings.MAX_ENTRIES, settings.TTL)
+        self.shared = None
+        if settings.BACKEND == "sqlite":
+            self.shared = SQLiteCacheBackend(settings.SQLITE_PATH, settings.SQLITE_MAX_ENTRIES, settings.TTL)
+        elif settings.BACKEND != "memory":
+            raise ValueError(f"Backend de caché no soportado: {settings.BACKEND}. Disponibles: memory, sqlite")
+        self.version_check_interval = settings.VERSION_CHECK_INTERVAL
+        self.counters = dict.fromkeys(COUNTERS, 0)
+        self._version: Optional[int] = None
+        self._version_checked = 0.0
+        self._lock = threading.Lock()
+
+    def _count(self, counter: str, n: int = 1):
+        with self._lock:
+            self.counters[counter] += n
+
+    async def catalog_version(self, session) -> Optional[int]:
+        """
+        Versión vigente del catálogo, consultada como máximo cada
+        `version_check_interval` segundos. None si no se puede leer (la
+        caché se omite).
+        """
+        now = time.monotonic()
+        if self._version is not None and now - self._version_checked < self.version_check_interval:
+            return self._version
+        try:
+            result = await session.execute(select(catalogo_version.c.version).where(catalogo_version.c.id == VERSION_ROW))
+            version = int(result.scalar() or 0)
+        except Exception as e:
+            await session.rollback()
+            logger.warning("⚠️ Versión del catálogo no disponible, búsqueda sin caché: %s", e)
+            self._count("bypassed")
+            return None
+        if self._version is not None and version != self._version:
+            # Lote nuevo confirmado: se libera la memoria de las entradas viejas
+            self.memory.clear()
+            self._count("invalidations")
+        self._version, self._version_checked = version, now
+        return version
+
+    async def get(self, key: str, version: int) -> Optional[ProductPage]:
+        page, reason = self.memory.get(key, version)
+        if page is not None:
+            self._count("hits")
+            return page
+        if reason == "expired":
+            self._count("expirations")
+        if self.shared is not None:
+            raw = await asyncio.to_thread(self.shared.get, key, version)
+            if raw is not None:
+                page = deserialize_page(raw)
+                self._count("shared_hits")
+                self._count("evictions", self.memory.set(key, version, page))
+                return page
+        self._count("misses")
+        return None
+
+    async def set(self, key: str, version: int, page: ProductPage):
+        self._count("evictions", self.memory.set(key, version, page))
+        if self.shared is not None:
+            await asyncio.to_thread(self.shared.set, key, version, serialize_page(page))
+
+    def snapshot(self) -> Dict[str, Any]:
+        with self._lock:
+            return {**self.counters, "entries": len(self.memory), "version": self._version}
+
+    def close(self):
+        if self.shared is not None:
+            self.shared.close()
+
+
+_search_cache: Optional[SearchCache] = None
+_search_cache_disabled = False
+_search_cache_lock = threading.Lock()
+
+
+def get_search_cache() -> Optional[SearchCache]:
+    """Caché de búsqueda del proceso, construida una sola vez; None si está deshabilitada"""
+    global _search_cache, _search_cache_disabled
+    if _search_cache is None and not _search_cache_disabled:
+        with _search_cache_lock:
+            if _search_cache is None and not _search_cache_disabled:
+                settings = SearchCacheSettings()
+                if settings.ENABLED:
+                    _search_cache = SearchCache(settings)
+                else:
+                    _search_cache_disabled = True
+    return _search_cache
+
+
+def close_search_cache():
+    """Cierra el archivo compartido y descarta la caché del proceso"""
+    global _search_cache, _search_cache_disabled
+    if _search_cache is not None:
+        _search_cache.close()
+    _search_cache, _search_cache_disabled = None, False
+
+
+def render_cache_prometheus() -> str:
+    """Métricas de la caché de búsqueda en formato de texto Prometheus"""
+    if _search_cache is None:
+        return ""
+    snap = _search_cache.snapshot()
+    lines = []
+    for counter in COUNTERS:
+        lines.append(f"# TYPE search_cache_{counter}_total counter")
+        lines.append(f"search_cache_{counter}_total {snap[counter]}")
+    lines.append("# TYPE search_cache_entries gauge")
+    lines.append(f"search_cache_entries {snap['entries']}")
+    lines.append("# TYPE search_cache_catalog_version gauge")
+    lines.append(f"search_cache_catalog_version {snap['version'] or 0}")
+    return "\n".join(lines) + "\n"
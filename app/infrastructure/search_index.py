@@ -0,0 +1,97 @@
+"""
+Índices de texto completo de productos por motor de base de datos.
+
+Cada `SearchIndex` traduce los términos de una búsqueda a la condición de
+coincidencia y a la expresión de relevancia de su motor. La estrategia de
+base de datos activa elige el índice (`DatabaseStrategy.search_index`).
+
+El índice lo crea y mantiene el cargador ETL
+(insert_into_db_json/search_index.py, con los mismos nombres); en
+PostgreSQL y MySQL se crea como migración con `main.py --reindex`:
+
+- SQLite: tabla FTS5 `producto_fts` con rowid = producto.id.
+- PostgreSQL: columna generada `busqueda` (tsvector) con índice GIN.
+- MySQL: índice FULLTEXT (nombre, descripcion).
+"""
+
+from abc import ABC, abstractmethod
+from typing import List, Tuple
+from sqlalchemy import column, func, literal_column, table
+from sqlalchemy.dialects.mysql import match
+from sqlalchemy.sql.elements import ColumnElement
+from sqlalchemy.sql.selectable import FromClause
+
+SEARCH_TABLE = "producto_fts"
+SEARCH_COLUMN = "busqueda"
+TEXT_SEARCH_CONFIG = "spanish"
+
+# Peso del nombre frente a la descripción en bm25 (SQLite)
+NAME_WEIGHT = 10.0
+DESCRIPTION_WEIGHT = 1.0
+
+# Tabla producto escrita por el cargador ETL (sin modelo ORM)
+producto = table(
+    "producto",
+    column("id"),
+    column("nombre"),
+    column("descripcion"),
+    column("precio_bs"),
+    column("id_sub_categoria"),
+    column("id_marca"),
+    column("id_sucursal"),
+    column("url_supplier"),
+    column("codigo"),
+    column("activo"),
+    column(SEARCH_COLUMN),
+)
+
+
+class SearchIndex(ABC):
+    """Coincidencia y relevancia de texto completo sobre `producto`"""
+
+    name = "none"
+
+    @abstractmethod
+    def match(self, terms: List[str]) -> Tuple[FromClause, ColumnElement, ColumnElement]:
+        """
+        (origen, condición, relevancia) para buscar productos que contienen
+        todos `terms` por prefijo; la relevancia es mayor cuanto mejor.
+        """
+
+
+class SQLiteFTS5Index(SearchIndex):
+    """FTS5 con ranking bm25 (nombre pesa más que la descripción)"""
+
+    name = "fts5"
+
+    def match(self, terms):
+        fts = table(SEARCH_TABLE, column("rowid"))
+        query = " ".join(f'"{term}"*' for term in terms)
+        source = producto.join(fts, fts.c.rowid == producto.c.id)
+        condition = literal_column(SEARCH_TABLE).op("MATCH")(query)
+        # bm25 es menor cuanto más relevante
+        rank = -func.bm25(literal_column(SEARCH_TABLE), NAME_WEIGHT, DESCRIPTION_WEIGHT)
+        return source, condition, rank
+
+
+class PostgreSQLTsvectorIndex(SearchIndex):
+    """tsvector con índice GIN y ranking ts_rank_cd"""
+
+    name = "tsvector"
+
+    def match(self, terms):
+        vector = producto.c[SEARCH_COLUMN]
+        query = func.to_tsquery(TEXT_SEARCH_CONFIG, " & ".join(f"{term}:*" for term in terms))
+        return producto, vector.op("@@")(query), func.ts_rank_cd(vector, query)
+
+
+class MySQLFulltextIndex(SearchIndex):
+    """FULLTEXT en modo booleano; la relevancia es el valor de MATCH"""
+
+    name = "fulltext"
+
+    def match(self, terms):
+        relevance = match(
+            producto.c.nombre, producto.c.descripcion, against=" ".join(f"+{term}*" for term in terms)
+        ).in_boolean_mode()
+        return producto, relevance, relevance
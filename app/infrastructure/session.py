@@ -1,16 +1,48 @@
 """
 Módulo de configuración de la base de datos usando DatabaseStrategyFactory.
-Provee la dependencia `get_db` para FastAPI.
+Provee las dependencias `get_db` (síncrona) y `get_async_db` (asíncrona)
+para FastAPI.
+
+Las estrategias se crean en el primer uso y sin conectarse; la validación,
+la creación de tablas y el precalentamiento del pool se hacen en el
+arranque de la aplicación (`bootstrap_database` y
+`bootstrap_async_database`), no al importar el módulo.
 """
 
 import os
+import time
+import asyncio
+import logging
+import threading
+from app.infrastructure.config.db_config import PoolSettings
 from app.infrastructure.database_strategies import DatabaseStrategyFactory
 
 DB_TYPE = os.getenv("DB", "sqlite")
 
-db_strategy = DatabaseStrategyFactory.create_strategy(db_type=DB_TYPE)
+logger = logging.getLogger(__name__)
+
+_db_strategy = None
+_strategy_lock = threading.Lock()
+
+# La estrategia asíncrona y su lock se crean en el primer uso, dentro del
+# event loop (un asyncio.Lock queda ligado al loop en que se usa)
+_async_db_strategy = None
+_async_strategy_lock = None
+
+def get_db_strategy():
+    """Retorna la estrategia síncrona, construyéndola una sola vez"""
+    global _db_strategy
+    if _db_strategy is None:
+        with _strategy_lock:
+            if _db_strategy is None:
+                _db_strategy = DatabaseStrategyFactory.create_strategy(
+                    db_type=DB_TYPE, logger=logger, validate=False
+                )
+    return _db_strategy
 
-SessionLocal = db_strategy.get_session
+def SessionLocal():
+    """Nueva sesión síncrona de la estrategia configurada"""
+    return get_db_strategy().get_session()
 
 def get_db():
     """
@@ -22,3 +54,101 @@ def get_db():
         yield session
     finally:
         session.close()
+
+def _get_async_strategy_lock():
+    """Lock de la estrategia asíncrona, creado una sola vez"""
+    global _async_strategy_lock
+    if _async_strategy_lock is None:
+        with _strategy_lock:
+            if _async_strategy_lock is None:
+                _async_strategy_lock = asyncio.Lock()
+    return _async_strategy_lock
+
+async def get_async_db_strategy():
+    """Retorna la estrategia asíncrona, construyéndola una sola vez"""
+    global _async_db_strategy
+    if _async_db_strategy is None:
+        async with _get_async_strategy_lock():
+            if _async_db_strategy is None:
+                _async_db_strategy = await DatabaseStrategyFactory.create_async_strategy(
+                    db_type=DB_TYPE, logger=logger, validate=False
+                )
+    return _async_db_strategy
+
+async def get_async_db():
+    """
+    Genera una sesión asíncrona para endpoints `async def`.
+    Las consultas se esperan con `await` sin bloquear el event loop.
+    """
+    strategy = await get_async_db_strategy()
+    async with strategy.get_session() as session:
+        yield session
+
+def bootstrap_database(prewarm: int = None):
+    """
+    Valida la conexión, crea las tablas y precalienta el pool.
+    Retorna los tiempos de cada paso en segundos.
+    """
+    prewarm = PoolSettings().POOL_PREWARM if prewarm is None else prewarm
+    timings = {}
+
+    start = time.perf_counter()
+    strategy = get_db_strategy()
+    timings["engine"] = time.perf_counter() - start
+
+    start = time.perf_counter()
+    if not strategy.validate_connection():
+        raise RuntimeError(f"No se pudo validar conexión para {DB_TYPE}")
+    timings["validacion"] = time.perf_counter() - start
+
+    start = time.perf_counter()
+    strategy.create_tables_if_not_exist()
+    timings["tablas"] = time.perf_counter() - start
+
+    if prewarm > 0:
+        start = time.perf_counter()
+        strategy.prewarm(prewarm)
+        timings["precalentamiento"] = time.perf_counter() - start
+
+    detalle = ", ".join(f"{paso}={segundos * 1000:.1f}ms" for paso, segundos in timings.items())
+    logger.info(f"🚀 Base de datos {DB_TYPE} lista: {detalle}")
+    return timings
+
+async def bootstrap_async_database(prewarm: int = None):
+    """
+    Crea y valida la estrategia asíncrona (la que usan los endpoints) y
+    precalienta su pool. Las tablas las crea bootstrap_database.
+    Retorna los tiempos de cada paso en segundos.
+    """
+    prewarm = PoolSettings().POOL_PREWARM if prewarm is None else prewarm
+    timings = {}
+
+    start = time.perf_counter()
+    strategy = await get_async_db_strategy()
+    timings["engine"] = time.perf_counter() - start
+
+    start = time.perf_counter()
+    if not await strategy.validate_connection():
+        raise RuntimeError(f"No se pudo validar conexión asíncrona para {DB_TYPE}")
+    timings["validacion"] = time.perf_counter() - start
+
+    if prewarm > 0:
+        start = time.perf_counter()
+        await strategy.prewarm(prewarm)
+        timings["precalentamiento"] = time.perf_counter() - start
+
+    detalle = ", ".join(f"{paso}={segundos * 1000:.1f}ms" for paso, segundos in timings.items())
+    logger.info(f"🚀 Pool asíncrono {DB_TYPE} listo: {detalle}")
+    return timings
+
+async def shutdown_database():
+    """Cierra los pools de las estrategias creadas"""
+    global _db_strategy, _async_db_strategy, _async_strategy_lock
+    if _db_strategy is not None:
+        _db_strategy.dispose()
+        _db_strategy = None
+    if _async_db_strategy is not None:
+        await _async_db_strategy.dispose()
+        _async_db_strategy = None
+    _async_strategy_lock = None
+    logger.info("🔌 Conexiones de base de datos cerradas")
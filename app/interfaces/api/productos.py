@@ -0,0 +1,62 @@
+"""
+Router de productos: búsqueda de texto completo con filtros y paginación
+por cursor.
+"""
+
+from typing import Optional
+from fastapi import APIRouter, Depends, HTTPException, Query
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.application.search_products import DEFAULT_LIMIT, MAX_LIMIT, InvalidSearchError, SearchProducts
+from app.infrastructure import session
+from app.infrastructure.search_cache import get_search_cache
+from app.infrastructure.repositories_impl.product_search_repository import SQLProductSearchRepository
+from app.infrastructure.repositories_impl.cached_product_search_repository import CachedProductSearchRepository
+from app.interfaces.api.schemas import ProductoOut, ProductSearchResponse
+
+router = APIRouter()
+
+
+async def get_search_products(db: AsyncSession = Depends(session.get_async_db)) -> SearchProducts:
+    """Caso de uso de búsqueda con el índice de la estrategia activa y la caché de respuestas"""
+    strategy = await session.get_async_db_strategy()
+    repository = SQLProductSearchRepository(db, strategy.search_index())
+    cache = get_search_cache()
+    if cache is not None:
+        repository = CachedProductSearchRepository(repository, db, cache)
+    return SearchProducts(repository)
+
+
+@router.get("/search", response_model=ProductSearchResponse)
+async def search_products(
+    q: Optional[str] = Query(None, max_length=200, description="Texto a buscar en nombre y descripción"),
+    id_sub_categoria: Optional[int] = None,
+    id_marca: Optional[int] = None,
+    id_sucursal: Optional[int] = None,
+    precio_min: Optional[float] = Query(None, ge=0),
+    precio_max: Optional[float] = Query(None, ge=0),
+    limit: int = Query(DEFAULT_LIMIT, ge=1, le=MAX_LIMIT),
+    cursor: Optional[str] = Query(None, max_length=200, description="next_cursor de la página anterior"),
+    use_case: SearchProducts = Depends(get_search_products),
+):
+    """
+    Busca productos activos que contienen todos los términos de `q` (por
+    prefijo), ordenados por relevancia; sin `q` solo aplica los filtros. Un
+    `q` sin letras ni dígitos retorna una página vacía.
+    """
+    try:
+        result = await use_case.execute(
+            text=q,
+            id_sub_categoria=id_sub_categoria,
+            id_marca=id_marca,
+            id_sucursal=id_sucursal,
+            precio_min=precio_min,
+            precio_max=precio_max,
+            limit=limit,
+            cursor=cursor,
+        )
+    except InvalidSearchError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    return ProductSearchResponse(
+        items=[ProductoOut.model_validate(item) for item in result.items],
+        next_cursor=result.next_cursor,
+    )
@@ -0,0 +1,30 @@
+"""
+Modelos Pydantic de entrada/salida de la API.
+"""
+
+from typing import List, Optional
+from pydantic import BaseModel, ConfigDict
+
+
+class ProductoOut(BaseModel):
+    """Producto en los resultados de búsqueda"""
+
+    model_config = ConfigDict(from_attributes=True)
+
+    id: int
+    nombre: Optional[str] = None
+    descripcion: Optional[str] = None
+    precio_bs: Optional[float] = None
+    id_sub_categoria: Optional[int] = None
+    id_marca: Optional[int] = None
+    id_sucursal: Optional[int] = None
+    url_supplier: Optional[str] = None
+    codigo: Optional[str] = None
+    rank: Optional[float] = None
+
+
+class ProductSearchResponse(BaseModel):
+    """Página de resultados; `next_cursor` pide la siguiente (null si no hay más)"""
+
+    items: List[ProductoOut]
+    next_cursor: Optional[str] = None
@@ -1,17 +1,39 @@
 import os
 import uvicorn
+from contextlib import asynccontextmanager
 from fastapi import FastAPI
+from fastapi.concurrency import run_in_threadpool
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import PlainTextResponse
 from app.infrastructure import session  
+from app.infrastructure.pool_metrics import render_prometheus
+from app.infrastructure.error_handlers import render_retry_prometheus, render_circuit_prometheus
+from app.infrastructure.search_cache import render_cache_prometheus, close_search_cache
+from app.interfaces.api.productos import router as productos_router
 
 PROJECT_NAME = os.getenv("PROJECT_NAME", "My FastAPI Project")
 VERSION = os.getenv("VERSION", "1.0.0")
 DESCRIPTION = os.getenv("DESCRIPTION", "Generic FastAPI Boilerplate API.")
 
+@asynccontextmanager
+async def lifespan(_app: FastAPI):
+    """
+    Arranque: valida la base de datos y crea tablas fuera del event loop, y
+    luego valida y precalienta el pool asíncrono que usan los endpoints.
+    Cierre: libera los pools y la caché de búsqueda.
+    """
+    # Sin precalentar el pool síncrono: ningún endpoint lo usa
+    await run_in_threadpool(session.bootstrap_database, 0)
+    await session.bootstrap_async_database()
+    yield
+    await session.shutdown_database()
+    close_search_cache()
+
 app = FastAPI(
     title=PROJECT_NAME,
     version=VERSION,
     description=DESCRIPTION,
+    lifespan=lifespan,
 )
 
 app.add_middleware(
@@ -34,9 +56,16 @@ async def root():
         "db_type": os.getenv("DB_TYPE", "sqlite")
     }
 
-# Incluir routers (ejemplo)
-# from app.interfaces.api import some_router
-# app.include_router(some_router, prefix="/api", tags=["Example"])
+@app.get("/metrics", response_class=PlainTextResponse)
+async def metrics():
+    """
+    Métricas del pool de conexiones, reintentos, circuit breakers y caché
+    de búsqueda en formato de texto Prometheus.
+    """
+    body = render_prometheus() + render_retry_prometheus() + render_circuit_prometheus() + render_cache_prometheus()
+    return PlainTextResponse(body, media_type="text/plain; version=0.0.4")
+
+app.include_router(productos_router, prefix="/api/productos", tags=["Productos"])
 
 if __name__ == "__main__":
     uvicorn.run(
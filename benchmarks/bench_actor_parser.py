@@ -0,0 +1,108 @@
+"""
+Micro-benchmark del parser de actores contra la implementación original
+basada en ast.literal_eval.
+
+Uso:
+    python -m benchmarks.bench_actor_parser [--rows=N] [--unique=N]
+"""
+
+import ast
+import sys
+import time
+import random
+import tracemalloc
+from app.infrastructure.actor_parser import clear_cache, cache_info
+from app.infrastructure.error_handlers import DataValidator
+
+
+def legacy_validate_actors_list(actors_data):
+    """Implementación original de DataValidator._validate_actors_list"""
+    if not actors_data:
+        return []
+    try:
+        if isinstance(actors_data, list):
+            clean_actors = [str(actor).strip() for actor in actors_data if actor and str(actor).strip()]
+            return clean_actors[:20]
+        elif isinstance(actors_data, str):
+            try:
+                actors_list = ast.literal_eval(actors_data)
+                if isinstance(actors_list, list):
+                    clean_actors = [str(actor).strip() for actor in actors_list if actor and str(actor).strip()]
+                    return clean_actors[:20]
+            except:  # noqa: E722 - se conserva el comportamiento original
+                for sep in [';', ',', '|']:
+                    if sep in actors_data:
+                        clean_actors = [actor.strip() for actor in actors_data.split(sep) if actor.strip()]
+                        return clean_actors[:20]
+                return [actors_data.strip()] if actors_data.strip() else []
+    except Exception:
+        return []
+    return []
+
+
+# Casos borde que ambos parsers deben resolver igual
+EDGE_CASES = [
+    "", " ", "Solo", "  Solo  ", "A; B", "A, B", "A | B", "A;B,C|D", ",,", "None", "True, False",
+    "True,", "...", "'Solo'", "42", "1, 2", "[]", "['A', 'B']", '["A", "B",]', "[ 'A' , '' , ' C ' ]",
+    "['A', 2]", "['O\\'Neil']", "[\"O'Neil\"]", "['A'] ", "['A'", "[A, B]", "(1, 2)", "{'a': 1}",
+    "Robert Downey Jr., Chris Evans", "José; Zoë", "['Ñandú']", "A\nB", "[" + ", ".join(f"'N{i}'" for i in range(30)) + "]",
+]
+
+
+def _catalog(rows, unique, seed=7):
+    """`rows` textos de actores con `unique` valores distintos y nombres repetidos"""
+    rng = random.Random(seed)
+    names = [f"Actor {chr(65 + i % 26)}{i}" for i in range(max(unique // 2, 10))]
+    formats = [
+        lambda group: repr(group),
+        lambda group: "; ".join(group),
+        lambda group: ", ".join(group),
+        lambda group: " | ".join(group),
+    ]
+    distinct = [formats[i % len(formats)](rng.sample(names, rng.randint(1, 6))) for i in range(unique)]
+    return [rng.choice(distinct) for _ in range(rows)]
+
+
+def _run(func, values):
+    """Tiempo de una pasada y memoria retenida por los resultados (pasada aparte con tracemalloc)"""
+    clear_cache()
+    start = time.perf_counter()
+    results = [func(value) for value in values]
+    seconds = time.perf_counter() - start
+    del results
+    clear_cache()
+    tracemalloc.start()
+    results = [func(value) for value in values]
+    retained, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return results, seconds, retained
+
+
+def main(argv):
+    options = dict(arg.lstrip("-").split("=", 1) for arg in argv if "=" in arg)
+    rows = int(options.get("rows", 200_000))
+    unique = int(options.get("unique", 5_000))
+
+    for case in EDGE_CASES:
+        expected = legacy_validate_actors_list(case)
+        got = DataValidator._validate_actors_list(case)
+        assert got == expected, f"{case!r}: {got!r} != {expected!r}"
+    print(f"✅ {len(EDGE_CASES)} casos borde idénticos a la implementación original")
+
+    values = _catalog(rows, unique)
+    legacy, legacy_seconds, legacy_peak = _run(legacy_validate_actors_list, values)
+    fast, fast_seconds, fast_peak = _run(DataValidator._validate_actors_list, values)
+    assert fast == legacy, "los resultados difieren de la implementación original"
+
+    distinct_legacy = len({id(name) for actors in legacy for name in actors})
+    distinct_fast = len({id(name) for actors in fast for name in actors})
+    print(f"Filas: {rows:,}  textos distintos: {unique:,}")
+    print(f"  original : {legacy_seconds:.3f}s  ({rows / legacy_seconds:,.0f} filas/s)  memoria {legacy_peak / 1e6:.1f} MB  "
+          f"objetos str: {distinct_legacy:,}")
+    print(f"  rápido   : {fast_seconds:.3f}s  ({rows / fast_seconds:,.0f} filas/s)  memoria {fast_peak / 1e6:.1f} MB  "
+          f"objetos str: {distinct_fast:,}")
+    print(f"  speedup  : {legacy_seconds / fast_seconds:.1f}x  cache: {cache_info()}")
+
+
+if __name__ == "__main__":
+    main(sys.argv[1:])
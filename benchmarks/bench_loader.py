@@ -0,0 +1,359 @@
+"""
+Benchmark de punta a punta del cargador `insert_into_db_json`.
+
+Genera un catálogo sintético de productos en JSON, crea y siembra las
+dimensiones en una base SQLite local, ejecuta el pipeline de carga y
+reporta filas/s, tiempo por etapa y RSS máximo. El resultado se guarda en
+JSON y se compara contra una línea base para marcar regresiones.
+
+Uso:
+    python -m benchmarks.bench_loader [--products=N] [--images=N] [--image-reuse=F]
+        [--brands=N] [--subcategories=N] [--branches=N]
+        [--miss-subcategory=F] [--miss-brand=F] [--miss-branch=F] [--generic-brand=0|1]
+        [--files=N] [--workers=N] [--batch-size=N] [--stream] [--staging] [--dedup-images] [--upsert]
+        [--seed=N] [--output=ruta.json] [--baseline=ruta.json] [--save-baseline] [--tolerance=F]
+
+Sale con código 1 si alguna métrica empeora más que `--tolerance`
+respecto a la línea base.
+"""
+
+import os
+import sys
+import json
+import time
+import sqlite3
+import platform
+import resource
+import tempfile
+import contextlib
+import multiprocessing
+from datetime import datetime
+import numpy as np
+
+LOADER_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "insert_into_db_json")
+RESULTS_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "results")
+DEFAULT_BASELINE = os.path.join(RESULTS_DIR, "baseline_loader.json")
+
+DEFAULTS = {
+    "products": 50_000,
+    "images": 3,
+    "image_reuse": 0.3,
+    "brands": 200,
+    "subcategories": 120,
+    "branches": 25,
+    "miss_subcategory": 0.01,
+    "miss_brand": 0.05,
+    "miss_branch": 0.0,
+    "generic_brand": 1,
+    "files": 1,
+    "workers": 1,
+    "batch_size": 5000,
+    "seed": 7,
+    "tolerance": 0.2,
+}
+
+# Etapas que solo cuentan si su diferencia absoluta supera este umbral (s)
+MIN_STAGE_DELTA = 0.05
+
+# Esquema mínimo de las tablas que escribe el cargador
+DDL = """
+CREATE TABLE subcategorias (id INTEGER PRIMARY KEY AUTOINCREMENT, nombre TEXT, activo BOOLEAN DEFAULT 1);
+CREATE TABLE marcas (id INTEGER PRIMARY KEY AUTOINCREMENT, nombre TEXT, activo BOOLEAN DEFAULT 1);
+CREATE TABLE sucursales (id INTEGER PRIMARY KEY AUTOINCREMENT, nombre TEXT, activo BOOLEAN DEFAULT 1);
+CREATE TABLE producto (
+    id INTEGER PRIMARY KEY AUTOINCREMENT, nombre TEXT, descripcion TEXT, precio_bs REAL, in_stock INTEGER,
+    id_sub_categoria INTEGER, id_marca INTEGER, url_supplier TEXT, views INTEGER, id_sucursal INTEGER,
+    activo INTEGER, creado_por TEXT, codigo TEXT
+);
+CREATE TABLE imagenes (id INTEGER PRIMARY KEY AUTOINCREMENT, id_producto INTEGER, url TEXT, creado_por TEXT);
+"""
+
+
+def _parse_options(argv):
+    values = dict(arg.lstrip("-").split("=", 1) for arg in argv if "=" in arg)
+    options = {}
+    for key, default in DEFAULTS.items():
+        raw = values.get(key.replace("_", "-"), default)
+        options[key] = type(default)(raw)
+    for flag in ("stream", "staging", "dedup-images", "upsert", "save-baseline"):
+        options[flag.replace("-", "_")] = f"--{flag}" in argv
+    options["output"] = values.get("output")
+    options["baseline"] = values.get("baseline", DEFAULT_BASELINE)
+    return options
+
+
+def _names(prefix, n):
+    return [f"{prefix} {i:05d}" for i in range(n)]
+
+
+def _with_misses(rng, names, n, miss_rate, prefix):
+    """`n` nombres de la dimensión; una fracción `miss_rate` no existe en ella"""
+    values = np.array(names, dtype=object)[rng.integers(0, len(names), n)]
+    misses = rng.random(n) < miss_rate
+    values[misses] = [f"{prefix} {i}" for i in rng.integers(0, 1000, misses.sum())]
+    return values
+
+
+def generate_catalog(options):
+    """
+    Registros sintéticos con el formato de entrada del cargador y los
+    nombres de las dimensiones a sembrar.
+    """
+    rng = np.random.default_rng(options["seed"])
+    n = options["products"]
+    dimensions = {
+        "subcategorias": _names("Subcategoria", options["subcategories"]),
+        "marcas": (["Generico"] if options["generic_brand"] else []) + _names("Marca", options["brands"]),
+        "sucursales": _names("Sucursal", options["branches"]),
+    }
+    sub_categoria = _with_misses(rng, dimensions["subcategorias"], n, options["miss_subcategory"], "Subcategoria nueva")
+    marca = _with_misses(rng, dimensions["marcas"], n, options["miss_brand"], "Marca nueva")
+    sucursal = _with_misses(rng, dimensions["sucursales"], n, options["miss_branch"], "Sucursal nueva")
+    precio = np.round(rng.uniform(1, 5000, n), 2)
+    views = rng.integers(0, 10_000, n)
+    disponible = rng.random(n) < 0.9
+
+    # Una parte de las imágenes sale de un conjunto compartido (urls repetidas entre productos)
+    n_images = n * options["images"]
+    shared_pool = max(int(n_images * options["image_reuse"] / 4), 1)
+    shared = rng.random(n_images) < options["image_reuse"]
+    image_ids = np.where(shared, rng.integers(0, shared_pool, n_images), shared_pool + np.arange(n_images))
+    image_urls = [f"https://img.example.com/p/{i}.jpg" for i in image_ids]
+
+    records = []
+    for i in range(n):
+        first = i * options["images"]
+        records.append({
+            "nombre_producto": f"Producto {i}",
+            "descripcion": f"Descripcion del producto sintetico {i}",
+            "views": int(views[i]),
+            "precio_bs": float(precio[i]),
+            "disponible": bool(disponible[i]),
+            "sub_categoria": sub_categoria[i],
+            "marca": marca[i],
+            "Sucursal": sucursal[i],
+            "imagen": image_urls[first:first + options["images"]],
+            "url": f"https://tienda.example.com/producto/{i}",
+        })
+    return records, dimensions
+
+
+def write_catalog(records, directory, n_files):
+    """Reparte los registros en `n_files` archivos JSON y retorna sus rutas"""
+    paths = []
+    for k, chunk in enumerate(np.array_split(np.arange(len(records)), n_files)):
+        path = os.path.join(directory, f"catalogo_{k:03d}.json")
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump([records[i] for i in chunk], f, ensure_ascii=False)
+        paths.append(path)
+    return paths
+
+
+def seed_database(db_path, dimensions):
+    """Crea el esquema y siembra las dimensiones"""
+    con = sqlite3.connect(db_path)
+    try:
+        con.executescript(DDL)
+        for table, names in dimensions.items():
+            con.executemany(f"INSERT INTO {table} (nombre) VALUES (?)", [(name,) for name in names])
+        con.commit()
+    finally:
+        con.close()
+
+
+def _run_loader(db_path, files, options, queue):
+    """Ejecuta la carga en un proceso aparte para medir su RSS sin el generador"""
+    sys.path.insert(0, LOADER_DIR)
+    from sqlalchemy import create_engine
+    from dimensions import DimensionResolver
+    from parallel import run_parallel
+    from pipeline import prepare_tables, load_file, new_report, merge_report
+
+    load_options = {
+        "batch_size": options["batch_size"],
+        "stream": options["stream"],
+        "upsert": options["upsert"],
+        "staging": options["staging"],
+        "dedup_images": options["dedup_images"],
+        # Las tablas se preparan abajo, una sola vez
+        "prepare": False,
+    }
+    db_url = f"sqlite:///{db_path}"
+    stages = {}
+    with open(os.devnull, "w") as devnull, contextlib.redirect_stdout(devnull):
+        engine = create_engine(db_url)
+        with engine.connect() as eng:
+            start = time.perf_counter()
+            resolver = DimensionResolver.empty() if options["staging"] else DimensionResolver.load(eng)
+            prepare_tables(eng, options["upsert"], options["staging"], options["dedup_images"])
+            stages["dimensiones"] = time.perf_counter() - start
+
+            start = time.perf_counter()
+            if options["workers"] > 1 and len(files) > 1:
+                report = run_parallel(files, db_url, resolver, options["workers"], **load_options)
+            else:
+                report = new_report()
+                report["archivos"] = []
+                for file_path in files:
+                    file_report = load_file(file_path, eng, resolver, **load_options)
+                    merge_report(report, file_report)
+                    report["archivos"].append(file_report)
+            stages["carga"] = time.perf_counter() - start
+        engine.dispose()
+    # Etapas internas del cargador (con workers, la suma de todos los procesos)
+    for path, stats in report["etapas"].items():
+        stages[f"carga.{path}"] = stats["segundos"]
+
+    # ru_maxrss está en KB en Linux y en bytes en macOS
+    scale = 1 if sys.platform == "darwin" else 1024
+    queue.put({
+        "reporte": {key: report[key] for key in ("leidos", "transformados", "rechazados", "insertados", "motivos")},
+        "errores": [r["error"] for r in report["archivos"] if r.get("error")],
+        "etapas": stages,
+        "rss_max_mb": resource.getrusage(resource.RUSAGE_SELF).ru_maxrss * scale / 1e6,
+        "rss_max_workers_mb": resource.getrusage(resource.RUSAGE_CHILDREN).ru_maxrss * scale / 1e6,
+    })
+
+
+def _count_rows(db_path):
+    con = sqlite3.connect(db_path)
+    try:
+        tables = [row[0] for row in con.execute("SELECT name FROM sqlite_master WHERE type = 'table'")]
+        return {
+            table: con.execute(f"SELECT COUNT(*) FROM {table}").fetchone()[0]
+            for table in ("producto", "imagenes", "imagen", "producto_imagen", "producto_rechazo")
+            if table in tables
+        }
+    finally:
+        con.close()
+
+
+def run_benchmark(options):
+    stages = {}
+    with tempfile.TemporaryDirectory(prefix="bench_loader_") as workdir:
+        start = time.perf_counter()
+        records, dimensions = generate_catalog(options)
+        files = write_catalog(records, workdir, options["files"])
+        del records
+        stages["generacion"] = time.perf_counter() - start
+
+        db_path = os.path.join(workdir, "bench.db")
+        start = time.perf_counter()
+        seed_database(db_path, dimensions)
+        stages["siembra"] = time.perf_counter() - start
+
+        context = multiprocessing.get_context("spawn")
+        queue = context.Queue()
+        process = context.Process(target=_run_loader, args=(db_path, files, options, queue))
+        start = time.perf_counter()
+        process.start()
+        result = queue.get()
+        process.join()
+        total = time.perf_counter() - start
+
+        stages.update(result["etapas"])
+        start = time.perf_counter()
+        filas = _count_rows(db_path)
+        stages["verificacion"] = time.perf_counter() - start
+
+    carga = result["etapas"]["carga"]
+    return {
+        "fecha": datetime.now().isoformat(timespec="seconds"),
+        "parametros": {key: value for key, value in options.items() if key not in ("output", "baseline", "save_baseline", "tolerance")},
+        "entorno": _environment(),
+        "resultados": {
+            **result["reporte"],
+            "errores": result["errores"],
+            "filas": filas,
+            "segundos_proceso": total,
+            "filas_por_segundo": result["reporte"]["leidos"] / carga if carga else 0.0,
+            "etapas": stages,
+            "rss_max_mb": result["rss_max_mb"],
+            "rss_max_workers_mb": result["rss_max_workers_mb"],
+        },
+    }
+
+
+def _environment():
+    import pandas
+    import sqlalchemy
+    return {
+        "python": platform.python_version(),
+        "pandas": pandas.__version__,
+        "sqlalchemy": sqlalchemy.__version__,
+        "sqlite": sqlite3.sqlite_version,
+        "plataforma": platform.platform(),
+        "cpus": os.cpu_count(),
+    }
+
+
+def compare(current, baseline, tolerance):
+    """
+    Regresiones de `current` respecto a `baseline`: menos filas/s, más RSS o
+    etapas más lentas que la tolerancia relativa. Retorna una lista de textos.
+    """
+    regresiones = []
+    actual, base = current["resultados"], baseline["resultados"]
+    if actual["filas_por_segundo"] < base["filas_por_segundo"] * (1 - tolerance):
+        regresiones.append(f"filas/s {actual['filas_por_segundo']:,.0f} < {base['filas_por_segundo']:,.0f}")
+    if actual["rss_max_mb"] > base["rss_max_mb"] * (1 + tolerance):
+        regresiones.append(f"RSS {actual['rss_max_mb']:.1f} MB > {base['rss_max_mb']:.1f} MB")
+    for stage, seconds in actual["etapas"].items():
+        previous = base["etapas"].get(stage)
+        if previous is None:
+            continue
+        if seconds > previous * (1 + tolerance) and seconds - previous > MIN_STAGE_DELTA:
+            regresiones.append(f"etapa {stage} {seconds:.3f}s > {previous:.3f}s")
+    if current["parametros"] != baseline["parametros"]:
+        print("⚠️ Parámetros distintos a los de la línea base; la comparación es orientativa")
+    return regresiones
+
+
+def print_result(result):
+    res = result["resultados"]
+    print(f"Productos: {res['leidos']:,}  insertados: {res['insertados']:,}  rechazados: {res['rechazados']:,} {res['motivos']}")
+    print(f"  filas/s  : {res['filas_por_segundo']:,.0f}")
+    print(f"  RSS máx  : {res['rss_max_mb']:.1f} MB (workers {res['rss_max_workers_mb']:.1f} MB)")
+    print(f"  tablas   : {res['filas']}")
+    for stage, seconds in res["etapas"].items():
+        print(f"  {stage:<36}: {seconds:.3f}s")
+    for error in res["errores"]:
+        print(f"  ❌ {error}")
+
+
+def main(argv):
+    options = _parse_options(argv)
+    result = run_benchmark(options)
+    print_result(result)
+
+    output = options["output"] or os.path.join(
+        RESULTS_DIR, f"loader_{datetime.now().strftime('%Y%m%d_%H%M%S')}.json"
+    )
+    os.makedirs(os.path.dirname(os.path.abspath(output)), exist_ok=True)
+    with open(output, "w", encoding="utf-8") as f:
+        json.dump(result, f, indent=2, ensure_ascii=False)
+    print(f"Resultado guardado en {output}")
+
+    if options["save_baseline"]:
+        os.makedirs(os.path.dirname(os.path.abspath(options["baseline"])), exist_ok=True)
+        with open(options["baseline"], "w", encoding="utf-8") as f:
+            json.dump(result, f, indent=2, ensure_ascii=False)
+        print(f"Línea base actualizada: {options['baseline']}")
+        return 0
+    if not os.path.exists(options["baseline"]):
+        print("Sin línea base para comparar (usar --save-baseline)")
+        return 0
+    with open(options["baseline"], encoding="utf-8") as f:
+        baseline = json.load(f)
+    regresiones = compare(result, baseline, options["tolerance"])
+    if regresiones:
+        print("❌ Regresiones respecto a la línea base:")
+        for regresion in regresiones:
+            print(f"  - {regresion}")
+        return 1
+    print(f"✅ Sin regresiones respecto a la línea base (tolerancia {options['tolerance']:.0%})")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main(sys.argv[1:]))
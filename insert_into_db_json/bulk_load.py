@@ -0,0 +1,173 @@
+"""
+Escritura masiva de lotes en la base de datos.
+
+En PostgreSQL los lotes se envian con `COPY ... FROM STDIN` sobre la
+conexion DBAPI de la misma conexion SQLAlchemy, de modo que comparten la
+transaccion del cargador. En SQLite y MySQL se usa `DataFrame.to_sql`.
+
+Las filas de producto se insertan recuperando sus ids generados en el mismo
+lote, sin volver a consultar la tabla.
+"""
+
+import io
+import time
+import pandas as pd
+from sqlalchemy import Table, MetaData, Column, Integer, insert, text
+from stage_timer import stage
+
+# Marcador de NULL para COPY en formato CSV
+COPY_NULL = "\\N"
+
+
+def supports_copy(connx_eng):
+    """Indica si la conexion permite COPY FROM STDIN"""
+    return connx_eng.dialect.name == "postgresql"
+
+def table_schema(connx_eng):
+    """Esquema explicito solo en PostgreSQL"""
+    return "public" if supports_copy(connx_eng) else None
+
+def insert_into_table(df_insert: pd.DataFrame, connx_eng, table_name):
+    """Insert element into table_name given a df_input dataframe"""
+    ck_size = int(float(2097 / len(df_insert.columns)))
+    df_insert.to_sql(
+        table_name,
+        schema=table_schema(connx_eng),
+        con=connx_eng,
+        chunksize=ck_size,
+        method="multi",
+        index=False,
+        if_exists="append",
+    )
+    print(f"Insertado correctamente: {table_name}.\nRegistros insertados:{len(df_insert)}")
+
+def _to_csv_buffer(df_insert: pd.DataFrame):
+    """Serializa el lote como CSV en memoria para COPY"""
+    df_csv = df_insert
+    # Columnas float con valores enteros (p.ej. enteros con nulos) se envian como enteros
+    for col in df_insert.columns:
+        serie = df_insert[col]
+        if pd.api.types.is_float_dtype(serie) and ((serie.dropna() % 1) == 0).all():
+            if df_csv is df_insert:
+                df_csv = df_insert.copy()
+            df_csv[col] = serie.astype("Int64")
+    buffer = io.StringIO()
+    df_csv.to_csv(buffer, index=False, header=False, na_rep=COPY_NULL)
+    buffer.seek(0)
+    return buffer
+
+def copy_into_table(df_insert: pd.DataFrame, connx_eng, table_name):
+    """Inserta el lote con COPY FROM STDIN usando la conexion DBAPI del engine"""
+    preparer = connx_eng.dialect.identifier_preparer
+    columns = ", ".join(preparer.quote(col) for col in df_insert.columns)
+    sql = (
+        f"COPY public.{preparer.quote(table_name)} ({columns}) "
+        f"FROM STDIN WITH (FORMAT csv, NULL '{COPY_NULL}')"
+    )
+    buffer = _to_csv_buffer(df_insert)
+    cursor = connx_eng.connection.dbapi_connection.cursor()
+    try:
+        cursor.copy_expert(sql, buffer)
+    finally:
+        cursor.close()
+    print(f"Copiado correctamente: {table_name}.\nRegistros insertados:{len(df_insert)}")
+
+def write_table(df_insert: pd.DataFrame, connx_eng, table_name, use_copy=True):
+    """Escribe el lote con COPY cuando el motor lo soporta, si no con to_sql"""
+    if use_copy and supports_copy(connx_eng):
+        copy_into_table(df_insert, connx_eng, table_name)
+    else:
+        insert_into_table(df_insert, connx_eng, table_name)
+
+def _table_for(df_insert: pd.DataFrame, connx_eng, table_name):
+    """Tabla SQLAlchemy minima con la llave `id` y las columnas del lote"""
+    return Table(
+        table_name,
+        MetaData(),
+        Column("id", Integer, primary_key=True),
+        *[Column(col) for col in df_insert.columns],
+        schema=table_schema(connx_eng),
+    )
+
+def to_records(df_insert: pd.DataFrame):
+    """Filas del lote como dicts con tipos nativos de Python y None para nulos"""
+    return df_insert.astype(object).where(df_insert.notna(), None).to_dict("records")
+
+def reserve_ids(connx_eng, table_name, n_ids):
+    """Reserva `n_ids` valores de la secuencia del id de la tabla (PostgreSQL)"""
+    result = connx_eng.execute(
+        text("SELECT nextval(pg_get_serial_sequence(:tabla, 'id')) FROM generate_series(1, :n)"),
+        {"tabla": f"public.{table_name}", "n": n_ids},
+    )
+    return [row[0] for row in result]
+
+def insert_returning_ids(df_insert: pd.DataFrame, connx_eng, table_name, use_copy=True):
+    """
+    Inserta el lote y retorna los ids generados, en el orden de las filas.
+
+    - PostgreSQL con COPY: reserva los ids de la secuencia y los envia en el COPY.
+    - PostgreSQL/SQLite: INSERT ... RETURNING id en lotes multi-fila.
+    - MySQL: INSERT multi-fila por bloque; los ids son el rango que inicia en
+      `lastrowid` (requiere innodb_autoinc_lock_mode consecutivo para inserts simples).
+    """
+    if df_insert.empty:
+        return []
+    if use_copy and supports_copy(connx_eng):
+        ids = reserve_ids(connx_eng, table_name, len(df_insert))
+        copy_into_table(df_insert.assign(id=ids), connx_eng, table_name)
+        return ids
+    tbl = _table_for(df_insert, connx_eng, table_name)
+    rows = to_records(df_insert)
+    if connx_eng.dialect.name == "mysql":
+        ids = []
+        ck_size = int(float(2097 / len(df_insert.columns)))
+        for start in range(0, len(rows), ck_size):
+            chunk = rows[start:start + ck_size]
+            result = connx_eng.execute(insert(tbl).values(chunk))
+            ids.extend(range(result.lastrowid, result.lastrowid + len(chunk)))
+    else:
+        result = connx_eng.execute(
+            insert(tbl).returning(tbl.c.id, sort_by_parameter_order=True), rows
+        )
+        ids = result.scalars().all()
+    print(f"Insertado correctamente: {table_name}.\nRegistros insertados:{len(ids)}")
+    return ids
+
+def insert_images(ids, imagenes, creado_por, connx_eng, use_copy=True):
+    """Inserta en imagenes una fila por url de cada producto `ids[i]` con urls `imagenes[i]`"""
+    with stage("explode") as etapa:
+        df_product_image = pd.DataFrame({
+            "id_producto": ids,
+            "url": imagenes,
+            "creado_por": creado_por,
+        }).explode("url", ignore_index=True).dropna(subset=["url"])
+        etapa.rows = len(df_product_image)
+    print("Imagenes obtenidas a insertar:",len(df_product_image))
+    if not df_product_image.empty:
+        with stage("insercion", rows=len(df_product_image)):
+            write_table(df_product_image, connx_eng, "imagenes", use_copy)
+    return len(df_product_image)
+
+def benchmark_writers(df_insert: pd.DataFrame, connx_eng, table_name):
+    """
+    Mide cada ruta de escritura disponible sobre el mismo lote.
+
+    Cada escritura corre en una transaccion explicita (o un savepoint si ya
+    hay una abierta) que se revierte, por lo que la tabla no cambia: sin
+    ella to_sql confirmaria por su cuenta.
+    Retorna {ruta: {"rows": n, "seconds": s}}.
+    """
+    writers = {"to_sql": insert_into_table}
+    if supports_copy(connx_eng):
+        writers["copy"] = copy_into_table
+    results = {}
+    for name, writer in writers.items():
+        trans = connx_eng.begin_nested() if connx_eng.in_transaction() else connx_eng.begin()
+        start = time.perf_counter()
+        try:
+            writer(df_insert, connx_eng, table_name)
+        finally:
+            elapsed = time.perf_counter() - start
+            trans.rollback()
+        results[name] = {"rows": len(df_insert), "seconds": elapsed}
+    return results
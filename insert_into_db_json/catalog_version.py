@@ -0,0 +1,53 @@
+"""
+Version del catalogo para invalidar caches de lectura (ver
+app/infrastructure/search_cache.py).
+
+`catalogo_version` tiene una sola fila con un contador que cada lote que
+escribe productos incrementa (`version = version + 1`) como ultima
+sentencia antes de su commit. Asi cada commit deja visible un valor
+distinto: dos lotes concurrentes se serializan sobre la fila y el segundo
+parte del valor confirmado por el primero, de modo que ningun commit puede
+quedar "detras" de una version ya observada. El bloqueo de la fila dura
+solo entre el incremento y el commit.
+"""
+
+from sqlalchemy import Table, MetaData, Column, BigInteger, Integer, Text, DateTime, select, insert, update, func
+from bulk_load import table_schema
+
+VERSION_TABLE = "catalogo_version"
+
+# Llave de la unica fila
+VERSION_ROW = 1
+
+
+def _version_table(eng):
+    return Table(
+        VERSION_TABLE,
+        MetaData(),
+        Column("id", Integer, primary_key=True, autoincrement=False),
+        Column("version", BigInteger, nullable=False),
+        Column("archivo", Text),
+        Column("actualizado", DateTime, server_default=func.current_timestamp()),
+        schema=table_schema(eng),
+    )
+
+def ensure_version_table(eng):
+    """Crea la tabla catalogo_version con su fila si no existen"""
+    tbl = _version_table(eng)
+    tbl.create(eng, checkfirst=True)
+    if eng.execute(select(tbl.c.id).where(tbl.c.id == VERSION_ROW)).first() is None:
+        eng.execute(insert(tbl).values(id=VERSION_ROW, version=0))
+
+def bump_catalog_version(eng, file_path=None):
+    """Incrementa la version del catalogo sin hacer commit; llamar justo antes del commit"""
+    tbl = _version_table(eng)
+    eng.execute(
+        update(tbl)
+        .where(tbl.c.id == VERSION_ROW)
+        .values(version=tbl.c.version + 1, archivo=file_path, actualizado=func.current_timestamp())
+    )
+
+def current_catalog_version(eng):
+    """Version vigente del catalogo (0 si nunca se cargo)"""
+    tbl = _version_table(eng)
+    return eng.execute(select(tbl.c.version).where(tbl.c.id == VERSION_ROW)).scalar() or 0
@@ -0,0 +1,94 @@
+"""
+Puntos de control de la carga por archivo.
+
+La tabla `carga_checkpoint` guarda, por archivo de entrada, cuantos
+registros ya quedaron confirmados. La fila se escribe en la misma
+transaccion que el lote, asi que el punto de control nunca adelanta ni
+atrasa a los datos: al reanudar se continua exactamente despues del
+ultimo lote confirmado, sin duplicar productos.
+"""
+
+import os
+import hashlib
+from datetime import datetime, timezone
+from sqlalchemy import Table, MetaData, Column, String, BigInteger, Integer, Boolean, DateTime, select, delete
+from bulk_load import table_schema
+from stage_timer import stage
+
+CHECKPOINT_TABLE = "carga_checkpoint"
+
+# Bytes del inicio y del final del archivo que entran en la huella
+FINGERPRINT_BYTES = 1 << 20
+
+
+class BatchLoadError(Exception):
+    """Fallo al escribir un lote con punto de control: la carga del archivo se detiene"""
+
+
+def _checkpoint_table(eng):
+    return Table(
+        CHECKPOINT_TABLE,
+        MetaData(),
+        Column("archivo", String(512), primary_key=True),
+        Column("huella", String(64), nullable=False),
+        Column("registros", BigInteger, nullable=False),
+        Column("lotes", Integer, nullable=False),
+        Column("completado", Boolean, nullable=False),
+        Column("actualizado", DateTime, nullable=False),
+        schema=table_schema(eng),
+    )
+
+def ensure_checkpoint_table(eng):
+    """Crea la tabla carga_checkpoint si no existe"""
+    _checkpoint_table(eng).create(eng, checkfirst=True)
+
+def checkpoint_key(file_path):
+    return os.path.abspath(file_path)
+
+def file_fingerprint(file_path):
+    """Huella del archivo: tamano mas SHA-1 del primer y ultimo MB"""
+    size = os.path.getsize(file_path)
+    digest = hashlib.sha1(str(size).encode())
+    with open(file_path, "rb") as f:
+        digest.update(f.read(FINGERPRINT_BYTES))
+        if size > FINGERPRINT_BYTES:
+            f.seek(max(size - FINGERPRINT_BYTES, FINGERPRINT_BYTES))
+            digest.update(f.read(FINGERPRINT_BYTES))
+    return digest.hexdigest()
+
+def read_checkpoint(eng, file_path):
+    """Punto de control guardado del archivo, o None"""
+    tbl = _checkpoint_table(eng)
+    row = eng.execute(select(tbl).where(tbl.c.archivo == checkpoint_key(file_path))).mappings().first()
+    return dict(row) if row else None
+
+def save_checkpoint(eng, file_path, huella, registros, lotes, completado=False):
+    """
+    Guarda el punto de control sin confirmar: debe ejecutarse dentro de la
+    transaccion del lote para que ambos se confirmen juntos.
+    """
+    tbl = _checkpoint_table(eng)
+    key = checkpoint_key(file_path)
+    with stage("punto_control"):
+        eng.execute(delete(tbl).where(tbl.c.archivo == key))
+        eng.execute(tbl.insert().values(
+            archivo=key,
+            huella=huella,
+            registros=int(registros),
+            lotes=int(lotes),
+            completado=completado,
+            actualizado=datetime.now(timezone.utc).replace(tzinfo=None),
+        ))
+
+def resume_offset(eng, file_path, huella):
+    """
+    Registros a omitir al reanudar: (registros, lotes, completado). Si no
+    hay punto de control o el archivo cambio desde entonces se empieza de cero.
+    """
+    checkpoint = read_checkpoint(eng, file_path)
+    if checkpoint is None:
+        return 0, 0, False
+    if checkpoint["huella"] != huella:
+        print(f"El archivo {os.path.basename(file_path)} cambió desde el último punto de control; se carga desde el inicio")
+        return 0, 0, False
+    return checkpoint["registros"], checkpoint["lotes"], checkpoint["completado"]
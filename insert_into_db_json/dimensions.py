@@ -0,0 +1,88 @@
+"""
+Resolucion de llaves foraneas del producto contra las tablas de dimensiones
+(subcategorias, marcas y sucursales).
+
+Cada dimension se carga una sola vez como `nombre -> id` usando la llave
+primaria real de la tabla, de modo que cada busqueda cuesta O(1).
+"""
+
+import pandas as pd
+
+# Tabla de origen de cada dimension
+DIMENSION_TABLES = {
+    "subcategoria": "subcategorias",
+    "marca": "marcas",
+    "sucursal": "sucursales",
+}
+
+MARCA_GENERICA = "Generico"
+
+
+class DimensionResolver:
+    """Resuelve ids de subcategoria, marca y sucursal con mapas hash"""
+
+    def __init__(self, maps):
+        self.maps = maps
+        self.stats = {name: {"hits": 0, "misses": 0} for name in DIMENSION_TABLES}
+        self._frames = {}
+
+    @classmethod
+    def load(cls, eng):
+        """Lee `id, nombre` de las dimensiones activas y construye los mapas"""
+        maps = {}
+        for name, table in DIMENSION_TABLES.items():
+            df_dim = pd.read_sql_query(f"SELECT id, nombre FROM {table} WHERE activo = true ORDER BY id", eng)
+            # Si un nombre se repite se conserva el id mas bajo
+            df_dim = df_dim.drop_duplicates(subset="nombre", keep="first")
+            maps[name] = dict(zip(df_dim["nombre"], df_dim["id"].astype(int)))
+            print(f"Dimensión {table} obtenida:", len(maps[name]))
+        return cls(maps)
+
+    @classmethod
+    def empty(cls):
+        """Resolver sin mapas: solo acumula aciertos/fallos (p.ej. carga por staging)"""
+        return cls({name: {} for name in DIMENSION_TABLES})
+
+    def resolve(self, dimension, nombre):
+        """Retorna el id de `nombre` en la dimension o None si no existe"""
+        id_dim = self.maps[dimension].get(nombre)
+        self.stats[dimension]["hits" if id_dim is not None else "misses"] += 1
+        return id_dim
+
+    def resolve_subcategoria(self, nombre):
+        return self.resolve("subcategoria", nombre)
+
+    def resolve_marca(self, nombre):
+        """Resuelve la marca; si no existe usa la marca generica"""
+        id_marca = self.resolve("marca", nombre)
+        if id_marca is None:
+            id_marca = self.maps["marca"].get(MARCA_GENERICA)
+        return id_marca
+
+    def resolve_sucursal(self, nombre):
+        return self.resolve("sucursal", nombre)
+
+    def frame(self, dimension, key_column, id_column):
+        """Dimension como DataFrame (`key_column`, `id_column`) para usar en merges"""
+        cache_key = (dimension, key_column, id_column)
+        if cache_key not in self._frames:
+            mapping = self.maps[dimension]
+            self._frames[cache_key] = pd.DataFrame({
+                key_column: pd.Series(list(mapping.keys()), dtype=object),
+                id_column: pd.array(list(mapping.values()), dtype="Int64"),
+            })
+        return self._frames[cache_key]
+
+    def record(self, dimension, hits, misses):
+        """Acumula aciertos/fallos resueltos en bloque"""
+        self.stats[dimension]["hits"] += int(hits)
+        self.stats[dimension]["misses"] += int(misses)
+
+    def summary(self):
+        """Resumen de aciertos/fallos por dimension"""
+        return {name: dict(counts) for name, counts in self.stats.items()}
+
+    def reset_stats(self):
+        for counts in self.stats.values():
+            counts["hits"] = 0
+            counts["misses"] = 0
@@ -0,0 +1,167 @@
+"""
+Imagenes de producto deduplicadas por contenido de la url.
+
+Cada url se normaliza (espacios, esquema y host en minuscula, puerto por
+defecto y fragmento fuera) y se guarda una sola vez en `imagen`, con un
+hash de 64 bits de la url normalizada como llave. Los productos se enlazan
+en `producto_imagen` solo con (`id_producto`, `url_hash`, `posicion`); las
+urls y enlaces que ya existen se omiten, de modo que repetir un feed no
+vuelve a escribir imagenes.
+"""
+
+from urllib.parse import urlsplit, urlunsplit
+import numpy as np
+import pandas as pd
+from sqlalchemy import Table, MetaData, Column, Integer, BigInteger, Text, String, DateTime, select, insert, func
+from sqlalchemy.dialects import postgresql, sqlite
+from bulk_load import table_schema, to_records, insert_images
+from stage_timer import stage
+
+IMAGE_TABLE = "imagen"
+LINK_TABLE = "producto_imagen"
+
+# Cantidad maxima de hashes por consulta IN
+LOOKUP_CHUNK = 500
+
+# Puertos que se omiten al normalizar
+DEFAULT_PORTS = {"http": 80, "https": 443}
+
+# Dialectos con INSERT ... ON CONFLICT DO NOTHING
+_ON_CONFLICT_DIALECTS = {"postgresql": postgresql, "sqlite": sqlite}
+
+
+def image_table(eng):
+    """Tabla imagen: una fila por url normalizada"""
+    return Table(
+        IMAGE_TABLE,
+        MetaData(),
+        Column("url_hash", BigInteger, primary_key=True, autoincrement=False),
+        Column("url", Text, nullable=False),
+        Column("creado_por", String(64)),
+        Column("creado", DateTime, server_default=func.current_timestamp()),
+        schema=table_schema(eng),
+    )
+
+def link_table(eng):
+    """Tabla producto_imagen: enlaces (id_producto, url_hash)"""
+    return Table(
+        LINK_TABLE,
+        MetaData(),
+        Column("id_producto", BigInteger, primary_key=True, autoincrement=False),
+        Column("url_hash", BigInteger, primary_key=True, autoincrement=False),
+        Column("posicion", Integer, nullable=False),
+        schema=table_schema(eng),
+    )
+
+def ensure_image_tables(eng):
+    """Crea las tablas imagen y producto_imagen si no existen"""
+    image_table(eng).create(eng, checkfirst=True)
+    link_table(eng).create(eng, checkfirst=True)
+
+def normalize_url(url):
+    """Forma canonica de una url de imagen, o None si esta vacia"""
+    if not isinstance(url, str):
+        return None
+    url = url.strip()
+    if not url:
+        return None
+    try:
+        parts = urlsplit(url)
+        port = parts.port
+    except ValueError:
+        # Url mal formada (p.ej. puerto invalido): se conserva tal cual
+        return url
+    scheme = parts.scheme.lower()
+    host = (parts.hostname or "").lower()
+    if not host:
+        return urlunsplit((scheme, parts.netloc, parts.path, parts.query, ""))
+    if ":" in host:
+        host = f"[{host}]"
+    userinfo = parts.netloc.rpartition("@")[0]
+    netloc = f"{userinfo}@{host}" if userinfo else host
+    if port is not None and DEFAULT_PORTS.get(scheme) != port:
+        netloc = f"{netloc}:{port}"
+    return urlunsplit((scheme, netloc, parts.path or "/", parts.query, ""))
+
+def url_hashes(urls) -> np.ndarray:
+    """Hash de 64 bits de cada url normalizada, estable entre ejecuciones"""
+    return pd.util.hash_pandas_object(pd.Series(urls, dtype=object), index=False).to_numpy().view(np.int64)
+
+def image_links(ids, imagenes) -> pd.DataFrame:
+    """
+    Enlaces (`id_producto`, `url_hash`, `posicion`, `url`) de los productos
+    `ids[i]` con urls `imagenes[i]`. Cada url distinta se normaliza una sola
+    vez y una url repetida en el mismo producto se enlaza una vez.
+    """
+    df_links = pd.DataFrame({"id_producto": ids, "url": imagenes}).explode("url", ignore_index=True)
+    codes, uniques = pd.factorize(df_links["url"])
+    normalized = np.array([normalize_url(url) for url in uniques] + [None], dtype=object)
+    df_links["url"] = normalized[codes]
+    df_links = df_links.dropna(subset=["url"])
+    df_links["url_hash"] = url_hashes(df_links["url"].to_numpy())
+    df_links = df_links.drop_duplicates(subset=["id_producto", "url_hash"])
+    df_links["posicion"] = df_links.groupby("id_producto").cumcount()
+    return df_links[["id_producto", "url_hash", "posicion", "url"]].reset_index(drop=True)
+
+def fetch_existing_hashes(eng, hashes) -> set:
+    """Hashes del lote que ya estan en la tabla imagen"""
+    tbl = image_table(eng)
+    unique_hashes = np.unique(hashes).tolist()
+    existing = set()
+    for start in range(0, len(unique_hashes), LOOKUP_CHUNK):
+        chunk = unique_hashes[start:start + LOOKUP_CHUNK]
+        existing.update(eng.execute(select(tbl.c.url_hash).where(tbl.c.url_hash.in_(chunk))).scalars())
+    return existing
+
+def insert_ignore(tbl, eng):
+    """INSERT que omite las filas cuya llave primaria ya existe"""
+    dialect = eng.dialect.name
+    if dialect in _ON_CONFLICT_DIALECTS:
+        return _ON_CONFLICT_DIALECTS[dialect].insert(tbl).on_conflict_do_nothing()
+    if dialect == "mysql":
+        return insert(tbl).prefix_with("IGNORE")
+    return insert(tbl)
+
+def store_images(ids, imagenes, creado_por, connx_eng):
+    """
+    Guarda las imagenes de los productos `ids[i]` con urls `imagenes[i]`.
+
+    Solo se envian las urls que no estan en `imagen`; los enlaces repetidos
+    se omiten con ON CONFLICT DO NOTHING / INSERT IGNORE. Retorna
+    (imagenes nuevas, enlaces nuevos).
+    """
+    with stage("normalizacion") as etapa:
+        df_links = image_links(ids, imagenes)
+        etapa.rows = len(df_links)
+    if df_links.empty:
+        print("Imagenes obtenidas a insertar: 0")
+        return 0, 0
+    df_imagenes = df_links.drop_duplicates(subset="url_hash")[["url_hash", "url"]]
+    with stage("consulta", rows=len(df_imagenes)):
+        existing = fetch_existing_hashes(connx_eng, df_imagenes["url_hash"].to_numpy())
+    df_nuevas = df_imagenes.loc[~df_imagenes["url_hash"].isin(existing)]
+    if not df_nuevas.empty:
+        creado = pd.Series(creado_por, dtype=object).iloc[0] if len(creado_por) else None
+        with stage("insercion", rows=len(df_nuevas)):
+            connx_eng.execute(
+                insert_ignore(image_table(connx_eng), connx_eng), to_records(df_nuevas.assign(creado_por=creado))
+            )
+    with stage("enlaces", rows=len(df_links)):
+        result = connx_eng.execute(
+            insert_ignore(link_table(connx_eng), connx_eng), to_records(df_links[["id_producto", "url_hash", "posicion"]])
+        )
+    # Algunos drivers no informan filas en executemany (rowcount -1)
+    enlaces = result.rowcount if result.rowcount >= 0 else len(df_links)
+    print(f"Imagenes: {len(df_imagenes)} urls distintas, {len(df_nuevas)} nuevas; "
+          f"enlaces nuevos: {enlaces} de {len(df_links)}")
+    return len(df_nuevas), enlaces
+
+def write_images(ids, imagenes, creado_por, connx_eng, use_copy=True, dedup=False):
+    """
+    Escribe las imagenes de un lote: deduplicadas en imagen/producto_imagen
+    con `dedup`, si no una fila por url en imagenes. Retorna las filas de
+    enlace escritas.
+    """
+    if dedup:
+        return store_images(ids, imagenes, creado_por, connx_eng)[1]
+    return insert_images(ids, imagenes, creado_por, connx_eng, use_copy)
@@ -0,0 +1,92 @@
+"""
+Lectura incremental de archivos de productos.
+
+Permite recorrer un arreglo JSON de nivel superior o un archivo NDJSON
+(un objeto por linea) sin cargar el archivo completo en memoria.
+"""
+
+import re
+import json
+from itertools import islice
+
+CHUNK_SIZE = 1 << 16
+
+# Separadores entre elementos: espacios en NDJSON, espacios y comas en arreglos
+_ARRAY_SEPARATORS = re.compile(r"[ \t\n\r,]*")
+_NDJSON_SEPARATORS = re.compile(r"[ \t\n\r]*")
+
+
+def iter_json_records(file_path, chunk_size=CHUNK_SIZE, encoding="utf-8"):
+    """
+    Genera los registros de un archivo JSON uno a uno.
+
+    Detecta el formato por el primer caracter significativo: si es `[`
+    recorre los elementos del arreglo, en otro caso trata el archivo como
+    NDJSON. La memoria usada queda acotada por `chunk_size` mas el tamano
+    del registro mas grande.
+    """
+    decoder = json.JSONDecoder()
+    with open(file_path, "r", encoding=encoding) as f:
+        buffer = ""
+        pos = 0
+        # Buscar el primer caracter significativo
+        while True:
+            match = _NDJSON_SEPARATORS.match(buffer, pos)
+            pos = match.end()
+            if pos < len(buffer):
+                break
+            buffer = f.read(chunk_size)
+            pos = 0
+            if not buffer:
+                return
+        in_array = buffer[pos] == "["
+        if in_array:
+            pos += 1
+        yield from _iter_values(f, decoder, buffer, pos, chunk_size, in_array)
+
+
+def _iter_values(f, decoder, buffer, pos, chunk_size, in_array):
+    """Decodifica valores consecutivos del buffer, leyendo mas bloques cuando falta texto"""
+    separators = _ARRAY_SEPARATORS if in_array else _NDJSON_SEPARATORS
+    eof = False
+    while True:
+        pos = separators.match(buffer, pos).end()
+        if pos == len(buffer):
+            if eof:
+                if in_array:
+                    raise ValueError("Arreglo JSON sin cerrar: falta ']'")
+                return
+            buffer, pos, eof = _refill(f, buffer, pos, chunk_size)
+            continue
+        if in_array and buffer[pos] == "]":
+            return
+        try:
+            value, end = decoder.raw_decode(buffer, pos)
+        except json.JSONDecodeError:
+            if eof:
+                raise
+            end = None
+        # Un valor que termina justo al final del buffer puede estar truncado
+        if end is None or (end == len(buffer) and not eof):
+            buffer, pos, eof = _refill(f, buffer, pos, chunk_size)
+            continue
+        yield value
+        pos = end
+
+
+def _refill(f, buffer, pos, chunk_size):
+    """Descarta el texto ya consumido y agrega el siguiente bloque del archivo"""
+    chunk = f.read(chunk_size)
+    return buffer[pos:] + chunk, 0, not chunk
+
+
+def iter_batches(iterable, batch_size):
+    """Agrupa un iterable en listas de hasta `batch_size` elementos"""
+    if batch_size < 1:
+        raise ValueError("batch_size debe ser mayor que cero")
+    iterator = iter(iterable)
+    while True:
+        batch = list(islice(iterator, batch_size))
+        if not batch:
+            return
+        yield batch
@@ -1,16 +1,17 @@
-
 import os
-import pdb
+import glob
 import json
 import time
-import random
-import string
-import urllib
-import psycopg2
-import pandas as pd
 from sys import argv
 from dotenv import load_dotenv
 from sqlalchemy import create_engine
+from pipeline import BATCH_SIZE, prepare_tables, load_file, new_report, merge_report, print_report
+from parallel import run_parallel
+from product_codes import MAX_WORKERS, PARALLEL_WORKER_ID
+from dimensions import DimensionResolver
+from stage_timer import start_profile, stop_profile
+from search_index import ensure_search_index, rebuild_search_index
+from catalog_version import ensure_version_table, bump_catalog_version
 
 # Carga las variables del archivo .env
 load_dotenv(dotenv_path='../.env')
@@ -22,13 +23,48 @@ passworddb = os.getenv('PASSWORDDB')
 portdb = os.getenv('PORTDB')
 db = os.getenv('DB')
 name_servicedb = os.getenv('NAME_SERVICEDB')
+# URL completa de SQLAlchemy (opcional), p.ej. sqlite:///productos.db
+urldb = os.getenv('URLDB')
 
 # Configuracion de directorio
 path = os.path.dirname(os.path.abspath(__file__))
 
+USAGE = """Uso: python main.py (--file=ARCHIVO | --glob=PATRON) [opciones]
+
+Archivos relativos a input/. Opciones:
+  --stream               lectura incremental por lotes
+  --batch-size=N         registros por lote (por defecto {batch_size})
+  --workers=N            procesos en paralelo con --glob
+  --upsert               solo productos nuevos o modificados
+  --resume               continuar desde el ultimo lote confirmado
+  --staging              resolver dimensiones en la base de datos
+  --dedup-images         imagenes deduplicadas en imagen/producto_imagen
+  --no-copy              sin COPY FROM STDIN en PostgreSQL
+  --benchmark            medir los escritores sin insertar
+  --reindex              crear o reconstruir el indice de busqueda
+  --profile[=RUTA]       cProfile de toda la carga
+  --profile-stage=ETAPA  cProfile de una sola etapa
+  --run-report=RUTA      reporte de la ejecucion en JSON
+
+Variables de entorno:
+  URLDB                  URL de SQLAlchemy (si no, NAMEDB/USERDB/PASSWORDDB/NAME_SERVICEDB/PORTDB)
+  LOADER_WORKER_ID       id de worker de los codigos de producto (0-{max_id}). Con --workers
+                         cada worker usa LOADER_WORKER_ID + i (por defecto {parallel_id} + i); dos
+                         cargas simultaneas necesitan valores separados al menos workers + 1
+""".format(batch_size=BATCH_SIZE, max_id=MAX_WORKERS - 1, parallel_id=PARALLEL_WORKER_ID)
+
+def write_run_report(report, file_path):
+    """Guarda el reporte completo de la ejecucion (incluidas las etapas) como JSON"""
+    with open(file_path, "w", encoding="utf-8") as f:
+        json.dump(report, f, ensure_ascii=False, indent=2,
+                  default=lambda value: value.item() if hasattr(value, "item") else str(value))
+    print("Reporte de la ejecución:", file_path)
+
 def get_db_engine():
     global namedb,userdb,passworddb,portdb,name_servicedb
     """Obtiene la instacia engine para la conexion e interaccion a la base de datos"""
+    if urldb:
+        return create_engine(urldb)
     return create_engine(
         f"postgresql+psycopg2://"
         f"{userdb}:"
@@ -38,142 +74,116 @@ def get_db_engine():
         f"{namedb}"
     )
 
-def gen_product_code(product_name="", category="", prefix="PRD"):
-    """
-    Función simple para generar código de producto único
-    """    
-    timestamp = str(int(time.time() * 1000))[-8:]  # Últimos 8 dígitos
-    random_part = ''.join(random.choices(string.ascii_uppercase + string.digits, k=4))
-    category_part = category[:3].upper() if category else "GEN"
-    name_part = product_name[:3].upper() if product_name else "PRO"
-    
-    return f"{prefix}{category_part}{name_part}{timestamp}{random_part}"
-
-def insert_into_table(df_insert: pd.DataFrame, connx_eng, table_name):
-    """Insert element into table_name given a df_input dataframe"""
-    ck_size = int(float(2097 / len(df_insert.columns)))
-    df_insert.to_sql(
-        table_name,
-        schema="public",
-        con=connx_eng,
-        chunksize=ck_size,
-        method="multi",
-        index=False,
-        if_exists="append",
-    )
-    print(f"Insertado correctamente: {table_name}.\nRegistros insertados:{len(df_insert)}")
-
 if __name__ == "__main__":
-    # Configuración de conexión
-    conn = psycopg2.connect(
-        dbname=namedb,
-        user=userdb,
-        password=passworddb,
-        host=name_servicedb,
-        port=portdb
-    )
+    if '--help' in argv:
+        print(USAGE)
+        raise SystemExit(0)
     # Crear engine de SQLAlchemy
     engine = get_db_engine()
     engine.begin()
     eng = engine.connect()
-    # Crear cursor
-    curr = conn.cursor()
     print("Conexión exitosa a la base de datos")
     try:
+        print('path:', path)
+        input_dir = os.path.join(path, 'input')
+        # Un archivo (--file=) o varios por patron (--glob=, relativo a input/)
         arg_file = [e for e in argv if '--file=' in e]
-        if arg_file:
-            file_name = arg_file[0].split('=')[1]
+        arg_glob = [e for e in argv if '--glob=' in e]
+        if arg_glob:
+            pattern = arg_glob[0].split('=', 1)[1]
+            files = sorted(glob.glob(os.path.join(input_dir, pattern)))
+            print(f"Archivos encontrados para '{pattern}':", len(files))
+        elif arg_file:
+            file_name = arg_file[0].split('=', 1)[1]
             print("Leyendo:", file_name)
+            files = [os.path.join(input_dir, file_name)]
         else:
-            print("Falta parametro --file.")
-
-        print('path:', path)
-        #Leer archivo JSON
-        file_path = os.path.join(path+'/'+'input', file_name)
-        with open(file_path, 'r', encoding='utf-8') as f:
-            data = json.load(f)
-            print("Datos leídos del archivo JSON:", len(data))
-        # Iterar productos
-        productos = []
-        # Obtener subcategorias
-        df_subcategorias = pd.read_sql_query("SELECT nombre FROM subcategorias where activo = true", eng)
-        print("Subcategorías obtenidas:", df_subcategorias.shape[0])
-        # Obtener marcas
-        df_marcas = pd.read_sql_query("SELECT nombre FROM marcas where activo = true", eng)
-        print("Marcas obtenidas:", df_marcas.shape[0])
-        # Obtener sucursales
-        df_sucursales = pd.read_sql_query("select nombre from sucursales where activo = true", eng)
-        print("Sucursales obtenidas:", df_sucursales.shape[0])
-        for obj_product in data:
-            print("Procesando producto:", obj_product["nombre_producto"]+obj_product["descripcion"])
-            # Extract id_sub_categoria
-            try:
-                id_sub_categoria = df_subcategorias[df_subcategorias['nombre'] == obj_product["sub_categoria"]].index[0] + 1
-            except IndexError:
-                print(f"Subcategoría '{obj_product['sub_categoria']}' no encontrada.")
-                print("Continuando con el siguiente producto...")
-                continue
-            print("Subcategoría encontrada: OK")
-            # Extract id_marca
-            try:
-                id_marca = df_marcas[df_marcas['nombre'] == obj_product["marca"]].index[0] + 1
-            except IndexError:
-                print(f"Marca '{obj_product['marca']}' no encontrada.")
-                print("Set marca generica")
-                id_marca = df_marcas[df_marcas['nombre'] == "Generico"].index[0] + 1
-            print("Marca encontrada: OK")
-            # Extract id_sucursal
-            try:
-                id_sucursal = df_sucursales[df_sucursales['nombre'] == obj_product["Sucursal"]].index[0] + 1
-            except IndexError:
-                print(f"Sucursal '{obj_product['Sucursal']}' no encontrada.")
-                print("Continuando con el siguiente producto...")
-                continue
-            producto = {
-                "nombre": obj_product["nombre_producto"],
-                "descripcion": obj_product["descripcion"],
-                "precio_bs": obj_product["precio_bs"],
-                "in_stock": 1 if obj_product["disponible"] is True else 0,
-                "id_sub_categoria": id_sub_categoria,
-                "id_marca": id_marca,
-                "url_supplier": obj_product["url"],
-                "views": obj_product["views"],
-                "id_sucursal": id_sucursal,
-                "activo": 1,
-                "creado_por": "admin_script",
-                "codigo": gen_product_code(product_name=obj_product["nombre_producto"], category=obj_product["sub_categoria"]),
-                "imagenes": obj_product["imagen"]
-            }
-            productos.append(producto)
-            print("Producto procesado para insertar.")
-        # Insertar productos
-        try:
-            df_productos = pd.DataFrame(productos)
-            cols_insert = df_productos.columns.tolist()
-            cols_insert.remove("imagenes")
-            insert_into_table(df_productos[cols_insert], eng, "producto")
-            eng.commit()
-        except Exception as e_insert:
-            print("Error al insertar productos:", e_insert)
-        # Insertar imagenes de productos
-        try:
-            # Obtener productos insertados
-            df_productos_insert = pd.read_sql_query("SELECT id id_producto, codigo FROM producto where activo = 1 order by id desc limit "+str(len(df_productos)), eng)
-            # Merge datos productos insert + datos imagenes
-            df_merge = pd.merge(df_productos, df_productos_insert, on="codigo", how="inner")
-            print("Productos/imagenes emparejados:", df_merge.shape[0])
-            df_product_image = df_merge.copy()
-            df_product_image = df_product_image.explode('imagenes',ignore_index=True)
-            df_product_image.rename(columns={"imagenes": "url"}, inplace=True)
-            print("Imagenes obtenidas a insertar:",len(df_product_image))
-            insert_into_table(df_product_image[["id_producto", "url","creado_por"]], eng, "imagenes")
+            print("Falta parametro --file o --glob.")
+            print(USAGE)
+            files = []
+        # Lotes de --batch-size=N registros; --stream lee el archivo de forma incremental
+        arg_batch = [e for e in argv if '--batch-size=' in e]
+        arg_workers = [e for e in argv if '--workers=' in e]
+        workers = int(arg_workers[0].split('=', 1)[1]) if arg_workers else 1
+        options = {
+            "stream": '--stream' in argv,
+            "batch_size": int(arg_batch[0].split('=', 1)[1]) if arg_batch else BATCH_SIZE,
+            # COPY FROM STDIN en PostgreSQL salvo --no-copy; --benchmark solo mide escritores
+            "use_copy": '--no-copy' not in argv,
+            "benchmark": '--benchmark' in argv,
+            # Solo productos nuevos o modificados, llave url_supplier + id_sucursal
+            "upsert": '--upsert' in argv,
+            # Omitir los registros ya confirmados segun el punto de control de cada archivo
+            "resume": '--resume' in argv,
+            # Resolver dimensiones en SQL desde una tabla de staging (solo modo insercion)
+            "staging": '--staging' in argv,
+            # Imagenes deduplicadas por url en imagen/producto_imagen en vez de imagenes
+            "dedup_images": '--dedup-images' in argv,
+        }
+        if options["stream"]:
+            print("Modo incremental, tamaño de lote:", options["batch_size"])
+        if options["staging"] and (options["upsert"] or options["benchmark"]):
+            print("--staging se ignora con --upsert o --benchmark")
+            options["staging"] = False
+        if options["staging"]:
+            print("Modo staging: dimensiones resueltas en la base de datos")
+            resolver = DimensionResolver.empty()
+        else:
+            # Cargar dimensiones una sola vez como mapas nombre -> id
+            resolver = DimensionResolver.load(eng)
+        # cProfile de toda la carga (--profile[=ruta.prof]) o de una etapa (--profile-stage=nombre)
+        arg_profile = [e for e in argv if e == '--profile' or e.startswith('--profile=')]
+        arg_profile_stage = [e for e in argv if e.startswith('--profile-stage=')]
+        profile_path = None
+        if arg_profile or arg_profile_stage:
+            profile_path = (arg_profile[0].split('=', 1)[1] if arg_profile and '=' in arg_profile[0]
+                            else f"carga_{time.strftime('%Y%m%d_%H%M%S')}.prof")
+            profile_stage = arg_profile_stage[0].split('=', 1)[1] if arg_profile_stage else None
+            if workers > 1 and len(files) > 1:
+                print("--profile solo perfila el proceso principal; los workers no se perfilan")
+            start_profile(profile_stage)
+        # Migracion del indice de busqueda (ALTER TABLE en PostgreSQL/MySQL) o
+        # reconstruccion de todo el catalogo en SQLite, antes de cargar. La nueva
+        # version del catalogo va en la misma transaccion para invalidar las caches
+        if '--reindex' in argv:
+            ensure_version_table(eng)
+            if not ensure_search_index(eng, migrate=True):
+                rebuild_search_index(eng)
+            bump_catalog_version(eng)
             eng.commit()
-        except Exception as e_insert_img:
-            print("Error al obtener productos insertados:", e_insert_img)
+        # Tablas auxiliares una sola vez, no por archivo ni por worker
+        if files and not options["benchmark"]:
+            prepare_tables(eng, options["upsert"], options["staging"], options["dedup_images"])
+            options["prepare"] = False
+        if workers > 1 and len(files) > 1:
+            print("Workers:", workers)
+            db_url = engine.url.render_as_string(hide_password=False)
+            report = run_parallel(files, db_url, resolver, workers, **options)
+        else:
+            report = new_report()
+            report["archivos"] = []
+            for file_path in files:
+                file_report = load_file(file_path, eng, resolver, **options)
+                merge_report(report, file_report)
+                report["archivos"].append(file_report)
+        if len(report["archivos"]) > 1:
+            for file_report in report["archivos"]:
+                print(f"  {os.path.basename(file_report['archivo'])}: "
+                      f"{file_report['insertados']} insertados, {file_report['rechazados']} rechazados, "
+                      f"{file_report['segundos']:.2f}s")
+        if profile_path:
+            print("Perfil guardado en:", stop_profile(profile_path))
+        print_report(report)
+        arg_run_report = [e for e in argv if '--run-report=' in e]
+        if arg_run_report:
+            write_run_report(report, arg_run_report[0].split('=', 1)[1])
+        for file_report in report["archivos"]:
+            if file_report.get("error"):
+                print(f"Carga interrumpida en {os.path.basename(file_report['archivo'])}: {file_report['error']}"
+                      " (reintentar con --resume)")
+        print("Búsquedas en dimensiones:", resolver.summary())
     except Exception as e:
         print("Error en el proceso:", e)
     finally:
-        curr.close()
-        conn.close()
         eng.close()
-        print("Conexión cerrada")
\ No newline at end of file
+        print("Conexión cerrada")
@@ -0,0 +1,87 @@
+"""
+Carga concurrente de varios archivos de productos con un pool de procesos.
+
+Cada worker abre su propio engine una sola vez; las dimensiones se leen
+una vez en el proceso principal y se envian a los workers al iniciarlos.
+"""
+
+import time
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from sqlalchemy import create_engine
+from dimensions import DimensionResolver
+from product_codes import MAX_WORKERS, PARALLEL_WORKER_ID, configured_worker_id, set_worker_id
+from pipeline import load_file, new_report, merge_report
+
+# Estado por proceso worker (engine, mapas de dimensiones, opciones de carga)
+_worker = {}
+
+
+def _init_worker(db_url, dimension_maps, options, base_worker_id, worker_counter):
+    """Inicializa el engine, las dimensiones compartidas y el id de worker para los codigos"""
+    with worker_counter.get_lock():
+        worker_counter.value += 1
+        worker_index = worker_counter.value
+    set_worker_id(base_worker_id + worker_index)
+    _worker["engine"] = create_engine(db_url)
+    _worker["maps"] = dimension_maps
+    _worker["options"] = options
+
+def _load_one(file_path):
+    """Carga un archivo dentro del worker y retorna su reporte"""
+    resolver = DimensionResolver(_worker["maps"])
+    start = time.perf_counter()
+    try:
+        with _worker["engine"].connect() as eng:
+            report = load_file(file_path, eng, resolver, **_worker["options"])
+    except Exception as e:
+        report = new_report(file_path)
+        report["segundos"] = time.perf_counter() - start
+        report["error"] = str(e)
+    report["dimensiones"] = resolver.summary()
+    return report
+
+def run_parallel(files, db_url, resolver, workers, **options):
+    """
+    Procesa `files` con `workers` procesos y retorna un reporte agregado.
+
+    `db_url` es la URL de SQLAlchemy que usa cada worker para crear su engine;
+    `options` se pasa a pipeline.load_file. Las tablas auxiliares deben
+    existir (pipeline.prepare_tables): los workers no las crean. El reporte
+    total incluye la lista `archivos` con el reporte de cada archivo.
+
+    El worker i (1..workers) genera sus codigos con el id base + i, con
+    base = LOADER_WORKER_ID o PARALLEL_WORKER_ID si no esta definido (ver
+    product_codes).
+    """
+    base_worker_id = configured_worker_id()
+    if base_worker_id is None:
+        base_worker_id = PARALLEL_WORKER_ID
+    if base_worker_id < 0 or base_worker_id + workers >= MAX_WORKERS:
+        raise ValueError(f"LOADER_WORKER_ID + workers debe ser menor que {MAX_WORKERS}")
+    options = {**options, "prepare": False}
+    total = new_report()
+    total["archivos"] = []
+    start = time.perf_counter()
+    context = multiprocessing.get_context("spawn")
+    # Cada worker toma su indice en el pool (1..workers) para el id de sus codigos
+    worker_counter = context.Value("i", 0)
+    with ProcessPoolExecutor(
+        max_workers=workers,
+        mp_context=context,
+        initializer=_init_worker,
+        initargs=(db_url, resolver.maps, options, base_worker_id, worker_counter),
+    ) as pool:
+        futures = [pool.submit(_load_one, file_path) for file_path in files]
+        for future in as_completed(futures):
+            report = future.result()
+            merge_report(total, report)
+            total["archivos"].append(report)
+            for dimension, counts in report["dimensiones"].items():
+                resolver.record(dimension, counts["hits"], counts["misses"])
+            estado = f"error: {report['error']}" if "error" in report else f"{report['insertados']} insertados"
+            print(f"Archivo {report['archivo']}: {report['leidos']} leídos, {estado}, {report['segundos']:.2f}s")
+    total["archivos"].sort(key=lambda report: report["archivo"])
+    # Tiempo real del pool; la suma por archivo queda en cada reporte
+    total["segundos"] = time.perf_counter() - start
+    return total
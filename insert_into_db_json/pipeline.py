@@ -0,0 +1,245 @@
+"""
+Flujo del cargador por archivo: lectura por lotes, transformacion e
+insercion en las tablas producto e imagenes, con un reporte de conteos.
+"""
+
+import os
+import json
+import time
+from itertools import islice
+from json_stream import iter_json_records, iter_batches
+from transform import transform_products, summarize
+from bulk_load import insert_returning_ids, benchmark_writers
+from images import ensure_image_tables, write_images
+from upsert import ensure_sync_table, upsert_products
+from checkpoint import BatchLoadError, ensure_checkpoint_table, file_fingerprint, resume_offset, save_checkpoint
+from staging import ensure_staging_tables, load_staged
+from search_index import ensure_search_index, index_products
+from catalog_version import ensure_version_table, bump_catalog_version
+from stage_timer import StageTimer, activate, stage, iter_stage, merge_stages, format_stages
+
+# Tamano de lote por defecto (con y sin --stream)
+BATCH_SIZE = 5000
+
+# Campos numericos acumulables de un reporte
+REPORT_COUNTERS = (
+    "leidos", "transformados", "rechazados", "insertados", "actualizados", "sin_cambios", "segundos",
+)
+
+
+def load_products(df_productos, eng, use_copy=True, checkpoint=None, dedup_images=False):
+    """
+    Inserta un lote de productos y sus imagenes en una sola transaccion.
+
+    Los ids de producto se obtienen del mismo INSERT, por lo que las imagenes
+    se arman sin volver a leer la tabla producto. `checkpoint` se ejecuta
+    antes del commit, dentro de la misma transaccion; si se indica, un error
+    lanza BatchLoadError en vez de continuar con el siguiente lote. Con
+    `dedup_images` las imagenes se guardan deduplicadas (ver images).
+    """
+    if df_productos.empty:
+        return 0
+    try:
+        # Insertar productos
+        with stage("producto", rows=len(df_productos)):
+            ids = insert_returning_ids(
+                df_productos.drop(columns="imagenes"), eng, "producto", use_copy
+            )
+        # Insertar imagenes de productos
+        with stage("imagenes") as etapa:
+            etapa.rows = write_images(ids, df_productos["imagenes"].to_numpy(), df_productos["creado_por"].to_numpy(),
+                                      eng, use_copy, dedup_images)
+        with stage("indice", rows=len(ids)):
+            index_products(eng, ids)
+        if checkpoint is not None:
+            checkpoint()
+        with stage("commit"):
+            eng.commit()
+        return len(ids)
+    except Exception as e_insert:
+        eng.rollback()
+        print("Error al insertar productos/imagenes:", e_insert)
+        if checkpoint is not None:
+            raise BatchLoadError(str(e_insert)) from e_insert
+        return 0
+
+def new_report(file_path=None):
+    """Reporte vacio de una carga"""
+    report = {counter: 0 for counter in REPORT_COUNTERS}
+    report.update({"archivo": file_path, "segundos": 0.0, "motivos": {}, "benchmark": {}, "etapas": {}})
+    return report
+
+def merge_report(total, report):
+    """Acumula `report` sobre `total` (conteos, motivos y benchmark)"""
+    for counter in REPORT_COUNTERS:
+        total[counter] += report[counter]
+    for motivo, n in report["motivos"].items():
+        total["motivos"][motivo] = total["motivos"].get(motivo, 0) + n
+    for writer, res in report["benchmark"].items():
+        acumulado = total["benchmark"].setdefault(writer, {"rows": 0, "seconds": 0.0})
+        acumulado["rows"] += res["rows"]
+        acumulado["seconds"] += res["seconds"]
+    merge_stages(total["etapas"], report.get("etapas", {}))
+    return total
+
+def iter_file_batches(file_path, batch_size=BATCH_SIZE, stream=False, skip=0):
+    """
+    Lotes de hasta `batch_size` registros del archivo. Con `stream` se lee
+    incrementalmente; si no, el archivo completo se carga en memoria y se
+    parte en lotes, de modo que cada lote confirma su punto de control en
+    ambos modos. Los primeros `skip` registros se omiten (reanudacion).
+    """
+    if stream:
+        # Leer productos uno a uno y agruparlos en lotes acotados
+        yield from iter_batches(islice(iter_json_records(file_path), skip, None), batch_size)
+        return
+    #Leer archivo JSON
+    with open(file_path, 'r', encoding='utf-8') as f:
+        data = json.load(f)
+    yield from iter_batches(data[skip:], batch_size)
+
+def prepare_tables(eng, upsert=False, staging=False, dedup_images=False):
+    """
+    Crea las tablas auxiliares de la carga y el indice de busqueda si no
+    existen. load_file la llama salvo con `prepare=False`; quien carga
+    varios archivos o reparte archivos entre workers la llama una vez antes
+    y pasa `prepare=False`, para que los workers no compitan al crearlas.
+    """
+    if upsert:
+        ensure_sync_table(eng)
+    if staging:
+        ensure_staging_tables(eng)
+    if dedup_images:
+        ensure_image_tables(eng)
+    ensure_checkpoint_table(eng)
+    ensure_version_table(eng)
+    ensure_search_index(eng)
+    eng.commit()
+
+def mark_batch(eng, file_path, huella, registros, lotes, escritos=True):
+    """
+    Punto de control del lote y, si el lote escribio productos (`escritos`),
+    nueva version del catalogo, dentro de la transaccion del lote: las caches
+    de lectura se invalidan al confirmarlo.
+    """
+    save_checkpoint(eng, file_path, huella, registros, lotes)
+    if escritos:
+        bump_catalog_version(eng, file_path)
+
+def load_file(file_path, eng, resolver, batch_size=BATCH_SIZE, stream=False, use_copy=True, benchmark=False,
+              upsert=False, resume=False, staging=False, dedup_images=False, prepare=True):
+    """
+    Carga un archivo de productos y retorna su reporte.
+
+    Con `upsert` solo se escriben productos nuevos o modificados (ver
+    upsert.upsert_products). Con `benchmark` no se inserta nada: cada lote
+    solo mide las rutas de escritura de producto (ver bulk_load.benchmark_writers).
+
+    Cada lote confirma tambien el punto de control del archivo (ver
+    checkpoint) y, si escribe productos, una nueva version del catalogo
+    (ver catalog_version). Con `resume` se omiten los registros ya confirmados por una
+    ejecucion anterior; si un lote falla, la carga del archivo se detiene en
+    el ultimo lote confirmado y el reporte incluye `error`.
+
+    Con `staging` (solo en modo insercion) los registros crudos se cargan
+    por la tabla de staging y las dimensiones se resuelven en SQL (ver
+    staging.load_staged); `resolver` solo acumula las estadisticas. Con
+    `dedup_images` las imagenes van a imagen/producto_imagen (ver images).
+    Con `prepare=False` se asume que prepare_tables ya se llamo.
+
+    El reporte incluye `etapas`: tiempo, CPU, filas y memoria de cada fase
+    (lectura, transformacion, escritura y sus subetapas; ver stage_timer).
+    """
+    timer = StageTimer()
+    previous = activate(timer)
+    try:
+        report = _load_file(file_path, eng, resolver, batch_size, stream, use_copy, benchmark, upsert, resume, staging,
+                            dedup_images, prepare)
+    finally:
+        activate(previous)
+    report["etapas"] = timer.report()
+    return report
+
+def _load_file(file_path, eng, resolver, batch_size, stream, use_copy, benchmark, upsert, resume, staging,
+               dedup_images, prepare):
+    """Cuerpo de load_file, medido por el timer activo"""
+    report = new_report(file_path)
+    start = time.perf_counter()
+    registros, lotes = 0, 0
+    staging = staging and not (benchmark or upsert)
+    if not benchmark:
+        if prepare:
+            prepare_tables(eng, upsert, staging, dedup_images)
+        elif staging:
+            # En SQLite y MySQL el staging es temporal: existe solo en la conexion que lo crea
+            ensure_staging_tables(eng)
+        huella = file_fingerprint(file_path)
+        if resume:
+            registros, lotes, completado = resume_offset(eng, file_path, huella)
+            if completado:
+                print(f"Archivo {os.path.basename(file_path)} ya completado; se omite")
+                report["segundos"] = time.perf_counter() - start
+                return report
+            if registros:
+                print(f"Reanudando {os.path.basename(file_path)} desde el registro {registros} (lote {lotes})")
+        report["reanudado_desde"] = registros
+        eng.commit()
+    for batch in iter_stage("lectura", iter_file_batches(file_path, batch_size, stream, skip=registros)):
+        lote = new_report()
+        lote["leidos"] = len(batch)
+        if not staging:
+            with stage("transformacion", rows=len(batch)):
+                df_productos, df_rechazados = transform_products(batch, resolver)
+                resumen_lote = summarize(df_productos, df_rechazados)
+            lote["transformados"] = resumen_lote["transformados"]
+            lote["rechazados"] = resumen_lote["rechazados"]
+            lote["motivos"] = resumen_lote["motivos"]
+        if benchmark:
+            if not df_productos.empty:
+                lote["benchmark"] = benchmark_writers(df_productos.drop(columns="imagenes"), eng, "producto")
+            merge_report(report, lote)
+            continue
+        checkpoint = lambda escritos=True, n=registros + len(batch), k=lotes + 1: mark_batch(
+            eng, file_path, huella, n, k, escritos
+        )
+        try:
+            with stage("escritura", rows=len(batch)):
+                if staging:
+                    lote.update(load_staged(batch, eng, resolver, file_path, registros, use_copy, checkpoint,
+                                            dedup_images))
+                elif df_productos.empty:
+                    # Lote sin productos validos: solo avanza el punto de control
+                    save_checkpoint(eng, file_path, huella, registros + len(batch), lotes + 1)
+                    eng.commit()
+                elif upsert:
+                    lote.update(upsert_products(df_productos, eng, use_copy, checkpoint, dedup_images))
+                else:
+                    lote["insertados"] = load_products(df_productos, eng, use_copy, checkpoint, dedup_images)
+        except BatchLoadError as e_lote:
+            report["error"] = f"lote {lotes + 1} (desde el registro {registros}): {e_lote}"
+            merge_report(report, lote)
+            break
+        registros += len(batch)
+        lotes += 1
+        merge_report(report, lote)
+    else:
+        if not benchmark:
+            save_checkpoint(eng, file_path, huella, registros, lotes, completado=True)
+            eng.commit()
+    report["segundos"] = time.perf_counter() - start
+    return report
+
+def print_report(report):
+    """Imprime el resumen de una carga"""
+    print("Total de productos leídos:", report["leidos"])
+    print("Productos transformados:", report["transformados"])
+    print("Productos rechazados:", report["rechazados"], report["motivos"])
+    print("Productos insertados:", report["insertados"])
+    if report["actualizados"] or report["sin_cambios"]:
+        print("Productos actualizados:", report["actualizados"])
+        print("Productos sin cambios:", report["sin_cambios"])
+    for writer, res in report["benchmark"].items():
+        rate = res["rows"] / res["seconds"] if res["seconds"] else 0.0
+        print(f"Benchmark {writer}: {res['rows']} filas en {res['seconds']:.3f}s ({rate:,.0f} filas/s)")
+    if report["etapas"]:
+        print(format_stages(report["etapas"]))
@@ -0,0 +1,131 @@
+"""
+Generacion en lote de codigos de producto sin colisiones.
+
+Formato: PRD + 3 letras de categoria + 3 del nombre + sufijo de 12
+caracteres en base 36. El sufijo se compone de una secuencia monotona de
+10 caracteres (microsegundos desde EPOCH_US, nunca repetida dentro del
+generador) y 2 caracteres con el id del worker, de modo que dos workers
+con ids distintos nunca producen el mismo codigo.
+
+Ids de worker:
+- una carga de un proceso usa LOADER_WORKER_ID o, si no existe, un id
+  derivado del pid en [0, PARALLEL_WORKER_ID).
+- con varios workers (parallel.run_parallel) el worker i del pool toma
+  base + i, con base = LOADER_WORKER_ID o PARALLEL_WORKER_ID por defecto,
+  de modo que no choca con los ids derivados del pid. Dos cargas con
+  workers simultaneas deben fijar LOADER_WORKER_ID con valores separados
+  al menos por su numero de workers + 1.
+"""
+
+import os
+import time
+import threading
+import numpy as np
+import pandas as pd
+
+_ALPHABET = np.frombuffer(b"0123456789ABCDEFGHIJKLMNOPQRSTUVWXYZ", dtype=np.uint8)
+
+SEQUENCE_WIDTH = 10
+WORKER_WIDTH = 2
+SUFFIX_WIDTH = SEQUENCE_WIDTH + WORKER_WIDTH
+MAX_WORKERS = 36 ** WORKER_WIDTH
+
+# Base por defecto de los ids de los workers de run_parallel; los ids
+# derivados del pid quedan por debajo
+PARALLEL_WORKER_ID = MAX_WORKERS // 2
+
+# 2024-01-01 UTC en microsegundos; 36**10 us alcanzan hasta ~2140
+EPOCH_US = 1_704_067_200_000_000
+
+
+def _base36_digits(values: np.ndarray, width: int) -> np.ndarray:
+    """Matriz (n, width) de bytes ASCII con `values` en base 36 de ancho fijo"""
+    digits = np.empty((len(values), width), dtype=np.uint8)
+    rest = values.astype(np.int64)
+    for pos in range(width - 1, -1, -1):
+        rest, digit = np.divmod(rest, 36)
+        digits[:, pos] = _ALPHABET[digit]
+    return digits
+
+def _part(value, default):
+    """Tres primeras letras en mayuscula, o `default` si el valor esta vacio"""
+    return str(value)[:3].upper() if value else default
+
+def _parts(values, default):
+    """_part por fila, calculado una vez por valor distinto"""
+    codes, uniques = pd.factorize(pd.Series(values, dtype=object))
+    # El codigo -1 (nulos) toma el ultimo elemento: el valor por defecto
+    parts = np.array([_part(value, default) for value in uniques] + [default], dtype=object)
+    return parts[codes]
+
+def configured_worker_id():
+    """Id de worker de LOADER_WORKER_ID, o None si no esta definido"""
+    env_id = os.getenv("LOADER_WORKER_ID")
+    return int(env_id) if env_id else None
+
+def default_worker_id():
+    """
+    Id de worker desde LOADER_WORKER_ID o, si no existe, derivado del pid
+    (por debajo de PARALLEL_WORKER_ID). El valor del pid puede repetirse
+    entre procesos; solo sirve para una carga de un proceso.
+    """
+    worker_id = configured_worker_id()
+    return os.getpid() % PARALLEL_WORKER_ID if worker_id is None else worker_id
+
+
+class ProductCodeGenerator:
+    """Generador de codigos unicos por worker"""
+
+    def __init__(self, worker_id=None, prefix="PRD"):
+        worker_id = default_worker_id() if worker_id is None else worker_id
+        if not 0 <= worker_id < MAX_WORKERS:
+            raise ValueError(f"worker_id debe estar entre 0 y {MAX_WORKERS - 1}")
+        self.worker_id = worker_id
+        self.prefix = prefix
+        self._worker_digits = _base36_digits(np.array([worker_id]), WORKER_WIDTH)[0]
+        self._last = -1
+        self._lock = threading.Lock()
+
+    def _reserve(self, n_codes):
+        """Reserva `n_codes` valores consecutivos de la secuencia"""
+        with self._lock:
+            now = time.time_ns() // 1000 - EPOCH_US
+            start = max(now, self._last + 1)
+            self._last = start + n_codes - 1
+        return start
+
+    def generate(self, product_names, categories):
+        """Un codigo por fila de `product_names`/`categories`"""
+        n_codes = len(product_names)
+        if n_codes == 0:
+            return []
+        start = self._reserve(n_codes)
+        suffix = np.empty((n_codes, SUFFIX_WIDTH), dtype=np.uint8)
+        suffix[:, :SEQUENCE_WIDTH] = _base36_digits(np.arange(start, start + n_codes, dtype=np.int64), SEQUENCE_WIDTH)
+        suffix[:, SEQUENCE_WIDTH:] = self._worker_digits
+        suffixes = suffix.tobytes().decode("ascii")
+        prefixes = self.prefix + _parts(categories, "GEN") + _parts(product_names, "PRO")
+        return [
+            prefix + suffixes[i * SUFFIX_WIDTH:(i + 1) * SUFFIX_WIDTH]
+            for i, prefix in enumerate(prefixes)
+        ]
+
+
+_generator = None
+
+
+def get_generator():
+    """Generador del proceso actual"""
+    global _generator
+    if _generator is None:
+        _generator = ProductCodeGenerator()
+    return _generator
+
+def set_worker_id(worker_id):
+    """Fija el id de worker del generador del proceso (p.ej. en un worker del pool)"""
+    global _generator
+    _generator = ProductCodeGenerator(worker_id)
+
+def generate_codes(product_names, categories):
+    """Genera los codigos de un lote con el generador del proceso"""
+    return get_generator().generate(product_names, categories)
@@ -0,0 +1,117 @@
+"""
+Indice de texto completo de producto (nombre y descripcion) para la API de
+busqueda (app/infrastructure/search_index.py, que usa los mismos nombres).
+
+- PostgreSQL: columna generada `busqueda` (tsvector con peso A para nombre
+  y B para descripcion) e indice GIN; la base de datos la mantiene.
+- MySQL: indice FULLTEXT (nombre, descripcion); la base de datos lo mantiene.
+- SQLite: tabla FTS5 `producto_fts` con rowid = producto.id. No se usan
+  triggers: el cargador indexa los productos de cada lote dentro de la
+  misma transaccion (index_products / index_products_after).
+
+En PostgreSQL y MySQL crear el indice reescribe la tabla producto con un
+bloqueo exclusivo, por lo que solo se hace como migracion explicita
+(`main.py --reindex`); una carga normal solo avisa si falta. La tabla FTS5
+de SQLite es aparte y se crea en cualquier carga.
+"""
+
+from sqlalchemy import inspect, text
+from bulk_load import table_schema
+
+SEARCH_TABLE = "producto_fts"
+SEARCH_COLUMN = "busqueda"
+SEARCH_INDEX = "ix_producto_busqueda"
+
+# Configuracion de texto de PostgreSQL (stemming en espanol)
+TEXT_SEARCH_CONFIG = "spanish"
+
+# Cantidad maxima de ids por sentencia
+INDEX_CHUNK = 500
+
+
+def _qualified(eng, table_name):
+    schema = table_schema(eng)
+    return f"{schema}.{table_name}" if schema else table_name
+
+def ensure_search_index(eng, migrate=False):
+    """
+    Crea el indice de texto completo del dialecto de `eng` si no existe.
+    En SQLite una tabla FTS5 nueva se llena con los productos existentes;
+    en PostgreSQL y MySQL el ALTER TABLE solo se ejecuta con `migrate`.
+    Retorna True si se creo.
+    """
+    dialect = eng.dialect.name
+    inspector = inspect(eng)
+    producto = _qualified(eng, "producto")
+    if dialect == "sqlite":
+        if inspector.has_table(SEARCH_TABLE):
+            return False
+        eng.execute(text(
+            f"CREATE VIRTUAL TABLE {SEARCH_TABLE} USING fts5("
+            "nombre, descripcion, tokenize = 'unicode61 remove_diacritics 2')"
+        ))
+        rebuild_search_index(eng)
+        return True
+    if dialect == "postgresql":
+        columns = {col["name"] for col in inspector.get_columns("producto", schema=table_schema(eng))}
+        if SEARCH_COLUMN in columns:
+            return False
+        if not migrate:
+            _warn_missing_index(dialect)
+            return False
+        eng.execute(text(
+            f"ALTER TABLE {producto} ADD COLUMN {SEARCH_COLUMN} tsvector GENERATED ALWAYS AS ("
+            f"setweight(to_tsvector('{TEXT_SEARCH_CONFIG}', coalesce(nombre, '')), 'A') || "
+            f"setweight(to_tsvector('{TEXT_SEARCH_CONFIG}', coalesce(descripcion, '')), 'B')) STORED"
+        ))
+        eng.execute(text(f"CREATE INDEX IF NOT EXISTS {SEARCH_INDEX} ON {producto} USING GIN ({SEARCH_COLUMN})"))
+        return True
+    if dialect == "mysql":
+        if any(index["name"] == SEARCH_INDEX for index in inspector.get_indexes("producto")):
+            return False
+        if not migrate:
+            _warn_missing_index(dialect)
+            return False
+        eng.execute(text(f"ALTER TABLE {producto} ADD FULLTEXT INDEX {SEARCH_INDEX} (nombre, descripcion)"))
+        return True
+    print(f"Sin indice de texto completo para el dialecto {dialect}")
+    return False
+
+def _warn_missing_index(dialect):
+    print(f"Falta el indice de busqueda en {dialect}: crearlo con main.py --reindex "
+          "(reescribe la tabla producto con bloqueo exclusivo)")
+
+def rebuild_search_index(eng):
+    """Vuelve a indexar todo el catalogo (solo SQLite; en el resto lo mantiene la base)"""
+    if eng.dialect.name != "sqlite":
+        return
+    eng.execute(text(f"DELETE FROM {SEARCH_TABLE}"))
+    result = eng.execute(text(
+        f"INSERT INTO {SEARCH_TABLE} (rowid, nombre, descripcion) SELECT id, nombre, descripcion FROM producto"
+    ))
+    eng.execute(text(f"INSERT INTO {SEARCH_TABLE} ({SEARCH_TABLE}) VALUES ('optimize')"))
+    print(f"Indice de busqueda reconstruido: {result.rowcount} productos")
+
+def index_products(eng, ids):
+    """Indexa (o reindexa, si ya estaban) los productos `ids` sin hacer commit"""
+    if eng.dialect.name != "sqlite":
+        return
+    ids = [int(i) for i in ids]
+    for start in range(0, len(ids), INDEX_CHUNK):
+        chunk = ids[start:start + INDEX_CHUNK]
+        params = {f"id_{n}": value for n, value in enumerate(chunk)}
+        placeholders = ", ".join(f":{name}" for name in params)
+        eng.execute(text(f"DELETE FROM {SEARCH_TABLE} WHERE rowid IN ({placeholders})"), params)
+        eng.execute(text(
+            f"INSERT INTO {SEARCH_TABLE} (rowid, nombre, descripcion) "
+            f"SELECT id, nombre, descripcion FROM producto WHERE id IN ({placeholders})"
+        ), params)
+
+def index_products_after(eng, id_previo):
+    """Indexa los productos con id mayor que `id_previo` (insertados por INSERT ... SELECT)"""
+    if eng.dialect.name != "sqlite":
+        return
+    eng.execute(text(
+        f"INSERT INTO {SEARCH_TABLE} (rowid, nombre, descripcion) "
+        "SELECT id, nombre, descripcion FROM producto WHERE id > :id_previo"
+    ), {"id_previo": int(id_previo)})
@@ -0,0 +1,172 @@
+"""
+Medicion por etapas de la carga.
+
+`StageTimer` acumula por etapa el tiempo de reloj y de CPU, las filas, las
+llamadas y la variacion de memoria (RSS). Las etapas se anidan: una etapa
+abierta dentro de otra se registra como `padre.hija`. Las funciones del
+cargador marcan sus fases con `stage(nombre)`, que usa el timer activo del
+proceso y no mide nada si no hay uno.
+
+Con `start_profile` se perfila con cProfile toda la ejecucion o solo las
+llamadas a una etapa.
+"""
+
+import os
+import sys
+import time
+import pstats
+import cProfile
+import resource
+from contextlib import contextmanager
+
+_PAGE_SIZE = os.sysconf("SC_PAGE_SIZE") if hasattr(os, "sysconf") else 4096
+
+# Timer del proceso y perfilador opcional (una etapa o toda la ejecucion)
+_active = None
+_profiler = None
+_profile_stage = None
+
+
+def current_rss_mb():
+    """RSS actual del proceso en MB; fuera de Linux, el maximo alcanzado"""
+    try:
+        with open("/proc/self/statm") as f:
+            return int(f.read().split()[1]) * _PAGE_SIZE / 1e6
+    except (OSError, ValueError, IndexError):
+        # ru_maxrss esta en KB en Linux y en bytes en macOS
+        scale = 1 if sys.platform == "darwin" else 1024
+        return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss * scale / 1e6
+
+
+class Stage:
+    """Etapa en curso; `rows` se puede fijar dentro del bloque"""
+
+    __slots__ = ("rows",)
+
+    def __init__(self, rows=None):
+        self.rows = rows
+
+
+def _empty_stats():
+    return {"segundos": 0.0, "cpu": 0.0, "filas": 0, "llamadas": 0, "memoria_mb": 0.0, "rss_pico_mb": 0.0}
+
+
+class StageTimer:
+    """Acumulador de tiempos por etapa"""
+
+    def __init__(self):
+        self.stats = {}
+        self._stack = []
+
+    @contextmanager
+    def stage(self, name, rows=None):
+        self._stack.append(name)
+        path = ".".join(self._stack)
+        # Se registra al abrir para que el reporte quede en orden padre -> hijas
+        stats = self.stats.setdefault(path, _empty_stats())
+        handle = Stage(rows)
+        profiling = _profiler is not None and _profile_stage in (name, path)
+        rss = current_rss_mb()
+        wall = time.perf_counter()
+        cpu = time.process_time()
+        if profiling:
+            _profiler.enable()
+        try:
+            yield handle
+        finally:
+            if profiling:
+                _profiler.disable()
+            wall = time.perf_counter() - wall
+            cpu = time.process_time() - cpu
+            rss_end = current_rss_mb()
+            self._stack.pop()
+            stats["segundos"] += wall
+            stats["cpu"] += cpu
+            stats["filas"] += int(handle.rows or 0)
+            stats["llamadas"] += 1
+            stats["memoria_mb"] += rss_end - rss
+            stats["rss_pico_mb"] = max(stats["rss_pico_mb"], rss_end)
+
+    def report(self):
+        """Estadisticas por etapa, en el orden en que se abrieron por primera vez"""
+        return {path: dict(stats) for path, stats in self.stats.items()}
+
+
+def activate(timer):
+    """Fija el timer activo del proceso y retorna el anterior"""
+    global _active
+    previous, _active = _active, timer
+    return previous
+
+@contextmanager
+def stage(name, rows=None):
+    """Etapa del timer activo; sin timer activo el bloque se ejecuta sin medir"""
+    if _active is None:
+        yield Stage(rows)
+        return
+    with _active.stage(name, rows) as handle:
+        yield handle
+
+def iter_stage(name, iterable):
+    """Itera `iterable` midiendo cada `next` como la etapa `name` (filas = len del elemento)"""
+    iterator = iter(iterable)
+    while True:
+        with stage(name) as etapa:
+            try:
+                item = next(iterator)
+            except StopIteration:
+                return
+            etapa.rows = len(item)
+        yield item
+
+def merge_stages(total, etapas):
+    """Acumula las estadisticas `etapas` sobre `total`"""
+    for path, stats in etapas.items():
+        acumulado = total.setdefault(path, _empty_stats())
+        for key in ("segundos", "cpu", "filas", "llamadas", "memoria_mb"):
+            acumulado[key] += stats[key]
+        acumulado["rss_pico_mb"] = max(acumulado["rss_pico_mb"], stats["rss_pico_mb"])
+    return total
+
+def format_stages(etapas):
+    """Tabla de texto con una linea por etapa"""
+    lines = [f"{'Etapa':<32} {'seg':>9} {'cpu':>9} {'filas':>10} {'filas/s':>11} {'mem MB':>8} {'pico MB':>8}"]
+    for path, stats in etapas.items():
+        rate = stats["filas"] / stats["segundos"] if stats["filas"] and stats["segundos"] else 0.0
+        indent = "  " * path.count(".")
+        lines.append(
+            f"{indent + path.rsplit('.', 1)[-1]:<32} {stats['segundos']:>9.3f} {stats['cpu']:>9.3f} "
+            f"{stats['filas']:>10} {rate:>11,.0f} {stats['memoria_mb']:>8.1f} {stats['rss_pico_mb']:>8.1f}"
+        )
+    return "\n".join(lines)
+
+def start_profile(stage_name=None):
+    """
+    Inicia cProfile: con `stage_name` solo se perfilan las llamadas a esa
+    etapa (nombre simple o ruta `padre.hija`), si no toda la ejecucion.
+    """
+    global _profiler, _profile_stage
+    _profiler = cProfile.Profile()
+    _profile_stage = stage_name
+    if stage_name is None:
+        _profiler.enable()
+    return _profiler
+
+def stop_profile(path, top=15):
+    """Detiene el perfilador, guarda las estadisticas en `path` e imprime las funciones mas costosas"""
+    global _profiler, _profile_stage
+    profiler, _profiler = _profiler, None
+    if profiler is None:
+        return None
+    if _profile_stage is None:
+        profiler.disable()
+    _profile_stage = None
+    try:
+        stats = pstats.Stats(profiler)
+    except TypeError:
+        # La etapa nunca se ejecuto: no hay datos
+        print("Perfil vacío: la etapa no se ejecutó")
+        return None
+    stats.dump_stats(path)
+    stats.sort_stats("cumulative").print_stats(top)
+    return path
@@ -0,0 +1,331 @@
+"""
+Carga de productos a traves de una tabla de staging.
+
+Los registros crudos del lote se copian tal cual a `producto_staging`
+(UNLOGGED en PostgreSQL, temporal en SQLite y MySQL) y las llaves foraneas
+se resuelven dentro del motor con un solo INSERT ... SELECT con joins a
+subcategorias, marcas y sucursales. La marca generica y las reglas de
+rechazo se aplican en SQL con el mismo orden que transform.transform_products,
+y los rechazos se guardan en `producto_rechazo`. Las dimensiones no se
+leen desde el cliente.
+"""
+
+import numpy as np
+import pandas as pd
+from sqlalchemy import (
+    Table, MetaData, Column, Integer, BigInteger, Float, Text, String, Boolean, DateTime,
+    select, insert, delete, func, case, and_, true, literal, exists,
+)
+from bulk_load import table_schema, supports_copy, copy_into_table, to_records
+from checkpoint import BatchLoadError, checkpoint_key
+from dimensions import MARCA_GENERICA
+from images import image_table, link_table, image_links, insert_ignore
+from product_codes import generate_codes
+import stage_timer
+from search_index import index_products_after
+from transform import (
+    RAW_COLUMNS, PRODUCT_COLUMNS, CREADO_POR, MOTIVO_SUBCATEGORIA, MOTIVO_MARCA, MOTIVO_SUCURSAL, _strict_true,
+)
+
+STAGING_TABLE = "producto_staging"
+STAGING_IMAGE_TABLE = "producto_staging_imagen"
+REJECT_TABLE = "producto_rechazo"
+
+# Columnas de producto que se copian desde el staging
+STAGED_PRODUCT_COLUMNS = [col for col in PRODUCT_COLUMNS if col != "imagenes"]
+
+
+def _staging_tables(eng):
+    """Tablas de staging de productos e imagenes para el dialecto de `eng`"""
+    metadata = MetaData()
+    # UNLOGGED evita escribir el WAL; en el resto una tabla temporal por conexion
+    prefixes = ["UNLOGGED"] if supports_copy(eng) else ["TEMPORARY"]
+    productos = Table(
+        STAGING_TABLE,
+        metadata,
+        Column("fila", BigInteger, nullable=False),
+        Column("nombre", Text),
+        Column("descripcion", Text),
+        Column("precio_bs", Float),
+        Column("in_stock", Integer),
+        Column("sub_categoria", Text),
+        Column("marca", Text),
+        Column("sucursal", Text),
+        Column("url_supplier", Text),
+        Column("views", BigInteger),
+        Column("activo", Integer),
+        Column("creado_por", Text),
+        Column("codigo", Text),
+        schema=table_schema(eng),
+        prefixes=prefixes,
+    )
+    imagenes = Table(
+        STAGING_IMAGE_TABLE,
+        metadata,
+        Column("fila", BigInteger, nullable=False),
+        Column("posicion", Integer, nullable=False),
+        Column("url", Text),
+        Column("url_hash", BigInteger),
+        schema=table_schema(eng),
+        prefixes=prefixes,
+    )
+    return productos, imagenes
+
+def _reject_table(eng):
+    return Table(
+        REJECT_TABLE,
+        MetaData(),
+        Column("id", Integer, primary_key=True),
+        Column("archivo", String(512)),
+        Column("fila", BigInteger),
+        Column("nombre", Text),
+        Column("url_supplier", Text),
+        Column("sub_categoria", Text),
+        Column("marca", Text),
+        Column("sucursal", Text),
+        Column("motivo", String(64), nullable=False),
+        Column("creado", DateTime, server_default=func.current_timestamp()),
+        schema=table_schema(eng),
+    )
+
+def ensure_staging_tables(eng):
+    """Crea las tablas de staging y producto_rechazo si no existen"""
+    for tbl in (*_staging_tables(eng), _reject_table(eng)):
+        tbl.create(eng, checkfirst=True)
+
+def _target_tables(eng):
+    """Tablas destino con solo las columnas que usa el INSERT ... SELECT"""
+    metadata = MetaData()
+    schema = table_schema(eng)
+    producto = Table(
+        "producto", metadata,
+        Column("id", Integer, primary_key=True),
+        *[Column(col) for col in STAGED_PRODUCT_COLUMNS],
+        schema=schema,
+    )
+    imagenes = Table(
+        "imagenes", metadata,
+        Column("id", Integer, primary_key=True),
+        Column("id_producto"), Column("url"), Column("creado_por"),
+        schema=schema,
+    )
+    dimensiones = {
+        table: Table(
+            table, metadata,
+            Column("id", Integer), Column("nombre", Text), Column("activo", Boolean),
+            schema=schema,
+        )
+        for table in ("subcategorias", "marcas", "sucursales")
+    }
+    return producto, imagenes, dimensiones
+
+def _dimension_ids(dimension):
+    """`nombre -> id` de las filas activas; si un nombre se repite gana el id mas bajo"""
+    return (
+        select(dimension.c.nombre, func.min(dimension.c.id).label("id"))
+        .where(dimension.c.activo == true())
+        .group_by(dimension.c.nombre)
+        .subquery()
+    )
+
+def _resolved(stage, dimensiones):
+    """Filas del staging con sus llaves foraneas resueltas y el motivo de rechazo (o NULL)"""
+    subcategoria = _dimension_ids(dimensiones["subcategorias"])
+    marca = _dimension_ids(dimensiones["marcas"])
+    sucursal = _dimension_ids(dimensiones["sucursales"])
+    marcas = dimensiones["marcas"]
+    id_generico = (
+        select(func.min(marcas.c.id))
+        .where(marcas.c.nombre == MARCA_GENERICA, marcas.c.activo == true())
+        .scalar_subquery()
+    )
+    id_marca = func.coalesce(marca.c.id, id_generico)
+    return (
+        select(
+            *stage.c,
+            subcategoria.c.id.label("id_sub_categoria"),
+            id_marca.label("id_marca"),
+            sucursal.c.id.label("id_sucursal"),
+            marca.c.id.label("id_marca_exacta"),
+            case(
+                (subcategoria.c.id.is_(None), MOTIVO_SUBCATEGORIA),
+                (id_marca.is_(None), MOTIVO_MARCA),
+                (sucursal.c.id.is_(None), MOTIVO_SUCURSAL),
+                else_=None,
+            ).label("motivo"),
+        )
+        .select_from(
+            stage
+            .outerjoin(subcategoria, subcategoria.c.nombre == stage.c.sub_categoria)
+            .outerjoin(marca, marca.c.nombre == stage.c.marca)
+            .outerjoin(sucursal, sucursal.c.nombre == stage.c.sucursal)
+        )
+        .subquery("resuelto")
+    )
+
+def stage_frames(batch, first_row=0, dedup_images=False):
+    """
+    Filas de staging de productos e imagenes (`fila`, `posicion`, `url`) de
+    un lote; `fila` es la posicion del registro en el archivo. Con
+    `dedup_images` las urls se normalizan y se agrega `url_hash`.
+    """
+    df_raw = pd.DataFrame.from_records(batch, columns=RAW_COLUMNS) if len(batch) else pd.DataFrame(columns=RAW_COLUMNS)
+    fila = np.arange(first_row, first_row + len(df_raw), dtype=np.int64)
+    df_stage = pd.DataFrame({
+        "fila": fila,
+        "nombre": df_raw["nombre_producto"],
+        "descripcion": df_raw["descripcion"],
+        "precio_bs": df_raw["precio_bs"],
+        "in_stock": _strict_true(df_raw["disponible"]).astype(int),
+        "sub_categoria": df_raw["sub_categoria"],
+        "marca": df_raw["marca"],
+        "sucursal": df_raw["Sucursal"],
+        "url_supplier": df_raw["url"],
+        "views": df_raw["views"],
+        "activo": 1,
+        "creado_por": CREADO_POR,
+        "codigo": generate_codes(df_raw["nombre_producto"].to_numpy(), df_raw["sub_categoria"].to_numpy()),
+    })
+    # Solo (fila, url): no se copian las columnas del producto por imagen
+    if dedup_images:
+        df_imagenes = image_links(fila, df_raw["imagen"].to_numpy()).rename(columns={"id_producto": "fila"})
+        return df_stage, df_imagenes[["fila", "posicion", "url", "url_hash"]]
+    df_imagenes = pd.DataFrame({"fila": fila, "url": df_raw["imagen"]}).explode("url").dropna(subset=["url"])
+    df_imagenes.insert(1, "posicion", df_imagenes.groupby("fila").cumcount())
+    return df_stage, df_imagenes.reset_index(drop=True)
+
+def _write_stage(df_stage, tbl, eng, use_copy):
+    if df_stage.empty:
+        return
+    if use_copy and supports_copy(eng):
+        copy_into_table(df_stage, eng, tbl.name)
+    else:
+        eng.execute(insert(tbl), to_records(df_stage))
+
+def _insert_staged_images(eng, stage, stage_imagenes, producto, imagenes, id_previo, dedup_images):
+    """Imagenes de los productos recien insertados, enlazados por su codigo"""
+    insertados = (
+        stage_imagenes
+        .join(stage, stage.c.fila == stage_imagenes.c.fila)
+        .join(producto, and_(producto.c.codigo == stage.c.codigo, producto.c.id > id_previo))
+    )
+    if not dedup_images:
+        result = eng.execute(insert(imagenes).from_select(
+            ["id_producto", "url", "creado_por"],
+            select(producto.c.id, stage_imagenes.c.url, producto.c.creado_por)
+            .select_from(insertados)
+            .order_by(stage_imagenes.c.fila, stage_imagenes.c.posicion),
+        ))
+        print(f"Insertado correctamente: imagenes.\nRegistros insertados:{result.rowcount}")
+        return
+    # Cada url una sola vez: solo las que aun no estan en imagen
+    imagen = image_table(eng)
+    result = eng.execute(insert_ignore(imagen, eng).from_select(
+        ["url_hash", "url", "creado_por"],
+        select(stage_imagenes.c.url_hash, func.min(stage_imagenes.c.url), func.min(producto.c.creado_por))
+        .select_from(insertados)
+        .where(~exists().where(imagen.c.url_hash == stage_imagenes.c.url_hash))
+        .group_by(stage_imagenes.c.url_hash),
+    ))
+    print(f"Insertado correctamente: imagen.\nRegistros insertados:{result.rowcount}")
+    result = eng.execute(insert(link_table(eng)).from_select(
+        ["id_producto", "url_hash", "posicion"],
+        select(producto.c.id, stage_imagenes.c.url_hash, stage_imagenes.c.posicion).select_from(insertados),
+    ))
+    print(f"Insertado correctamente: producto_imagen.\nRegistros insertados:{result.rowcount}")
+
+def _load_staged(batch, eng, resolver, file_path, first_row, use_copy, dedup_images):
+    """Cuerpo de load_staged, sin manejo de transaccion"""
+    stage, stage_imagenes = _staging_tables(eng)
+    producto, imagenes, dimensiones = _target_tables(eng)
+    rechazo = _reject_table(eng)
+    lote = {"transformados": 0, "rechazados": 0, "motivos": {}, "insertados": 0}
+
+    with stage_timer.stage("preparacion", rows=len(batch)):
+        df_stage, df_imagenes = stage_frames(batch, first_row, dedup_images)
+    with stage_timer.stage("copia", rows=len(df_stage) + len(df_imagenes)):
+        _write_stage(df_stage, stage, eng, use_copy)
+        _write_stage(df_imagenes, stage_imagenes, eng, use_copy)
+
+    resuelto = _resolved(stage, dimensiones)
+    # Rechazos primero: la primera sentencia sobre las tablas reales es una
+    # escritura (en SQLite un lector no puede subir a escritor si otro escribe)
+    columnas = ["fila", "nombre", "url_supplier", "sub_categoria", "marca", "sucursal", "motivo"]
+    with stage_timer.stage("rechazos"):
+        eng.execute(insert(rechazo).from_select(
+            ["archivo", *columnas],
+            select(literal(checkpoint_key(file_path) if file_path else None, String), *[resuelto.c[col] for col in columnas])
+            .where(resuelto.c.motivo.is_not(None)),
+        ))
+
+    # Los ids nuevos son mayores que el maximo actual; junto con el codigo
+    # (unico por producto) permiten enlazar las imagenes sin otra consulta
+    with stage_timer.stage("producto") as etapa:
+        id_previo = eng.execute(select(func.coalesce(func.max(producto.c.id), 0))).scalar()
+        result = eng.execute(insert(producto).from_select(
+            STAGED_PRODUCT_COLUMNS,
+            select(*[resuelto.c[col] for col in STAGED_PRODUCT_COLUMNS])
+            .where(resuelto.c.motivo.is_(None))
+            .order_by(resuelto.c.fila),
+        ))
+        lote["insertados"] = etapa.rows = result.rowcount
+    print(f"Insertado correctamente: producto.\nRegistros insertados:{result.rowcount}")
+    if lote["insertados"]:
+        with stage_timer.stage("imagenes", rows=len(df_imagenes)):
+            _insert_staged_images(eng, stage, stage_imagenes, producto, imagenes, id_previo, dedup_images)
+        with stage_timer.stage("indice", rows=lote["insertados"]):
+            index_products_after(eng, id_previo)
+
+    # Conteos por motivo y aciertos por dimension en una sola consulta
+    with stage_timer.stage("conteos"):
+        conteos = eng.execute(
+            select(
+                resuelto.c.motivo,
+                func.count(),
+                func.count(resuelto.c.id_sub_categoria),
+                func.count(resuelto.c.id_marca_exacta),
+                func.count(resuelto.c.id_sucursal),
+            ).group_by(resuelto.c.motivo)
+        ).all()
+    aciertos = np.zeros(3, dtype=np.int64)
+    for motivo, n, *hits in conteos:
+        aciertos += hits
+        if motivo is None:
+            lote["transformados"] = n
+        else:
+            lote["motivos"][motivo] = n
+            lote["rechazados"] += n
+    if resolver is not None:
+        for dimension, hits in zip(("subcategoria", "marca", "sucursal"), aciertos):
+            resolver.record(dimension, hits, len(df_stage) - hits)
+
+    eng.execute(delete(stage_imagenes))
+    eng.execute(delete(stage))
+    return lote
+
+def load_staged(batch, eng, resolver=None, file_path=None, first_row=0, use_copy=True, checkpoint=None,
+                dedup_images=False):
+    """
+    Carga un lote de registros crudos resolviendo las dimensiones en SQL.
+
+    Retorna los conteos del lote (transformados, rechazados, motivos e
+    insertados); los rechazos guardan `file_path` y la posicion del registro
+    en el archivo, contando desde `first_row`. Todo el lote, incluido
+    `checkpoint`, se confirma en una sola transaccion; si se indica
+    `checkpoint`, un error lanza BatchLoadError en vez de continuar con el
+    siguiente lote. Con
+    `dedup_images` las imagenes van a imagen/producto_imagen (ver images).
+    """
+    try:
+        lote = _load_staged(batch, eng, resolver, file_path, first_row, use_copy, dedup_images)
+        if checkpoint is not None:
+            checkpoint(escritos=lote["insertados"] > 0)
+        with stage_timer.stage("commit"):
+            eng.commit()
+        return lote
+    except Exception as e_staging:
+        eng.rollback()
+        print("Error en la carga por staging:", e_staging)
+        if checkpoint is not None:
+            raise BatchLoadError(str(e_staging)) from e_staging
+        return {"transformados": 0, "rechazados": 0, "motivos": {}, "insertados": 0}
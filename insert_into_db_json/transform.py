@@ -0,0 +1,109 @@
+"""
+Transformacion columnar de los registros JSON a filas de producto.
+
+Un lote de registros se convierte en un solo DataFrame; las llaves
+foraneas se resuelven con merges contra las dimensiones y el resto de
+columnas se deriva con operaciones sobre columnas completas.
+"""
+
+import numpy as np
+import pandas as pd
+from dimensions import MARCA_GENERICA
+from product_codes import generate_codes
+from stage_timer import stage
+
+# Campos esperados en cada registro del archivo de entrada
+RAW_COLUMNS = [
+    "nombre_producto", "descripcion", "views", "precio_bs", "disponible",
+    "sub_categoria", "marca", "Sucursal", "imagen", "url",
+]
+
+# Columnas del DataFrame de productos, en el orden de insercion
+PRODUCT_COLUMNS = [
+    "nombre", "descripcion", "precio_bs", "in_stock", "id_sub_categoria",
+    "id_marca", "url_supplier", "views", "id_sucursal", "activo",
+    "creado_por", "codigo", "imagenes",
+]
+
+CREADO_POR = "admin_script"
+
+# Motivos de rechazo
+MOTIVO_SUBCATEGORIA = "subcategoria_no_encontrada"
+MOTIVO_MARCA = "marca_no_encontrada"
+MOTIVO_SUCURSAL = "sucursal_no_encontrada"
+
+
+def _strict_true(serie: pd.Series) -> np.ndarray:
+    """Equivalente columnar de `valor is True`"""
+    if pd.api.types.is_bool_dtype(serie):
+        return serie.fillna(False).to_numpy(dtype=bool)
+    return np.fromiter((valor is True for valor in serie), dtype=bool, count=len(serie))
+
+def transform_products(data, resolver):
+    """
+    Transforma un lote de registros en productos listos para insertar.
+
+    Retorna (df_productos, df_rechazados). `df_rechazados` conserva las
+    columnas originales del registro mas la columna `motivo`.
+    """
+    with stage("dataframe", rows=len(data)):
+        df_raw = pd.DataFrame.from_records(data, columns=RAW_COLUMNS) if len(data) else pd.DataFrame(columns=RAW_COLUMNS)
+
+    # Resolver llaves foraneas con merges contra las dimensiones
+    with stage("dimensiones", rows=len(df_raw)):
+        df = df_raw.merge(
+            resolver.frame("subcategoria", "sub_categoria", "id_sub_categoria"), on="sub_categoria", how="left"
+        ).merge(
+            resolver.frame("marca", "marca", "id_marca"), on="marca", how="left"
+        ).merge(
+            resolver.frame("sucursal", "Sucursal", "id_sucursal"), on="Sucursal", how="left"
+        )
+    falta_subcategoria = df["id_sub_categoria"].isna().to_numpy()
+    falta_marca = df["id_marca"].isna().to_numpy()
+    falta_sucursal = df["id_sucursal"].isna().to_numpy()
+    resolver.record("subcategoria", (~falta_subcategoria).sum(), falta_subcategoria.sum())
+    resolver.record("marca", (~falta_marca).sum(), falta_marca.sum())
+    resolver.record("sucursal", (~falta_sucursal).sum(), falta_sucursal.sum())
+
+    # Marca desconocida: usar la marca generica si existe
+    id_generico = resolver.maps["marca"].get(MARCA_GENERICA)
+    if id_generico is not None:
+        df["id_marca"] = df["id_marca"].fillna(id_generico)
+        falta_marca = np.zeros(len(df), dtype=bool)
+
+    # Rechazos, en el mismo orden de validacion que el flujo original
+    motivo = np.select(
+        [falta_subcategoria, falta_marca, falta_sucursal],
+        [MOTIVO_SUBCATEGORIA, MOTIVO_MARCA, MOTIVO_SUCURSAL],
+        default="",
+    )
+    rechazado = motivo != ""
+    df_rechazados = df_raw.loc[rechazado].assign(motivo=motivo[rechazado]).reset_index(drop=True)
+
+    df = df.loc[~rechazado].reset_index(drop=True)
+    with stage("codigos", rows=len(df)):
+        codigos = generate_codes(df["nombre_producto"].to_numpy(), df["sub_categoria"].to_numpy())
+    df_productos = pd.DataFrame({
+        "nombre": df["nombre_producto"],
+        "descripcion": df["descripcion"],
+        "precio_bs": df["precio_bs"],
+        "in_stock": _strict_true(df["disponible"]).astype(int),
+        "id_sub_categoria": df["id_sub_categoria"],
+        "id_marca": df["id_marca"],
+        "url_supplier": df["url"],
+        "views": df["views"],
+        "id_sucursal": df["id_sucursal"],
+        "activo": 1,
+        "creado_por": CREADO_POR,
+        "codigo": codigos,
+        "imagenes": df["imagen"],
+    }, columns=PRODUCT_COLUMNS)
+    return df_productos, df_rechazados
+
+def summarize(df_productos, df_rechazados):
+    """Conteos del lote para el reporte de consola"""
+    return {
+        "transformados": len(df_productos),
+        "rechazados": len(df_rechazados),
+        "motivos": df_rechazados["motivo"].value_counts().to_dict() if len(df_rechazados) else {},
+    }
@@ -0,0 +1,269 @@
+"""
+Carga incremental e idempotente de productos.
+
+Cada producto se identifica por su llave natural (`url_supplier`,
+`id_sucursal`). La tabla `producto_sync` guarda, por llave, el id del
+producto y un hash del contenido; en cada lote solo se escriben los
+productos nuevos o cuyo hash cambio. Al crear `producto_sync` se llena con
+los productos que ya estan en `producto`, para que el primer upsert sobre
+un catalogo existente no los vuelva a insertar.
+"""
+
+import numpy as np
+import pandas as pd
+from sqlalchemy import Table, MetaData, Column, Integer, BigInteger, Text, select, update, delete, bindparam, inspect
+from sqlalchemy.dialects import postgresql, sqlite, mysql
+from bulk_load import table_schema, to_records, insert_returning_ids
+from checkpoint import BatchLoadError
+from images import LINK_TABLE, write_images
+from search_index import index_products
+from stage_timer import stage
+
+SYNC_TABLE = "producto_sync"
+
+# Columnas que definen el contenido de un producto
+HASH_TEXT_COLUMNS = ["nombre", "descripcion"]
+HASH_NUMERIC_COLUMNS = ["precio_bs", "in_stock", "id_sub_categoria", "id_marca", "views"]
+
+# Columnas de producto que se actualizan cuando cambia el contenido
+UPDATE_COLUMNS = [
+    "nombre", "descripcion", "precio_bs", "in_stock", "id_sub_categoria",
+    "id_marca", "views", "activo",
+]
+
+# Cantidad maxima de llaves por consulta IN
+LOOKUP_CHUNK = 500
+
+# Productos por consulta al inicializar producto_sync
+BACKFILL_CHUNK = 5000
+
+# Dialectos con INSERT ... ON CONFLICT
+_ON_CONFLICT_DIALECTS = {"postgresql": postgresql, "sqlite": sqlite}
+
+
+def _sync_table(eng):
+    return Table(
+        SYNC_TABLE,
+        MetaData(),
+        Column("id_sucursal", BigInteger, primary_key=True, autoincrement=False),
+        Column("clave", BigInteger, primary_key=True, autoincrement=False),
+        Column("id_producto", BigInteger, nullable=False),
+        Column("hash_contenido", BigInteger, nullable=False),
+        schema=table_schema(eng),
+    )
+
+def ensure_sync_table(eng):
+    """Crea la tabla producto_sync si no existe y la llena desde producto (sin commit)"""
+    if inspect(eng).has_table(SYNC_TABLE, schema=table_schema(eng)):
+        return
+    _sync_table(eng).create(eng)
+    filas = backfill_sync_table(eng)
+    print(f"{SYNC_TABLE} inicializada con {filas} productos existentes")
+
+def _stored_images(eng, id_desde, id_hasta):
+    """Urls de la tabla imagenes por producto, en orden de insercion"""
+    if not inspect(eng).has_table("imagenes", schema=table_schema(eng)):
+        return {}
+    imagenes = Table(
+        "imagenes", MetaData(),
+        Column("id", Integer), Column("id_producto", Integer), Column("url", Text),
+        schema=table_schema(eng),
+    )
+    rows = eng.execute(
+        select(imagenes.c.id_producto, imagenes.c.url)
+        .where(imagenes.c.id_producto.between(id_desde, id_hasta))
+        .order_by(imagenes.c.id)
+    ).all()
+    urls = {}
+    for id_producto, url in rows:
+        urls.setdefault(id_producto, []).append(url)
+    return urls
+
+def backfill_sync_table(eng):
+    """
+    Llena producto_sync con la llave natural, el id y el hash del contenido
+    de los productos existentes, por bloques de id; si una llave se repite
+    gana el id mayor. Las imagenes se leen de la tabla imagenes: si el hash
+    no coincide con el del feed (p.ej. imagenes deduplicadas, que guardan la
+    url normalizada) el primer upsert actualiza el producto, sin duplicarlo.
+    Retorna los productos leidos; no hace commit.
+    """
+    producto = Table(
+        "producto", MetaData(),
+        Column("id", Integer),
+        *[Column(col) for col in ("url_supplier", "id_sucursal", *HASH_TEXT_COLUMNS, *HASH_NUMERIC_COLUMNS)],
+        schema=table_schema(eng),
+    )
+    total, ultimo_id = 0, None
+    while True:
+        stmt = (
+            select(producto)
+            .where(producto.c.url_supplier.isnot(None), producto.c.id_sucursal.isnot(None))
+            .order_by(producto.c.id)
+            .limit(BACKFILL_CHUNK)
+        )
+        if ultimo_id is not None:
+            stmt = stmt.where(producto.c.id > ultimo_id)
+        df = pd.DataFrame(eng.execute(stmt).mappings().all())
+        if df.empty:
+            return total
+        ultimo_id = int(df["id"].iloc[-1])
+        total += len(df)
+        urls = _stored_images(eng, int(df["id"].iloc[0]), ultimo_id)
+        df["imagenes"] = [urls.get(id_producto, []) for id_producto in df["id"]]
+        df = df.assign(
+            clave=natural_keys(df),
+            hash_contenido=content_hashes(df),
+            id_sucursal=df["id_sucursal"].astype("int64"),
+            id_producto=df["id"].astype("int64"),
+        ).drop_duplicates(subset=["id_sucursal", "clave"], keep="last")
+        # Los bloques van en orden de id: el upsert deja el id mayor de cada llave
+        _upsert_sync(eng, df)
+
+def _hash64(frame: pd.DataFrame) -> np.ndarray:
+    """Hash de 64 bits por fila, estable entre ejecuciones"""
+    return pd.util.hash_pandas_object(frame, index=False).to_numpy().view(np.int64)
+
+def natural_keys(df_productos: pd.DataFrame) -> np.ndarray:
+    """Hash de la url del proveedor; junto con id_sucursal forma la llave natural"""
+    return _hash64(df_productos[["url_supplier"]].astype(object).fillna(""))
+
+def content_hashes(df_productos: pd.DataFrame) -> np.ndarray:
+    """Hash del contenido normalizado (los numericos se comparan como float64)"""
+    canonical = pd.DataFrame({
+        **{col: df_productos[col].astype(object).fillna("") for col in HASH_TEXT_COLUMNS},
+        **{col: pd.to_numeric(df_productos[col], errors="coerce").astype("float64") for col in HASH_NUMERIC_COLUMNS},
+        "imagenes": df_productos["imagenes"].astype(str),
+    })
+    return _hash64(canonical)
+
+def fetch_sync_state(eng, claves) -> pd.DataFrame:
+    """Estado guardado (id_producto, hash_contenido) de las llaves del lote"""
+    tbl = _sync_table(eng)
+    unique_claves = np.unique(claves).tolist()
+    rows = []
+    for start in range(0, len(unique_claves), LOOKUP_CHUNK):
+        chunk = unique_claves[start:start + LOOKUP_CHUNK]
+        rows.extend(eng.execute(
+            select(tbl.c.id_sucursal, tbl.c.clave, tbl.c.id_producto, tbl.c.hash_contenido)
+            .where(tbl.c.clave.in_(chunk))
+        ).all())
+    return pd.DataFrame(rows, columns=["id_sucursal", "clave", "id_producto", "hash_guardado"], dtype="int64")
+
+def _upsert_sync(eng, df_sync: pd.DataFrame):
+    """Inserta o actualiza filas de producto_sync con ON CONFLICT / ON DUPLICATE KEY"""
+    if df_sync.empty:
+        return
+    tbl = _sync_table(eng)
+    rows = to_records(df_sync[["id_sucursal", "clave", "id_producto", "hash_contenido"]])
+    dialect = eng.dialect.name
+    if dialect in _ON_CONFLICT_DIALECTS:
+        stmt = _ON_CONFLICT_DIALECTS[dialect].insert(tbl)
+        stmt = stmt.on_conflict_do_update(
+            index_elements=["id_sucursal", "clave"],
+            set_={"id_producto": stmt.excluded.id_producto, "hash_contenido": stmt.excluded.hash_contenido},
+        )
+    elif dialect == "mysql":
+        stmt = mysql.insert(tbl)
+        stmt = stmt.on_duplicate_key_update(
+            id_producto=stmt.inserted.id_producto, hash_contenido=stmt.inserted.hash_contenido
+        )
+    else:
+        # Sin upsert nativo: reemplazar las llaves del lote
+        eng.execute(
+            delete(tbl).where(tbl.c.id_sucursal == bindparam("b_sucursal"), tbl.c.clave == bindparam("b_clave")),
+            [{"b_sucursal": row["id_sucursal"], "b_clave": row["clave"]} for row in rows],
+        )
+        stmt = tbl.insert()
+    eng.execute(stmt, rows)
+
+def _update_products(eng, df_cambiados: pd.DataFrame, dedup_images=False):
+    """UPDATE de producto por id para las filas cuyo contenido cambio"""
+    tbl = Table(
+        "producto",
+        MetaData(),
+        Column("id", Integer, primary_key=True),
+        *[Column(col) for col in UPDATE_COLUMNS],
+        schema=table_schema(eng),
+    )
+    rows = to_records(df_cambiados[UPDATE_COLUMNS].assign(b_id=df_cambiados["id_producto"]))
+    eng.execute(update(tbl).where(tbl.c.id == bindparam("b_id")), rows)
+    # Reemplazar las imagenes (o sus enlaces) de los productos actualizados
+    imagenes = Table(
+        LINK_TABLE if dedup_images else "imagenes", MetaData(), Column("id_producto", Integer), schema=table_schema(eng)
+    )
+    ids = df_cambiados["id_producto"].tolist()
+    for start in range(0, len(ids), LOOKUP_CHUNK):
+        eng.execute(delete(imagenes).where(imagenes.c.id_producto.in_(ids[start:start + LOOKUP_CHUNK])))
+
+def upsert_products(df_productos: pd.DataFrame, eng, use_copy=True, checkpoint=None, dedup_images=False):
+    """
+    Carga un lote en modo upsert y retorna los conteos del lote.
+
+    Productos con llave desconocida se insertan; con llave conocida y hash
+    distinto se actualizan (incluidas sus imagenes); el resto se omite. Si
+    una llave se repite dentro del lote gana la ultima aparicion.
+
+    `checkpoint(escritos)` se ejecuta antes del commit, dentro de la misma
+    transaccion, con `escritos` falso si el lote no cambio nada; si se
+    indica, un error lanza BatchLoadError en vez de continuar. Con
+    `dedup_images` se reemplazan los enlaces de producto_imagen (ver images).
+    """
+    conteos = {"insertados": 0, "actualizados": 0, "sin_cambios": 0}
+    if df_productos.empty:
+        return conteos
+    try:
+        with stage("hash", rows=len(df_productos)):
+            df = df_productos.assign(
+                clave=natural_keys(df_productos),
+                hash_contenido=content_hashes(df_productos),
+                id_sucursal=df_productos["id_sucursal"].astype("int64"),
+            ).drop_duplicates(subset=["id_sucursal", "clave"], keep="last")
+        with stage("consulta", rows=len(df)):
+            # Int64 admite nulos: el merge no pasa los hashes a float64, que pierde precision
+            estado = fetch_sync_state(eng, df["clave"].to_numpy()).astype(
+                {"id_producto": "Int64", "hash_guardado": "Int64"}
+            )
+            df = df.merge(estado, on=["id_sucursal", "clave"], how="left")
+
+        nuevo = df["id_producto"].isna().to_numpy()
+        df_nuevos = df.loc[nuevo].drop(columns=["id_producto", "hash_guardado"]).reset_index(drop=True)
+        df_existentes = df.loc[~nuevo].astype({"id_producto": "int64", "hash_guardado": "int64"})
+        cambiado = df_existentes["hash_guardado"].to_numpy() != df_existentes["hash_contenido"].to_numpy()
+        df_cambiados = df_existentes.loc[cambiado].reset_index(drop=True)
+        sin_cambios = int((~cambiado).sum())
+
+        if not df_nuevos.empty:
+            with stage("producto", rows=len(df_nuevos)):
+                df_nuevos["id_producto"] = insert_returning_ids(
+                    df_nuevos[df_productos.columns].drop(columns="imagenes"), eng, "producto", use_copy
+                )
+            with stage("imagenes") as etapa:
+                etapa.rows = write_images(df_nuevos["id_producto"].to_numpy(), df_nuevos["imagenes"].to_numpy(),
+                                          df_nuevos["creado_por"].to_numpy(), eng, use_copy, dedup_images)
+        if not df_cambiados.empty:
+            with stage("actualizacion", rows=len(df_cambiados)):
+                _update_products(eng, df_cambiados, dedup_images)
+            with stage("imagenes") as etapa:
+                etapa.rows = write_images(df_cambiados["id_producto"].to_numpy(),
+                                          df_cambiados["imagenes"].to_numpy(), df_cambiados["creado_por"].to_numpy(),
+                                          eng, use_copy, dedup_images)
+        df_escritos = pd.concat([df_nuevos, df_cambiados], ignore_index=True).astype({"id_producto": "int64"})
+        with stage("indice", rows=len(df_escritos)):
+            index_products(eng, df_escritos["id_producto"].to_numpy())
+        with stage("sync"):
+            _upsert_sync(eng, df_escritos)
+        if checkpoint is not None:
+            # Un lote sin cambios no invalida las caches de lectura
+            checkpoint(escritos=not df_escritos.empty)
+        with stage("commit"):
+            eng.commit()
+        conteos.update(insertados=len(df_nuevos), actualizados=len(df_cambiados), sin_cambios=sin_cambios)
+        print(f"Upsert: {conteos['insertados']} nuevos, {conteos['actualizados']} actualizados, "
+              f"{conteos['sin_cambios']} sin cambios")
+    except Exception as e_upsert:
+        eng.rollback()
+        print("Error en upsert de productos:", e_upsert)
+        if checkpoint is not None:
+            raise BatchLoadError(str(e_upsert)) from e_upsert
+    return conteos
@@ -0,0 +1,82 @@
+"""
+Fixtures comunes: base SQLite temporal con las tablas del catálogo y acceso
+a los módulos del cargador (insert_into_db_json usa imports planos).
+"""
+
+import os
+import sys
+import json
+import sqlite3
+import pytest
+from fastapi.testclient import TestClient
+from sqlalchemy import create_engine
+
+LOADER_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "insert_into_db_json")
+if LOADER_DIR not in sys.path:
+    sys.path.insert(0, LOADER_DIR)
+
+CATALOG_DDL = """
+CREATE TABLE subcategorias (id INTEGER PRIMARY KEY AUTOINCREMENT, nombre TEXT, activo BOOLEAN DEFAULT 1);
+CREATE TABLE marcas (id INTEGER PRIMARY KEY AUTOINCREMENT, nombre TEXT, activo BOOLEAN DEFAULT 1);
+CREATE TABLE sucursales (id INTEGER PRIMARY KEY AUTOINCREMENT, nombre TEXT, activo BOOLEAN DEFAULT 1);
+CREATE TABLE producto (
+    id INTEGER PRIMARY KEY AUTOINCREMENT, nombre TEXT, descripcion TEXT, precio_bs REAL, in_stock INTEGER,
+    id_sub_categoria INTEGER, id_marca INTEGER, url_supplier TEXT, views INTEGER, id_sucursal INTEGER,
+    activo INTEGER, creado_por TEXT, codigo TEXT
+);
+CREATE TABLE imagenes (id INTEGER PRIMARY KEY AUTOINCREMENT, id_producto INTEGER, url TEXT, creado_por TEXT);
+"""
+
+DIMENSIONES = {
+    "subcategorias": ["Vitaminas", "Analgesicos"],
+    "marcas": ["Generico", "Laboratorios Farma"],
+    "sucursales": ["Farmatodo Centro"],
+}
+
+
+@pytest.fixture
+def catalog_db(tmp_path):
+    """Ruta de una base SQLite con las tablas del catálogo y sus dimensiones"""
+    path = str(tmp_path / "catalogo.db")
+    con = sqlite3.connect(path)
+    con.executescript(CATALOG_DDL)
+    for table, nombres in DIMENSIONES.items():
+        con.executemany(f"INSERT INTO {table} (nombre) VALUES (?)", [(nombre,) for nombre in nombres])
+    con.commit()
+    con.close()
+    return path
+
+
+@pytest.fixture
+def loader_eng(catalog_db):
+    """Conexión de SQLAlchemy como la que usa el cargador"""
+    engine = create_engine(f"sqlite:///{catalog_db}")
+    with engine.connect() as eng:
+        yield eng
+    engine.dispose()
+
+
+@pytest.fixture
+def write_products(tmp_path):
+    """Escribe registros como archivo JSON de entrada y retorna su ruta"""
+    def write(records, name="productos.json"):
+        path = tmp_path / name
+        path.write_text(json.dumps(records), encoding="utf-8")
+        return str(path)
+    return write
+
+
+@pytest.fixture
+def api_client(catalog_db, monkeypatch):
+    """Cliente de la API sobre la base temporal, con la caché de búsqueda reiniciada"""
+    from app.main import app
+    from app.infrastructure import session
+    from app.infrastructure.database_strategies import SQLiteStrategy, AsyncSQLiteStrategy
+    from app.infrastructure.search_cache import close_search_cache
+
+    monkeypatch.setattr(session, "_db_strategy", SQLiteStrategy(db_path=catalog_db))
+    monkeypatch.setattr(session, "_async_db_strategy", AsyncSQLiteStrategy(db_path=catalog_db))
+    close_search_cache()
+    with TestClient(app) as client:
+        yield client
+    close_search_cache()
@@ -0,0 +1,21 @@
+"""Registros de entrada del cargador para las pruebas"""
+
+
+def make_products(n, start=0, **overrides):
+    """Registros de entrada del cargador, con una url distinta por producto"""
+    return [
+        {
+            "nombre_producto": f"Vitamina {i}",
+            "descripcion": f"Suplemento de vitamina numero {i}",
+            "views": i,
+            "precio_bs": 100.0 + i,
+            "disponible": True,
+            "sub_categoria": "Vitaminas",
+            "marca": "Laboratorios Farma",
+            "Sucursal": "Farmatodo Centro",
+            "imagen": [f"https://img.example.com/{i}.jpg"],
+            "url": f"https://tienda.example.com/producto/{i}",
+            **overrides,
+        }
+        for i in range(start, start + n)
+    ]
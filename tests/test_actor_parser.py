@@ -0,0 +1,38 @@
+"""
+parse_actor_string da el mismo resultado que la implementación original
+basada en ast.literal_eval (benchmarks/bench_actor_parser.py), incluidos
+los comentarios '#' y el form feed que cambian cómo se lee un literal.
+"""
+
+import random
+import pytest
+from app.infrastructure.actor_parser import parse_actor_string
+from benchmarks.bench_actor_parser import EDGE_CASES, legacy_validate_actors_list
+
+COMMENT_CASES = [
+    "None#", "False#,", "... # nota", "True\t#x", "Actor #1; Actor #2", "#", "# A, B", "['A'] # B",
+    "\x0c None", "\x0cNone", "  \x0c True\x0c", "A\x0cB; C",
+]
+
+# Fragmentos con los que se arman textos al azar
+FRAGMENTS = [
+    "None", "True", "False", "...", "#", ",", ";", "|", "'", '"', "[", "]", " ", "\t", "\x0c", "\x0b",
+    "\n", "\r", "\\", "(", ")", "-", "A", "B", "1", "ñ",
+]
+
+# ast avisa de escapes inválidos en los textos con barras invertidas entre comillas
+pytestmark = pytest.mark.filterwarnings("ignore:invalid escape sequence:DeprecationWarning")
+
+
+@pytest.mark.parametrize("text", EDGE_CASES + COMMENT_CASES)
+def test_matches_legacy_parser(text):
+    assert parse_actor_string(text) == legacy_validate_actors_list(text)
+
+
+def test_matches_legacy_parser_on_random_texts():
+    rng = random.Random(2024)
+    texts = ["".join(rng.choice(FRAGMENTS) for _ in range(rng.randint(1, 8))) for _ in range(20000)]
+
+    mismatches = [text for text in texts if parse_actor_string(text) != legacy_validate_actors_list(text)]
+
+    assert mismatches == []
@@ -0,0 +1,36 @@
+"""
+Escritores de producto: el modo benchmark mide sin dejar filas.
+"""
+
+import pandas as pd
+from sqlalchemy import text
+from bulk_load import benchmark_writers
+from pipeline import load_file
+from dimensions import DimensionResolver
+from tests.factories import make_products
+
+
+def _count(eng, table):
+    return eng.execute(text(f"SELECT COUNT(*) FROM {table}")).scalar()
+
+
+def test_benchmark_load_leaves_table_unchanged(loader_eng, write_products):
+    resolver = DimensionResolver.load(loader_eng)
+    load_file(write_products(make_products(5), name="base.json"), loader_eng, resolver)
+
+    report = load_file(write_products(make_products(30, start=100)), loader_eng, resolver,
+                       benchmark=True, stream=True, batch_size=10)
+
+    assert report["benchmark"]["to_sql"]["rows"] == 30
+    assert _count(loader_eng, "producto") == 5
+
+
+def test_benchmark_writers_without_open_transaction(loader_eng):
+    df = pd.DataFrame({"nombre": ["A", "B"], "precio_bs": [1.0, 2.0]})
+    loader_eng.commit()
+    assert not loader_eng.in_transaction()
+
+    results = benchmark_writers(df, loader_eng, "producto")
+
+    assert results["to_sql"]["rows"] == 2
+    assert _count(loader_eng, "producto") == 0
@@ -0,0 +1,98 @@
+"""
+Punto de control por lote: un lote fallido detiene la carga en el último
+lote confirmado y --resume continúa sin duplicar productos.
+"""
+
+from sqlalchemy import text
+import pipeline
+from checkpoint import read_checkpoint
+from dimensions import DimensionResolver
+from tests.factories import make_products
+
+
+def _fail_on_call(monkeypatch, target, name, call_number):
+    """Reemplaza target.name por una versión que falla en la llamada `call_number`"""
+    original = getattr(target, name)
+    calls = {"n": 0}
+
+    def wrapper(*args, **kwargs):
+        calls["n"] += 1
+        if calls["n"] == call_number:
+            raise RuntimeError("fallo simulado")
+        return original(*args, **kwargs)
+
+    monkeypatch.setattr(target, name, wrapper)
+
+
+def test_resume_continues_after_failed_batch(loader_eng, write_products, monkeypatch):
+    records = make_products(10)
+    file_path = write_products(records)
+    resolver = DimensionResolver.load(loader_eng)
+
+    with monkeypatch.context() as patch:
+        _fail_on_call(patch, pipeline, "write_images", 2)
+        report = pipeline.load_file(file_path, loader_eng, resolver, batch_size=4, stream=True)
+
+    assert "lote 2" in report["error"]
+    assert report["insertados"] == 4
+    checkpoint = read_checkpoint(loader_eng, file_path)
+    assert (checkpoint["registros"], checkpoint["lotes"], checkpoint["completado"]) == (4, 1, False)
+    # El lote fallido se revirtió completo, imágenes incluidas
+    assert loader_eng.execute(text("SELECT COUNT(*) FROM producto")).scalar() == 4
+    assert loader_eng.execute(text("SELECT COUNT(*) FROM imagenes")).scalar() == 4
+
+    report = pipeline.load_file(file_path, loader_eng, resolver, batch_size=4, stream=True, resume=True)
+
+    assert "error" not in report
+    assert report["reanudado_desde"] == 4
+    assert report["insertados"] == 6
+    urls = loader_eng.execute(text("SELECT url_supplier FROM producto")).scalars().all()
+    assert sorted(urls) == sorted(record["url"] for record in records)
+    assert loader_eng.execute(text("SELECT COUNT(*) FROM imagenes")).scalar() == 10
+    assert read_checkpoint(loader_eng, file_path)["completado"]
+
+
+def test_resume_skips_completed_file(loader_eng, write_products):
+    file_path = write_products(make_products(5))
+    resolver = DimensionResolver.load(loader_eng)
+    pipeline.load_file(file_path, loader_eng, resolver, batch_size=2, stream=True)
+
+    report = pipeline.load_file(file_path, loader_eng, resolver, batch_size=2, stream=True, resume=True)
+
+    assert report["leidos"] == 0
+    assert report["insertados"] == 0
+    assert loader_eng.execute(text("SELECT COUNT(*) FROM producto")).scalar() == 5
+
+
+def test_changed_file_restarts_from_beginning(loader_eng, write_products, monkeypatch):
+    resolver = DimensionResolver.load(loader_eng)
+    file_path = write_products(make_products(6))
+    with monkeypatch.context() as patch:
+        _fail_on_call(patch, pipeline, "write_images", 2)
+        pipeline.load_file(file_path, loader_eng, resolver, batch_size=3, stream=True)
+
+    # Mismo nombre, contenido distinto: la huella no coincide
+    file_path = write_products(make_products(4, start=100))
+    report = pipeline.load_file(file_path, loader_eng, resolver, batch_size=3, stream=True, resume=True)
+
+    assert report["reanudado_desde"] == 0
+    assert report["insertados"] == 4
+
+
+def test_resume_without_stream_checkpoints_each_batch(loader_eng, write_products, monkeypatch):
+    records = make_products(9)
+    file_path = write_products(records)
+    resolver = DimensionResolver.load(loader_eng)
+
+    with monkeypatch.context() as patch:
+        _fail_on_call(patch, pipeline, "write_images", 3)
+        report = pipeline.load_file(file_path, loader_eng, resolver, batch_size=3)
+
+    assert report["insertados"] == 6
+    assert read_checkpoint(loader_eng, file_path)["registros"] == 6
+
+    report = pipeline.load_file(file_path, loader_eng, resolver, batch_size=3, resume=True)
+
+    assert (report["reanudado_desde"], report["insertados"]) == (6, 3)
+    urls = loader_eng.execute(text("SELECT url_supplier FROM producto")).scalars().all()
+    assert sorted(urls) == sorted(record["url"] for record in records)
@@ -0,0 +1,132 @@
+"""
+CircuitBreaker: cerrado → abierto → semiabierto → cerrado, una prueba
+fallida en semiabierto vuelve a abrir el circuito y, conectado a un
+engine, solo las sentencias ejecutadas cuentan como éxitos.
+"""
+
+import asyncio
+from types import SimpleNamespace
+import pytest
+from sqlalchemy import create_engine, text
+from sqlalchemy.exc import DBAPIError
+from app.infrastructure import error_handlers
+from app.infrastructure.database_strategies import register_circuit_breaker
+from app.infrastructure.error_handlers import CircuitBreaker, CircuitOpenError, CircuitState
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self):
+        return self.now
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    fake = FakeClock()
+    # Solo el reloj del módulo: asyncio sigue usando time.monotonic real
+    monkeypatch.setattr(error_handlers, "time", SimpleNamespace(monotonic=fake))
+    return fake
+
+
+@pytest.fixture
+def breaker(clock):
+    return CircuitBreaker("prueba", failure_threshold=0.5, window_size=4, min_calls=4, cooldown=30.0,
+                          probe_timeout=5.0)
+
+
+def _fail(breaker, times=1):
+    for _ in range(times):
+        breaker.before_call()
+        breaker.record_failure()
+
+
+def test_full_cycle_closed_open_half_open_closed(breaker, clock):
+    breaker.before_call()
+    breaker.record_success()
+    _fail(breaker)
+    assert breaker.state is CircuitState.CLOSED  # menos de min_calls
+
+    _fail(breaker, 2)  # 3 fallos de 4 llamadas
+    assert breaker.state is CircuitState.OPEN
+    assert breaker.opened_count == 1
+
+    with pytest.raises(CircuitOpenError) as rejected:
+        breaker.before_call()
+    assert rejected.value.retry_in == pytest.approx(30.0)
+    assert breaker.rejected == 1
+
+    clock.now += 30.0
+    breaker.before_call()  # llamada de prueba
+    assert breaker.state is CircuitState.HALF_OPEN
+    with pytest.raises(CircuitOpenError):
+        breaker.before_call()  # solo una prueba a la vez
+
+    breaker.record_success()
+    assert breaker.state is CircuitState.CLOSED
+    assert breaker.snapshot()["calls_in_window"] == 1
+    breaker.before_call()
+
+
+def test_failed_probe_reopens(breaker, clock):
+    _fail(breaker, 4)
+    clock.now += 30.0
+    breaker.before_call()
+
+    breaker.record_failure()
+
+    assert breaker.state is CircuitState.OPEN
+    assert breaker.opened_count == 2
+    with pytest.raises(CircuitOpenError):
+        breaker.before_call()
+
+
+def test_probe_timeout_allows_another_probe(breaker, clock):
+    _fail(breaker, 4)
+    clock.now += 30.0
+    breaker.before_call()
+
+    clock.now += 5.0
+    breaker.before_call()
+
+    assert breaker.state is CircuitState.HALF_OPEN
+
+
+def test_decorator_records_results(breaker, clock):
+    calls = []
+
+    @breaker
+    async def query(fail):
+        calls.append(fail)
+        if fail:
+            raise ConnectionError("caída")
+        return "ok"
+
+    for _ in range(4):
+        with pytest.raises(ConnectionError):
+            asyncio.run(query(True))
+    with pytest.raises(CircuitOpenError):
+        asyncio.run(query(False))
+    assert len(calls) == 4
+
+    clock.now += 30.0
+    assert asyncio.run(query(False)) == "ok"
+    assert breaker.state is CircuitState.CLOSED
+
+
+def test_engine_records_success_per_executed_statement(breaker):
+    engine = create_engine("sqlite://")
+    register_circuit_breaker(engine, breaker)
+
+    with engine.connect() as connection:
+        # Solo el checkout: todavía no hay operación completada
+        assert breaker.snapshot()["calls_in_window"] == 0
+        connection.execute(text("SELECT 1"))
+        assert breaker.snapshot()["calls_in_window"] == 1
+        # Un error de SQL no es una falla de conexión ni un éxito
+        with pytest.raises(DBAPIError):
+            connection.execute(text("SELECT * FROM tabla_inexistente"))
+
+    assert breaker.snapshot()["calls_in_window"] == 1
+    assert breaker.snapshot()["failures_in_window"] == 0
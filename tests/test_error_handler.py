@@ -0,0 +1,29 @@
+"""
+ErrorHandler: tope absoluto de errores cuando no se informan registros
+procesados y tasa de error cuando sí.
+"""
+
+from app.infrastructure.error_handlers import ErrorHandler, ErrorType
+
+
+def _fail(handler, times):
+    return [handler.handle_error(ValueError("x"), ErrorType.DATABASE_ERROR, "consulta") for _ in range(times)]
+
+
+def test_absolute_cap_without_processed_records():
+    handler = ErrorHandler(max_errors=10)
+
+    results = _fail(handler, 11)
+
+    assert results[:10] == [True] * 10
+    assert results[10] is False
+
+
+def test_error_ratio_once_processed_records_are_reported():
+    handler = ErrorHandler(max_error_ratio=0.05, min_records=100)
+    handler.record_processed(1000)
+
+    # 20 errores sobre 1000 registros: 2%, por debajo del máximo
+    assert all(_fail(handler, 20))
+    # 51 errores: 5.1%, supera el máximo
+    assert _fail(handler, 31)[-1] is False
@@ -0,0 +1,45 @@
+"""
+Imágenes deduplicadas: una url compartida por varios productos (o escrita
+con otra forma equivalente) se guarda una sola vez en imagen.
+"""
+
+from sqlalchemy import text
+from pipeline import load_file
+from dimensions import DimensionResolver
+from images import normalize_url, url_hashes
+from tests.factories import make_products
+
+SHARED_URL = "https://img.example.com/compartida.jpg"
+
+
+def _load(loader_eng, file_path, **options):
+    return load_file(file_path, loader_eng, DimensionResolver.load(loader_eng), dedup_images=True, **options)
+
+
+def test_shared_url_creates_one_image_row(loader_eng, write_products):
+    records = make_products(2)
+    records[0]["imagen"] = [SHARED_URL]
+    # Misma url con host en mayúsculas, puerto por defecto y fragmento
+    records[1]["imagen"] = ["https://IMG.example.com:443/compartida.jpg#zoom", "https://img.example.com/propia.jpg"]
+
+    report = _load(loader_eng, write_products(records))
+
+    assert report["insertados"] == 2
+    imagenes = loader_eng.execute(text("SELECT url_hash, url FROM imagen ORDER BY url")).all()
+    assert [row.url for row in imagenes] == [SHARED_URL, "https://img.example.com/propia.jpg"]
+    shared_hash = int(url_hashes([normalize_url(SHARED_URL)])[0])
+    enlaces = loader_eng.execute(text(
+        "SELECT p.url_supplier, pi.url_hash, pi.posicion FROM producto_imagen pi "
+        "JOIN producto p ON p.id = pi.id_producto WHERE pi.url_hash = :hash ORDER BY p.id"
+    ), {"hash": shared_hash}).all()
+    assert [(row.url_supplier, row.posicion) for row in enlaces] == [(records[0]["url"], 0), (records[1]["url"], 0)]
+
+
+def test_shared_url_across_batches_and_loads(loader_eng, write_products):
+    first = make_products(3, imagen=[SHARED_URL])
+    _load(loader_eng, write_products(first), batch_size=2)
+    # Otra carga con productos nuevos que reutilizan la misma url
+    _load(loader_eng, write_products(make_products(2, start=10, imagen=[SHARED_URL]), name="segunda.json"))
+
+    assert loader_eng.execute(text("SELECT COUNT(*) FROM imagen")).scalar() == 1
+    assert loader_eng.execute(text("SELECT COUNT(*) FROM producto_imagen")).scalar() == 5
@@ -0,0 +1,75 @@
+"""
+Lectura incremental de json_stream: arreglos válidos, truncados y con
+valores anidados, también con bloques de lectura más chicos que un
+registro, y NDJSON.
+"""
+
+import json
+import pytest
+from json_stream import iter_batches, iter_json_records
+
+NESTED = [
+    {"nombre_producto": "Vitamina C", "imagen": ["https://img.example.com/1.jpg", "https://img.example.com/2.jpg"],
+     "detalle": {"presentacion": {"unidades": 30, "tags": ["[", "]", "{", ","]}}},
+    {"nombre_producto": "Ibuprofeno \"400\"", "detalle": {}},
+    [1, [2, [3, {"a": None}]]],
+    "texto con ], y }",
+    42,
+]
+
+
+def _write(tmp_path, content, name="productos.json"):
+    path = tmp_path / name
+    path.write_text(content, encoding="utf-8")
+    return str(path)
+
+
+@pytest.mark.parametrize("chunk_size", [1, 7, 1 << 16])
+def test_valid_array(tmp_path, chunk_size):
+    records = [{"id": i, "nombre": f"Producto {i}"} for i in range(50)]
+    path = _write(tmp_path, json.dumps(records, indent=2))
+
+    assert list(iter_json_records(path, chunk_size=chunk_size)) == records
+
+
+@pytest.mark.parametrize("chunk_size", [1, 5, 1 << 16])
+def test_nested_array(tmp_path, chunk_size):
+    path = _write(tmp_path, "  \n" + json.dumps(NESTED, ensure_ascii=False))
+
+    assert list(iter_json_records(path, chunk_size=chunk_size)) == NESTED
+
+
+@pytest.mark.parametrize("content", ["[]", "  [ \n ]  ", "", "   \n"])
+def test_empty_inputs(tmp_path, content):
+    assert list(iter_json_records(_write(tmp_path, content))) == []
+
+
+@pytest.mark.parametrize("chunk_size", [3, 1 << 16])
+def test_truncated_array_inside_record(tmp_path, chunk_size):
+    path = _write(tmp_path, '[{"id": 1}, {"id": 2}, {"id": 3, "imagen": ["https://img')
+    records = []
+
+    with pytest.raises(json.JSONDecodeError):
+        for record in iter_json_records(path, chunk_size=chunk_size):
+            records.append(record)
+
+    assert records == [{"id": 1}, {"id": 2}]
+
+
+def test_truncated_array_without_closing_bracket(tmp_path):
+    path = _write(tmp_path, '[{"id": 1}, {"id": 2},\n')
+
+    with pytest.raises(ValueError, match="sin cerrar"):
+        list(iter_json_records(path, chunk_size=4))
+
+
+def test_ndjson(tmp_path):
+    path = _write(tmp_path, "\n".join(json.dumps(record) for record in NESTED[:2]) + "\n\n", "productos.ndjson")
+
+    assert list(iter_json_records(path, chunk_size=8)) == NESTED[:2]
+
+
+def test_iter_batches():
+    assert list(iter_batches(range(7), 3)) == [[0, 1, 2], [3, 4, 5], [6]]
+    with pytest.raises(ValueError):
+        next(iter_batches([], 0))
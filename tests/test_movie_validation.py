@@ -0,0 +1,90 @@
+"""
+DataValidator.validate_movie_batch da el mismo resultado que
+validate_movie_data registro a registro, con registros válidos e inválidos.
+"""
+
+import pandas as pd
+import pytest
+from app.infrastructure.error_handlers import (
+    REASON_INVALID_TITLE, REASON_INVALID_URL, REASON_MISSING_TITLE, DataValidator, ValidationError,
+)
+
+NUMERIC_FIELDS = ("rating", "year", "duration", "metascore")
+
+MOVIES = [
+    pytest.param({"title": " Alien ", "rating": "8.5", "date_published": "1979-05-25", "duration_minutes": 117,
+                  "metascore": 89, "actors": "['Sigourney Weaver', 'Tom Skerritt']",
+                  "movie_url": "https://imdb.example.com/alien", "movie_id": "tt0078748"}, id="valido"),
+    pytest.param({"title": "Metropolis", "rating": 8.3, "date_published": 1927, "duration_minutes": "153.9",
+                  "actors": ["Brigitte Helm", "Alfred Abel"]}, id="tipos_mixtos"),
+    pytest.param({"title": "Fuera de rango", "rating": 11, "date_published": "1700-01-01",
+                  "duration_minutes": 0, "metascore": -1, "movie_url": "ftp://x"}, id="fuera_de_rango"),
+    pytest.param({"title": "Inválidos", "rating": "alto", "date_published": "hoy", "duration_minutes": "largo",
+                  "metascore": [], "actors": "None#"}, id="valores_invalidos"),
+    pytest.param({"title": "Vacío", "rating": None, "date_published": "", "duration_minutes": None,
+                  "actors": None, "alternate_title": "Empty"}, id="nulos"),
+    pytest.param({"title": "   ", "rating": 5}, id="sin_titulo"),
+    pytest.param({"rating": 5}, id="titulo_ausente"),
+    pytest.param({"title": 42}, id="titulo_no_texto"),
+    pytest.param({"title": "URL numérica", "movie_url": 7}, id="url_no_texto"),
+]
+
+
+def _scalar(movie):
+    """Resultado de la ruta por registro: (datos, código de rechazo)"""
+    try:
+        return DataValidator.validate_movie_data(movie), ""
+    except ValidationError:
+        return None, REASON_MISSING_TITLE
+    except AttributeError:
+        # .strip() sobre un título o una URL que no es str. La ruta escalar
+        # se corta en la URL aunque el título ya estuviera vacío; el lote
+        # informa primero el título
+        title = movie.get("title", "")
+        if not isinstance(title, str):
+            return None, REASON_INVALID_TITLE
+        return None, REASON_MISSING_TITLE if not title.strip() else REASON_INVALID_URL
+
+
+def _batch_row(validated, row):
+    """Fila del lote como dict, con NA convertido a None como en la ruta escalar"""
+    record = validated.iloc[row].to_dict()
+    for field in NUMERIC_FIELDS:
+        record[field] = None if pd.isna(record[field]) else record[field]
+    return record
+
+
+def _assert_same(expected, expected_reason, validated, error_mask, reasons, row):
+    assert reasons[row] == expected_reason
+    assert error_mask[row] == bool(expected_reason)
+    if expected is None:
+        return
+    actual = _batch_row(validated, row)
+    for field, value in expected.items():
+        # Los campos copiados sin validar pueden ser NaN en ambas rutas
+        assert actual[field] == value or (pd.isna(value) and pd.isna(actual[field])), field
+
+
+@pytest.mark.parametrize("movie", MOVIES)
+def test_batch_matches_scalar_per_record(movie):
+    expected, expected_reason = _scalar(movie)
+
+    validated, error_mask, reasons = DataValidator.validate_movie_batch([movie])
+
+    _assert_same(expected, expected_reason, validated, error_mask, reasons, 0)
+
+
+@pytest.mark.parametrize("as_frame", [False, True], ids=["lista", "dataframe"])
+def test_mixed_batch_matches_scalar(as_frame):
+    movies = [param.values[0] for param in MOVIES]
+    source = pd.DataFrame(movies) if as_frame else movies
+
+    validated, error_mask, reasons = DataValidator.validate_movie_batch(source)
+
+    assert len(validated) == len(movies)
+    for row, movie in enumerate(movies):
+        if as_frame:
+            # Cada fila tal como la ve el lote: los campos ausentes quedan en NaN
+            movie = source.iloc[row].to_dict()
+        expected, expected_reason = _scalar(movie)
+        _assert_same(expected, expected_reason, validated, error_mask, reasons, row)
@@ -0,0 +1,75 @@
+"""
+Códigos de producto: únicos entre workers, incluida una carga real con
+run_parallel sobre SQLite.
+"""
+
+import numpy as np
+import pytest
+from sqlalchemy import text
+import product_codes
+from product_codes import MAX_WORKERS, PARALLEL_WORKER_ID, ProductCodeGenerator, _base36_digits
+from parallel import run_parallel
+from pipeline import prepare_tables
+from dimensions import DimensionResolver
+from tests.factories import make_products
+
+
+def test_workers_generate_distinct_codes_at_the_same_instant(monkeypatch):
+    # Mismo reloj para todos: solo el id de worker distingue los códigos
+    monkeypatch.setattr(product_codes.time, "time_ns", lambda: product_codes.EPOCH_US * 1000 + 10**9)
+    names = [f"Vitamina {i}" for i in range(200)]
+    categories = ["Vitaminas"] * len(names)
+
+    codes = [ProductCodeGenerator(worker_id).generate(names, categories) for worker_id in (1, 2, MAX_WORKERS - 1)]
+
+    all_codes = [code for worker_codes in codes for code in worker_codes]
+    assert len(set(all_codes)) == len(all_codes)
+
+
+def test_generator_never_repeats_sequence(monkeypatch):
+    monkeypatch.setattr(product_codes.time, "time_ns", lambda: product_codes.EPOCH_US * 1000)
+    generator = ProductCodeGenerator(3)
+
+    first = generator.generate(["A", "B"], ["X", "X"])
+    second = generator.generate(["A", "B"], ["X", "X"])
+
+    assert len(set(first + second)) == 4
+
+
+def test_worker_id_out_of_range():
+    with pytest.raises(ValueError):
+        ProductCodeGenerator(MAX_WORKERS)
+
+
+def test_pid_default_stays_below_parallel_ids(monkeypatch):
+    monkeypatch.delenv("LOADER_WORKER_ID", raising=False)
+    assert 0 <= product_codes.default_worker_id() < PARALLEL_WORKER_ID
+
+
+def test_run_parallel_rejects_worker_ids_past_the_limit(monkeypatch):
+    monkeypatch.setenv("LOADER_WORKER_ID", str(MAX_WORKERS - 2))
+    with pytest.raises(ValueError, match=str(MAX_WORKERS)):
+        run_parallel(["a.json", "b.json"], "sqlite://", DimensionResolver.empty(), 2)
+
+
+def _worker_suffixes(*worker_ids):
+    return {bytes(digits).decode() for digits in _base36_digits(np.array(worker_ids), product_codes.WORKER_WIDTH)}
+
+
+@pytest.mark.parametrize("env_id, base", [("10", 10), (None, PARALLEL_WORKER_ID)])
+def test_parallel_load_codes_are_unique(catalog_db, loader_eng, write_products, monkeypatch, env_id, base):
+    if env_id is None:
+        monkeypatch.delenv("LOADER_WORKER_ID", raising=False)
+    else:
+        monkeypatch.setenv("LOADER_WORKER_ID", env_id)
+    files = [write_products(make_products(30, start=30 * n), name=f"parte_{n}.json") for n in range(4)]
+    resolver = DimensionResolver.load(loader_eng)
+    prepare_tables(loader_eng)
+
+    report = run_parallel(files, f"sqlite:///{catalog_db}", resolver, 2, batch_size=10, stream=True)
+
+    assert report["insertados"] == 120
+    codes = loader_eng.execute(text("SELECT codigo FROM producto")).scalars().all()
+    assert len(codes) == len(set(codes)) == 120
+    # Sufijo de worker: base + índice en el pool (1..workers)
+    assert {code[-2:] for code in codes} <= _worker_suffixes(base + 1, base + 2)
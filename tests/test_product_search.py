@@ -0,0 +1,91 @@
+"""
+Búsqueda de productos: paginación por llave sobre el índice FTS5 y
+errores de parámetros.
+"""
+
+import pytest
+from pipeline import load_file
+from dimensions import DimensionResolver
+from tests.factories import make_products
+
+SEARCH_URL = "/api/productos/search"
+
+
+@pytest.fixture(autouse=True)
+def without_search_cache(monkeypatch):
+    monkeypatch.setenv("SEARCH_CACHE_ENABLED", "false")
+
+
+@pytest.fixture
+def catalog(loader_eng, write_products):
+    """25 productos activos más uno inactivo, cargados con el cargador"""
+    records = make_products(25) + make_products(1, start=900, nombre_producto="Vitamina agotada")
+    load_file(write_products(records), loader_eng, DimensionResolver.load(loader_eng))
+    loader_eng.exec_driver_sql("UPDATE producto SET activo = 0 WHERE nombre = 'Vitamina agotada'")
+    loader_eng.commit()
+    return records
+
+
+def _all_pages(client, params):
+    """Recorre las páginas siguiendo next_cursor; retorna los items y el número de páginas"""
+    items, pages, cursor = [], 0, None
+    while True:
+        response = client.get(SEARCH_URL, params={**params, **({"cursor": cursor} if cursor else {})})
+        assert response.status_code == 200
+        body = response.json()
+        items.extend(body["items"])
+        pages += 1
+        cursor = body["next_cursor"]
+        if not cursor:
+            return items, pages
+
+
+def test_keyset_pagination_returns_every_match_once(catalog, api_client):
+    items, pages = _all_pages(api_client, {"q": "vitamina", "limit": 7})
+
+    ids = [item["id"] for item in items]
+    assert len(ids) == len(set(ids)) == 25
+    assert pages == 4
+    assert "Vitamina agotada" not in {item["nombre"] for item in items}
+
+
+def test_pagination_without_text_orders_by_id(catalog, api_client):
+    items, _ = _all_pages(api_client, {"limit": 10, "precio_min": 105, "precio_max": 114})
+
+    assert [item["precio_bs"] for item in items] == [100.0 + i for i in range(5, 15)]
+    assert [item["id"] for item in items] == sorted(item["id"] for item in items)
+
+
+def test_prefix_and_accent_insensitive_match(catalog, api_client):
+    body = api_client.get(SEARCH_URL, params={"q": "NÚMERO 12"}).json()
+
+    assert [item["nombre"] for item in body["items"]] == ["Vitamina 12"]
+    assert body["next_cursor"] is None
+
+
+@pytest.mark.parametrize("q", ["!!!", "¿?", "- * -"])
+def test_query_without_terms_returns_empty_page(catalog, api_client, q):
+    response = api_client.get(SEARCH_URL, params={"q": q})
+
+    assert response.status_code == 200
+    assert response.json() == {"items": [], "next_cursor": None}
+
+
+def test_blank_query_only_applies_filters(catalog, api_client):
+    body = api_client.get(SEARCH_URL, params={"q": "  ", "limit": 100}).json()
+
+    assert len(body["items"]) == 25
+
+
+@pytest.mark.parametrize("cursor", ["xxx", "e30", "W10"])
+def test_invalid_cursor_is_rejected(catalog, api_client, cursor):
+    response = api_client.get(SEARCH_URL, params={"q": "vitamina", "cursor": cursor})
+
+    assert response.status_code == 400
+    assert response.json()["detail"] == "Cursor inválido"
+
+
+def test_inverted_price_range_is_rejected(catalog, api_client):
+    response = api_client.get(SEARCH_URL, params={"precio_min": 10, "precio_max": 1})
+
+    assert response.status_code == 400
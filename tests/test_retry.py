@@ -0,0 +1,98 @@
+"""
+retry_with_backoff: el plazo total (RetryConfig.deadline) corta los
+reintentos y RetryStats refleja llamadas, intentos y esperas, en funciones
+síncronas y corrutinas.
+"""
+
+import asyncio
+import time
+import pytest
+from app.infrastructure.error_handlers import RetryConfig, get_retry_stats, retry_with_backoff
+
+# Esperas de 50 ms y 100 ms: con un plazo de 120 ms solo cabe la primera
+DEADLINE_CONFIG = RetryConfig(max_retries=5, base_delay=0.05, backoff_factor=2.0, jitter=False, deadline=0.12)
+
+
+def test_deadline_stops_sync_retries():
+    @retry_with_backoff(DEADLINE_CONFIG, retry_on=(ConnectionError,))
+    def always_fails():
+        raise ConnectionError("sin conexión")
+
+    started = time.monotonic()
+    with pytest.raises(ConnectionError):
+        always_fails()
+
+    assert time.monotonic() - started < 0.12
+    assert always_fails.retry_stats.snapshot() == {
+        "calls": 1, "attempts": 2, "retries": 1, "failures": 1, "deadline_exceeded": 1, "slept_seconds": 0.05,
+    }
+
+
+def test_deadline_stops_async_retries():
+    @retry_with_backoff(DEADLINE_CONFIG, retry_on=(ConnectionError,))
+    async def always_fails():
+        raise ConnectionError("sin conexión")
+
+    with pytest.raises(ConnectionError):
+        asyncio.run(always_fails())
+
+    stats = always_fails.retry_stats.snapshot()
+    assert (stats["attempts"], stats["retries"], stats["deadline_exceeded"], stats["failures"]) == (2, 1, 1, 1)
+
+
+@pytest.mark.parametrize("is_async", [False, True], ids=["sync", "async"])
+def test_stats_count_retries_until_success(is_async, monkeypatch):
+    monkeypatch.setattr(time, "sleep", lambda seconds: None)
+    config = RetryConfig(max_retries=3, base_delay=0.001, backoff_factor=2.0, jitter=False)
+    outcomes = [ConnectionError("1"), ConnectionError("2"), "ok"]
+
+    def next_outcome():
+        outcome = outcomes.pop(0)
+        if isinstance(outcome, Exception):
+            raise outcome
+        return outcome
+
+    # Nombres distintos: las métricas se registran por __qualname__
+    if is_async:
+        @retry_with_backoff(config, retry_on=(ConnectionError,))
+        async def flaky_async():
+            return next_outcome()
+        flaky = flaky_async
+        result = asyncio.run(flaky())
+    else:
+        @retry_with_backoff(config, retry_on=(ConnectionError,))
+        def flaky_sync():
+            return next_outcome()
+        flaky = flaky_sync
+        result = flaky()
+
+    assert result == "ok"
+    snapshot = flaky.retry_stats.snapshot()
+    assert snapshot["slept_seconds"] == pytest.approx(0.003)
+    del snapshot["slept_seconds"]
+    assert snapshot == {"calls": 1, "attempts": 3, "retries": 2, "failures": 0, "deadline_exceeded": 0}
+    assert get_retry_stats()[flaky.__qualname__]["attempts"] == 3
+
+
+def test_exhausted_retries_without_deadline(monkeypatch):
+    monkeypatch.setattr(time, "sleep", lambda seconds: None)
+
+    @retry_with_backoff(RetryConfig(max_retries=2, jitter=False), retry_on=(ConnectionError,))
+    def always_fails():
+        raise ConnectionError("sin conexión")
+
+    with pytest.raises(ConnectionError):
+        always_fails()
+
+    # Un error no incluido en retry_on no se reintenta
+    @retry_with_backoff(RetryConfig(max_retries=2), retry_on=(ConnectionError,))
+    def wrong_type():
+        raise KeyError("clave")
+
+    with pytest.raises(KeyError):
+        wrong_type()
+
+    assert always_fails.retry_stats.snapshot()["attempts"] == 3
+    assert always_fails.retry_stats.snapshot()["failures"] == 1
+    assert wrong_type.retry_stats.snapshot()["attempts"] == 1
+    assert wrong_type.retry_stats.snapshot()["retries"] == 0
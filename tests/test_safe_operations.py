@@ -0,0 +1,50 @@
+"""
+SafeOperations.iter_json_records: un arreglo truncado se relanza en vez de
+terminar en silencio, las líneas JSON Lines inválidas se cuentan y
+safe_jsonl_write crea el archivo con los mismos permisos que safe_file_write.
+"""
+
+import stat
+import pytest
+from app.infrastructure.error_handlers import SafeOperations
+
+
+def test_truncated_array_raises_after_partial_records(tmp_path):
+    path = tmp_path / "truncado.json"
+    path.write_text('[{"id": 1}, {"id": 2}, {"id": 3', encoding="utf-8")
+    records = []
+
+    with pytest.raises(ValueError):
+        for record in SafeOperations.iter_json_records(str(path), chunk_size=8):
+            records.append(record)
+
+    assert records == [{"id": 1}, {"id": 2}]
+
+
+def test_unclosed_array_raises(tmp_path):
+    path = tmp_path / "sin_cierre.json"
+    path.write_text('[{"id": 1}, ', encoding="utf-8")
+
+    with pytest.raises(ValueError, match="sin cerrar"):
+        list(SafeOperations.iter_json_records(str(path)))
+
+
+def test_jsonl_counts_skipped_lines(tmp_path):
+    path = tmp_path / "registros.jsonl"
+    path.write_text('{"id": 1}\nno es json\n\n{"id": 2}\n{"id":\n', encoding="utf-8")
+    stats = {}
+
+    records = list(SafeOperations.iter_json_records(str(path), stats=stats))
+
+    assert records == [{"id": 1}, {"id": 2}]
+    assert stats == {"skipped_lines": 2}
+
+
+def test_jsonl_write_uses_same_permissions_as_file_write(tmp_path):
+    jsonl_path = tmp_path / "salida.jsonl"
+    json_path = tmp_path / "salida.json"
+
+    assert SafeOperations.safe_jsonl_write(str(jsonl_path), ({"id": i} for i in range(3)), fsync=False) == 3
+    assert SafeOperations.safe_file_write(str(json_path), [{"id": 0}])
+
+    assert stat.S_IMODE(jsonl_path.stat().st_mode) == stat.S_IMODE(json_path.stat().st_mode)
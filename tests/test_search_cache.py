@@ -0,0 +1,99 @@
+"""
+Caché de búsqueda: LRU con TTL e invalidación por versión del catálogo.
+"""
+
+import pytest
+from sqlalchemy import text
+from app.infrastructure.search_cache import LRUCache, get_search_cache
+from catalog_version import bump_catalog_version, current_catalog_version
+from pipeline import load_file
+from dimensions import DimensionResolver
+from tests.factories import make_products
+
+SEARCH_URL = "/api/productos/search"
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+def test_lru_evicts_least_recently_used():
+    cache = LRUCache(max_entries=2, ttl=60)
+    cache.set("a", 1, "A")
+    cache.set("b", 1, "B")
+    cache.get("a", 1)
+
+    assert cache.set("c", 1, "C") == 1
+    assert cache.get("b", 1) == (None, "miss")
+    assert cache.get("a", 1) == ("A", None)
+
+
+def test_lru_entries_expire_and_go_stale():
+    clock = FakeClock()
+    cache = LRUCache(max_entries=10, ttl=5, clock=clock)
+    cache.set("a", 1, "A")
+    cache.set("b", 1, "B")
+
+    assert cache.get("a", 2) == (None, "stale")
+    clock.now = 5
+    assert cache.get("b", 1) == (None, "expired")
+    assert len(cache) == 0
+
+
+@pytest.fixture
+def catalog(loader_eng, write_products, monkeypatch):
+    """Catálogo cargado con el cargador y caché en memoria consultando la versión en cada búsqueda"""
+    monkeypatch.setenv("SEARCH_CACHE_ENABLED", "true")
+    monkeypatch.setenv("SEARCH_CACHE_BACKEND", "memory")
+    monkeypatch.setenv("SEARCH_CACHE_VERSION_CHECK_INTERVAL", "0")
+    records = make_products(5)
+    load_file(write_products(records), loader_eng, DimensionResolver.load(loader_eng), upsert=True)
+    return records
+
+
+def _price(client):
+    items = client.get(SEARCH_URL, params={"q": "vitamina 3"}).json()["items"]
+    assert [item["nombre"] for item in items] == ["Vitamina 3"]
+    return items[0]["precio_bs"]
+
+
+def test_version_bump_invalidates_cached_pages(catalog, api_client, loader_eng):
+    assert _price(api_client) == 103.0
+    # Un cambio sin nueva versión no se ve: la página sale de la caché
+    loader_eng.execute(text("UPDATE producto SET precio_bs = 1.5 WHERE nombre = 'Vitamina 3'"))
+    loader_eng.commit()
+    assert _price(api_client) == 103.0
+
+    bump_catalog_version(loader_eng)
+    loader_eng.commit()
+
+    assert _price(api_client) == 1.5
+    snapshot = get_search_cache().snapshot()
+    assert (snapshot["hits"], snapshot["misses"], snapshot["invalidations"]) == (1, 2, 1)
+    assert snapshot["version"] == current_catalog_version(loader_eng)
+
+
+def test_loader_batch_invalidates_cached_pages(catalog, api_client, loader_eng, write_products):
+    assert _price(api_client) == 103.0
+    version = current_catalog_version(loader_eng)
+
+    catalog[3]["precio_bs"] = 250.0
+    report = load_file(write_products(catalog), loader_eng, DimensionResolver.load(loader_eng), upsert=True)
+
+    assert report["actualizados"] == 1
+    assert current_catalog_version(loader_eng) == version + 1
+    assert _price(api_client) == 250.0
+
+
+def test_cache_is_bypassed_without_version_table(catalog, api_client, loader_eng):
+    loader_eng.execute(text("DROP TABLE catalogo_version"))
+    loader_eng.commit()
+
+    assert _price(api_client) == 103.0
+    assert _price(api_client) == 103.0
+    snapshot = get_search_cache().snapshot()
+    assert (snapshot["hits"], snapshot["bypassed"]) == (0, 2)
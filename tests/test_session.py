@@ -0,0 +1,30 @@
+"""
+Arranque de la aplicación: la estrategia asíncrona (la que usan los
+endpoints) se valida y su pool se precalienta.
+"""
+
+import pytest
+from app.infrastructure import session
+
+
+@pytest.fixture(autouse=True)
+def prewarm_two_connections(monkeypatch):
+    monkeypatch.setenv("DB_POOL_PREWARM", "2")
+
+
+def test_lifespan_validates_and_prewarms_async_pool(api_client):
+    async_strategy = session._async_db_strategy
+
+    assert async_strategy.is_connection_valid()
+    assert async_strategy.engine.sync_engine.pool.checkedin() >= 2
+    # El pool síncrono solo se usa para validar y crear tablas
+    assert session._db_strategy.engine.pool.checkedin() <= 1
+
+
+def test_async_bootstrap_fails_on_invalid_connection(api_client, monkeypatch):
+    async def invalid():
+        return False
+
+    monkeypatch.setattr(session._async_db_strategy, "validate_connection", invalid)
+    with pytest.raises(RuntimeError, match="asíncrona"):
+        api_client.portal.call(session.bootstrap_async_database)
@@ -0,0 +1,104 @@
+"""
+Carga por staging sobre SQLite: mismos productos e imágenes que la carga
+con transform_products y rechazos guardados en producto_rechazo.
+"""
+
+import pytest
+from sqlalchemy import text
+from pipeline import load_file
+from dimensions import DimensionResolver
+from checkpoint import checkpoint_key
+from transform import MOTIVO_SUBCATEGORIA, MOTIVO_SUCURSAL
+from tests.factories import make_products
+
+PRODUCT_ROWS = """
+SELECT p.nombre, p.descripcion, p.precio_bs, p.in_stock, s.nombre, m.nombre, p.url_supplier, p.views,
+       su.nombre, p.activo, p.creado_por
+FROM producto p
+JOIN subcategorias s ON s.id = p.id_sub_categoria
+JOIN marcas m ON m.id = p.id_marca
+JOIN sucursales su ON su.id = p.id_sucursal
+ORDER BY p.id
+"""
+
+IMAGE_ROWS = """
+SELECT p.url_supplier, i.url, i.creado_por FROM imagenes i JOIN producto p ON p.id = i.id_producto ORDER BY i.id
+"""
+
+
+def _records():
+    records = make_products(7)
+    records[1]["sub_categoria"] = "Inexistente"
+    records[3]["Sucursal"] = "Sucursal cerrada"
+    # Marca desconocida: se asigna la genérica, no se rechaza
+    records[4]["marca"] = "Marca nueva"
+    records[5]["imagen"] = ["https://img.example.com/5a.jpg", "https://img.example.com/5b.jpg"]
+    records[6]["disponible"] = "true"
+    return records
+
+
+def _load(loader_eng, file_path, staging):
+    return load_file(file_path, loader_eng, DimensionResolver.load(loader_eng), batch_size=3, staging=staging)
+
+
+def _snapshot(loader_eng):
+    return (
+        loader_eng.execute(text(PRODUCT_ROWS)).all(),
+        loader_eng.execute(text(IMAGE_ROWS)).all(),
+    )
+
+
+def test_staging_matches_transform_path(loader_eng, write_products):
+    file_path = write_products(_records())
+    report = _load(loader_eng, file_path, staging=False)
+    expected = _snapshot(loader_eng)
+    loader_eng.execute(text("DELETE FROM imagenes"))
+    loader_eng.execute(text("DELETE FROM producto"))
+    loader_eng.commit()
+
+    staged = _load(loader_eng, write_products(_records(), name="otra_carga.json"), staging=True)
+
+    assert _snapshot(loader_eng) == expected
+    assert len(expected[0]) == 5
+    for counter in ("leidos", "transformados", "rechazados", "insertados"):
+        assert staged[counter] == report[counter], counter
+    assert staged["motivos"] == report["motivos"] == {MOTIVO_SUBCATEGORIA: 1, MOTIVO_SUCURSAL: 1}
+
+
+def test_rejects_are_stored_with_file_and_row(loader_eng, write_products):
+    records = _records()
+    file_path = write_products(records)
+
+    report = _load(loader_eng, file_path, staging=True)
+
+    assert report["rechazados"] == 2
+    rechazos = loader_eng.execute(text(
+        "SELECT archivo, fila, nombre, url_supplier, sub_categoria, sucursal, motivo FROM producto_rechazo ORDER BY fila"
+    )).all()
+    assert [tuple(row) for row in rechazos] == [
+        (checkpoint_key(file_path), 1, records[1]["nombre_producto"], records[1]["url"], "Inexistente",
+         "Farmatodo Centro", MOTIVO_SUBCATEGORIA),
+        # Fila 3 del archivo, en el segundo lote de 3 registros
+        (checkpoint_key(file_path), 3, records[3]["nombre_producto"], records[3]["url"], "Vitaminas",
+         "Sucursal cerrada", MOTIVO_SUCURSAL),
+    ]
+    # El staging queda vacío después de cada lote
+    assert loader_eng.execute(text("SELECT COUNT(*) FROM producto_staging")).scalar() == 0
+
+
+@pytest.mark.parametrize("dedup_images", [False, True])
+def test_staging_images(loader_eng, write_products, dedup_images):
+    records = make_products(4)
+    records[1]["imagen"] = records[0]["imagen"] + ["https://img.example.com/extra.jpg"]
+
+    report = load_file(write_products(records), loader_eng, DimensionResolver.load(loader_eng), staging=True,
+                       dedup_images=dedup_images)
+
+    assert report["insertados"] == 4
+    if dedup_images:
+        assert loader_eng.execute(text("SELECT COUNT(*) FROM imagen")).scalar() == 4
+        assert loader_eng.execute(text("SELECT COUNT(*) FROM producto_imagen")).scalar() == 5
+    else:
+        assert [row.url for row in loader_eng.execute(text(IMAGE_ROWS))] == [
+            url for record in records for url in record["imagen"]
+        ]
@@ -0,0 +1,96 @@
+"""
+Modo upsert: clasificación de productos en nuevos, cambiados y sin cambios.
+"""
+
+from sqlalchemy import text
+import upsert
+from pipeline import load_file
+from dimensions import DimensionResolver
+from catalog_version import current_catalog_version
+from tests.factories import make_products
+
+
+def _load(loader_eng, file_path):
+    return load_file(file_path, loader_eng, DimensionResolver.load(loader_eng), upsert=True)
+
+
+def _counts(report):
+    return report["insertados"], report["actualizados"], report["sin_cambios"]
+
+
+def test_new_unchanged_and_changed(loader_eng, write_products):
+    records = make_products(5)
+    assert _counts(_load(loader_eng, write_products(records))) == (5, 0, 0)
+    assert _counts(_load(loader_eng, write_products(records))) == (0, 0, 5)
+
+    records[2]["precio_bs"] = 999.5
+    records.extend(make_products(1, start=50))
+    assert _counts(_load(loader_eng, write_products(records))) == (1, 1, 4)
+
+    assert loader_eng.execute(text("SELECT COUNT(*) FROM producto")).scalar() == 6
+    precio = loader_eng.execute(
+        text("SELECT precio_bs FROM producto WHERE url_supplier = :url"), {"url": records[2]["url"]}
+    ).scalar()
+    assert precio == 999.5
+
+
+def test_changed_images_are_replaced(loader_eng, write_products):
+    records = make_products(2)
+    _load(loader_eng, write_products(records))
+
+    records[0]["imagen"] = ["https://img.example.com/nueva.jpg", "https://img.example.com/otra.jpg"]
+    assert _counts(_load(loader_eng, write_products(records))) == (0, 1, 1)
+
+    urls = loader_eng.execute(text(
+        "SELECT i.url FROM imagenes i JOIN producto p ON p.id = i.id_producto WHERE p.url_supplier = :url"
+    ), {"url": records[0]["url"]}).scalars().all()
+    assert sorted(urls) == records[0]["imagen"]
+
+
+def test_hashes_compared_without_float_precision_loss(loader_eng, write_products, monkeypatch):
+    # Dos hashes que float64 no distingue (difieren en el bit menos significativo)
+    hashes = iter([[2**62 + 1], [2**62, 7]])
+    monkeypatch.setattr(upsert, "content_hashes", lambda df: next(hashes))
+
+    assert _counts(_load(loader_eng, write_products(make_products(1)))) == (1, 0, 0)
+    # Con un producto nuevo en el lote el merge deja nulos en el estado guardado
+    assert _counts(_load(loader_eng, write_products(make_products(2)))) == (1, 1, 0)
+
+
+def test_first_upsert_on_existing_catalog_does_not_duplicate(loader_eng, write_products):
+    records = make_products(5)
+    # Catálogo cargado antes en modo inserción, sin producto_sync
+    load_file(write_products(records), loader_eng, DimensionResolver.load(loader_eng))
+
+    assert _counts(_load(loader_eng, write_products(records))) == (0, 0, 5)
+
+    records[1]["descripcion"] = "Nueva descripcion"
+    assert _counts(_load(loader_eng, write_products(records))) == (0, 1, 4)
+    assert loader_eng.execute(text("SELECT COUNT(*) FROM producto")).scalar() == 5
+
+
+def test_backfill_keeps_latest_duplicate(loader_eng, write_products):
+    records = make_products(2)
+    resolver = DimensionResolver.load(loader_eng)
+    load_file(write_products(records), loader_eng, resolver)
+    load_file(write_products(records), loader_eng, resolver)
+
+    assert _counts(_load(loader_eng, write_products(records))) == (0, 0, 2)
+    ids = loader_eng.execute(text("SELECT id_producto FROM producto_sync ORDER BY id_producto")).scalars().all()
+    assert ids == [3, 4]
+
+
+def test_unchanged_batches_keep_catalog_version(loader_eng, write_products):
+    records = make_products(4)
+    _load(loader_eng, write_products(records))
+    version = current_catalog_version(loader_eng)
+
+    report = load_file(write_products(records), loader_eng, DimensionResolver.load(loader_eng),
+                       upsert=True, stream=True, batch_size=2)
+
+    assert _counts(report) == (0, 0, 4)
+    assert current_catalog_version(loader_eng) == version
+
+    records[0]["precio_bs"] = 1.0
+    _load(loader_eng, write_products(records))
+    assert current_catalog_version(loader_eng) == version + 1